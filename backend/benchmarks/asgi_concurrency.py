@@ -0,0 +1,85 @@
+"""
+Compare how many concurrent requests the WSGI and ASGI deployments sustain.
+
+Start both servers (see "Running under ASGI" in the README), then run e.g.:
+
+    python benchmarks/asgi_concurrency.py --token <access token> \\
+        --target wsgi=http://127.0.0.1:8000/api/nutrition/recommendations/generate/ \\
+        --target asgi=http://127.0.0.1:8001/api/nutrition/recommendations/generate/async/ \\
+        --method POST --body '{"meal_type": "lunch"}' --concurrency 1 8 32 64
+
+For each target and concurrency level it reports throughput, latency
+percentiles and error counts.
+"""
+import argparse
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+def timed_request(url, method, body, token, timeout):
+    request = urllib.request.Request(url, data=body, method=method)
+    request.add_header('Authorization', f'Bearer {token}')
+    if body is not None:
+        request.add_header('Content-Type', 'application/json')
+    
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            ok = response.status < 400
+    except (urllib.error.URLError, TimeoutError, ConnectionError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+def run_level(url, method, body, token, concurrency, total, timeout):
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        results = list(pool.map(
+            lambda _: timed_request(url, method, body, token, timeout),
+            range(total)
+        ))
+        elapsed = time.perf_counter() - start
+    
+    latencies = sorted(latency for latency, ok in results if ok)
+    errors = sum(1 for _, ok in results if not ok)
+    
+    def percentile(p):
+        if not latencies:
+            return float('nan')
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    
+    return {
+        'rps': len(latencies) / elapsed if elapsed else 0,
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+        'mean': statistics.mean(latencies) * 1000 if latencies else float('nan'),
+        'errors': errors,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', action='append', required=True, help='name=url, may be repeated')
+    parser.add_argument('--token', required=True, help='JWT access token')
+    parser.add_argument('--method', default='GET')
+    parser.add_argument('--body', default=None, help='JSON request body')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32, 64])
+    parser.add_argument('--requests', type=int, default=200, help='requests per level')
+    parser.add_argument('--timeout', type=float, default=30)
+    args = parser.parse_args()
+    
+    body = args.body.encode() if args.body else None
+    
+    print(f"{'target':<10} {'conc':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9} {'errors':>7}")
+    for target in args.target:
+        name, url = target.split('=', 1)
+        for concurrency in args.concurrency:
+            stats = run_level(url, args.method, body, args.token, concurrency, args.requests, args.timeout)
+            print(
+                f"{name:<10} {concurrency:>5} {stats['rps']:>9.1f} {stats['p50']:>9.1f} "
+                f"{stats['p95']:>9.1f} {stats['mean']:>9.1f} {stats['errors']:>7}"
+            )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Measure the per-request cost of authenticating a JWT and reading the
+user's profile, with DRF's stock JWTAuthentication and with
+users.authentication.CachedJWTAuthentication.
+
+Run from the backend directory against the configured database:
+
+    python benchmarks/auth_overhead.py --email someone@example.com --requests 2000
+
+Reports the mean time and the number of queries per request. The cached
+backend is measured both cold (cache cleared before every request) and
+warm (the steady state within AUTH_USER_CACHE_TTL).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nutrifit.settings')
+
+import django
+django.setup()
+
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+from users.authentication import CachedJWTAuthentication, user_cache
+from users.models import User
+
+def measure(backend, request, requests, clear_cache):
+    queries = 0
+    elapsed = 0.0
+    for _ in range(requests):
+        if clear_cache:
+            user_cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            user, _ = backend.authenticate(request)
+            user.profile.weight  # what nearly every view does next
+            elapsed += time.perf_counter() - start
+        queries += len(captured)
+    return elapsed / requests * 1e6, queries / requests
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--email', help='user to authenticate as (default: first user)')
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+
+    user = User.objects.get(email=args.email) if args.email else User.objects.first()
+    if user is None:
+        parser.error('No users in the database')
+
+    token = AccessToken.for_user(user)
+    request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    print(f"{'backend':<24} {'us/request':>11} {'queries/request':>16}")
+    for name, backend, clear_cache in [
+        ('JWTAuthentication', JWTAuthentication(), False),
+        ('Cached (cold)', CachedJWTAuthentication(), True),
+        ('Cached (warm)', CachedJWTAuthentication(), False),
+    ]:
+        micros, queries = measure(backend, request, args.requests, clear_cache)
+        print(f'{name:<24} {micros:>11.1f} {queries:>16.2f}')
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Measure online scoring latency of the collaborative-filtering recommender
+(nutrition/collaborative.py) against a latency target.
+
+Run from the backend directory, either against the embeddings trained by
+`python manage.py train_recommender`:
+
+    python benchmarks/collaborative.py --candidates 50 200 --target-ms 1
+
+or against synthetic interactions factorized on the spot, which also
+times the offline factorization:
+
+    python benchmarks/collaborative.py --synthetic 50000 2000 --density 0.005
+
+Reports p50/p99 for scoring the candidate foods of one meal and for the
+full ranking used by meal selection; exits non-zero if a p99 misses the
+target.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nutrifit.settings')
+
+import django
+django.setup()
+
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from nutrifit.model_registry import ModelRegistry
+from nutrition.collaborative import MODEL_NAME, CollaborativeModel, factorize, get_collaborative_model, save_embeddings
+
+def synthetic_model(users, foods, density, factors, path):
+    rng = np.random.default_rng(0)
+    matrix = sparse.random(users, foods, density=density, format='csr', dtype=np.float32, random_state=rng)
+    matrix.data = np.ceil(matrix.data * 8)
+
+    start = time.perf_counter()
+    user_factors, food_factors = factorize(matrix, factors)
+    elapsed = time.perf_counter() - start
+    print(f'factorized {users} x {foods} ({matrix.nnz} non-zero, {factors} factors) in {elapsed:.2f}s')
+
+    ids = SimpleNamespace(user_ids=[str(i) for i in range(users)], food_ids=[str(i) for i in range(foods)])
+    registry = ModelRegistry(path)
+    registry.register(MODEL_NAME, CollaborativeModel)
+    save_embeddings(ids, user_factors, food_factors, registry=registry)
+    return registry.get(MODEL_NAME)
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2], samples[min(int(len(samples) * 0.99), len(samples) - 1)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--synthetic', type=int, nargs=2, metavar=('USERS', 'FOODS'))
+    parser.add_argument('--density', type=float, default=0.01)
+    parser.add_argument('--factors', type=int, default=settings.COLLAB_FACTORS)
+    parser.add_argument('--candidates', type=int, nargs='+', default=[20, 50, 200])
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--target-ms', type=float, default=1.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        if args.synthetic:
+            model = synthetic_model(*args.synthetic, args.density, args.factors, path)
+        else:
+            model = get_collaborative_model()
+            if model is None:
+                sys.exit('No trained embeddings; run `python manage.py train_recommender` or pass --synthetic')
+
+        user_ids = list(model.user_index)
+        food_ids = list(model.food_index)
+        rng = random.Random(0)
+        misses = 0
+
+        print(f"{'candidates':>10} {'score p50 us':>13} {'score p99 us':>13} {'rank p50 us':>12} {'rank p99 us':>12}")
+        for count in args.candidates:
+            score_times, rank_times = [], []
+            for _ in range(args.repeat):
+                user_id = rng.choice(user_ids)
+                foods = [SimpleNamespace(id=food_id) for food_id in rng.sample(food_ids, min(count, len(food_ids)))]
+
+                start = time.perf_counter()
+                model.score(user_id, [food.id for food in foods])
+                score_times.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                model.rank(user_id, foods, rng, settings.COLLAB_WEIGHT)
+                rank_times.append(time.perf_counter() - start)
+
+            score_p50, score_p99 = percentiles(score_times)
+            rank_p50, rank_p99 = percentiles(rank_times)
+            misses += rank_p99 * 1000 > args.target_ms
+            print(f'{count:>10} {score_p50 * 1e6:>13.1f} {score_p99 * 1e6:>13.1f} '
+                  f'{rank_p50 * 1e6:>12.1f} {rank_p99 * 1e6:>12.1f}')
+
+    if misses:
+        sys.exit(f'{misses} candidate size(s) missed the {args.target_ms}ms p99 target')
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Measure what compressed storage saves on medical report and order columns,
+and what it costs to read back.
+
+Run from the backend directory against the configured database:
+
+    python benchmarks/compressed_fields.py --limit 500
+
+For each compressed column it reports the plain size of the stored values,
+their size as stored, and the average time to decode one value with each
+available codec and level. Without any rows it falls back to a synthetic
+OCR-like report so codecs can still be compared.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nutrifit.settings')
+
+import django
+django.setup()
+
+from medical.management.commands.compress_fields import COMPRESSED_FIELDS
+from nutrifit import fields
+
+SYNTHETIC_TEXT = '\n'.join(
+    f'{name}: {value} {unit}  (reference {low} - {high})'
+    for _ in range(20)
+    for name, value, unit, low, high in [
+        ('Glucose', 112, 'mg/dL', 70, 100),
+        ('HbA1c', 6.1, '%', 4.0, 5.6),
+        ('Hemoglobin', 11.2, 'g/dL', 12.0, 16.0),
+        ('Cholesterol', 214, 'mg/dL', 125, 200),
+        ('Creatinine', 0.9, 'mg/dL', 0.6, 1.2),
+    ]
+)
+
+def codecs():
+    """(name, compress, decompress) for every codec and level worth comparing"""
+    for level in (1, 6, 9):
+        yield (
+            f'zlib-{level}',
+            lambda data, level=level: zlib.compress(data, level),
+            zlib.decompress,
+        )
+    if fields.zstandard is not None:
+        for level in (3, 10, 19):
+            compressor = fields.zstandard.ZstdCompressor(level=level)
+            decompressor = fields.zstandard.ZstdDecompressor()
+            yield f'zstd-{level}', compressor.compress, decompressor.decompress
+
+def column_values(model, field, limit):
+    values = []
+    for value in model.objects.order_by('-pk').values_list(field, flat=True)[:limit]:
+        if value in (None, '', {}, []):
+            continue
+        values.append(value if isinstance(value, str) else json.dumps(value))
+    return values
+
+def measure(values, compress, decompress, repeat):
+    encoded = [compress(value.encode('utf-8')) for value in values]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for data in encoded:
+            decompress(data)
+    elapsed = time.perf_counter() - start
+    return sum(len(data) for data in encoded), elapsed / (repeat * len(encoded)) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--limit', type=int, default=500, help='most recent rows per table')
+    parser.add_argument('--repeat', type=int, default=20, help='decode passes per codec')
+    args = parser.parse_args()
+
+    columns = [
+        (f'{model._meta.db_table}.{field}', column_values(model, field, args.limit))
+        for model, field_names in COMPRESSED_FIELDS
+        for field in field_names
+    ]
+    columns = [(name, values) for name, values in columns if values]
+    if not columns:
+        columns = [('synthetic.extracted_text', [SYNTHETIC_TEXT])]
+
+    print(f"{'column':<40} {'rows':>6} {'codec':<8} {'plain':>10} {'stored':>10} {'ratio':>6} {'read us':>8}")
+    for name, values in columns:
+        plain = sum(len(value.encode('utf-8')) for value in values)
+        for codec, compress, decompress in codecs():
+            stored, read_us = measure(values, compress, decompress, args.repeat)
+            print(
+                f'{name:<40} {len(values):>6} {codec:<8} {plain:>10} {stored:>10} '
+                f'{plain / stored:>6.1f} {read_us:>8.1f}'
+            )
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
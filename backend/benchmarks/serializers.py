@@ -0,0 +1,89 @@
+"""
+Compare the per-row cost of the DRF serializers used by the list views
+with their .values()-based fast paths, and of DRF's JSON renderer with
+the orjson renderer. Also checks the fast paths render byte-identical JSON.
+
+Run from the backend directory against the configured database:
+
+    python benchmarks/serializers.py --email someone@example.com --repeat 20
+
+Recommendations, plans and cart items are those of the given user (default:
+the first user with meal recommendations).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nutrifit.settings')
+
+import django
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+from marketplace.models import Cart
+from marketplace.serializers import CartSerializer, CartValuesSerializer
+from nutrifit.renderers import ORJSONRenderer
+from nutrition.models import Food, MealRecommendation, NutritionPlan
+from nutrition.serializers import (
+    FoodSerializer, FoodValuesSerializer, MealRecommendationSerializer,
+    MealRecommendationValuesSerializer, NutritionPlanSerializer, NutritionPlanValuesSerializer
+)
+from users.models import User
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--email')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.email:
+        user = User.objects.get(email=args.email)
+    else:
+        user = User.objects.filter(meal_recommendations__isnull=False).first() or User.objects.first()
+
+    cases = [
+        ('foods', Food.objects.filter(is_available=True), FoodSerializer, FoodValuesSerializer),
+        ('recommendations', MealRecommendation.objects.filter(user=user),
+         MealRecommendationSerializer, MealRecommendationValuesSerializer),
+        ('plans', NutritionPlan.objects.filter(user=user), NutritionPlanSerializer, NutritionPlanValuesSerializer),
+        ('cart', Cart.objects.filter(user=user), CartSerializer, CartValuesSerializer),
+    ]
+    drf_renderer, orjson_renderer = JSONRenderer(), ORJSONRenderer()
+    failures = 0
+
+    print(f"{'case':<16} {'rows':>5} {'drf us/row':>11} {'fast us/row':>12} {'speedup':>8} "
+          f"{'json us/row':>12} {'orjson us/row':>14} {'identical':>10}")
+    for name, queryset, serializer_class, values_serializer_class in cases:
+        rows = queryset.count()
+        if not rows:
+            print(f'{name:<16} {0:>5}  (no rows)')
+            continue
+
+        drf_time, drf_data = timed(lambda: serializer_class(queryset.all(), many=True).data, args.repeat)
+        fast_time, fast_data = timed(lambda: values_serializer_class().serialize(queryset.all()), args.repeat)
+        json_time, drf_bytes = timed(lambda: drf_renderer.render(drf_data), args.repeat)
+        orjson_time, orjson_bytes = timed(lambda: orjson_renderer.render(fast_data), args.repeat)
+
+        identical = drf_renderer.render(fast_data) == drf_bytes
+        failures += not identical
+        print(
+            f'{name:<16} {rows:>5} {drf_time / rows * 1e6:>11.1f} {fast_time / rows * 1e6:>12.1f} '
+            f'{drf_time / fast_time:>7.1f}x {json_time / rows * 1e6:>12.1f} {orjson_time / rows * 1e6:>14.1f} '
+            f'{str(identical):>10}'
+        )
+        if orjson_bytes != drf_bytes:
+            print(f'{"":<16} note: orjson output differs from DRF JSON for {name}')
+
+    if failures:
+        sys.exit(f'{failures} fast serializer(s) rendered different JSON')
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Measure how long a web worker takes to boot and how much memory it holds.
+
+Each scenario runs in a fresh interpreter from the backend directory:
+
+    python benchmarks/startup.py --repeat 5
+
+    boot          django.setup() and the URLconf, which imports every view
+                  module - what a gunicorn worker does before its first request
+    boot+ocr      the same, then the OCR/image libraries a scan needs, i.e. the
+                  cost every worker paid when medical/scanner.py imported them
+                  at module level
+    check         `manage.py check`, a typical management command
+
+Reports the median wall time and the peak RSS of the child process.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, os, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {backend!r})
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nutrifit.settings')
+{body}
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{'seconds': elapsed, 'rss_kb': rss_kb}}))
+"""
+
+BOOT = """
+import django
+django.setup()
+from django.conf import settings
+from django.urls import get_resolver
+get_resolver(settings.ROOT_URLCONF).url_patterns
+"""
+
+SCENARIOS = {
+    'boot': BOOT,
+    'boot+ocr': BOOT + """
+from medical.scanner import preload_ocr_modules
+preload_ocr_modules()
+""",
+    'check': """
+from django.core.management import call_command
+import django
+django.setup()
+call_command('check', verbosity=0)
+""",
+}
+
+def run(body):
+    code = CHILD.format(backend=BACKEND_DIR, body=body)
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=BACKEND_DIR,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help='default: all')
+    args = parser.parse_args()
+
+    print(f"{'scenario':<10} {'median ms':>10} {'min ms':>9} {'peak RSS MB':>12}")
+    for name in args.scenario or SCENARIOS:
+        results = [run(SCENARIOS[name]) for _ in range(args.repeat)]
+        seconds = [result['seconds'] for result in results]
+        rss_mb = max(result['rss_kb'] for result in results) / 1024
+        print(f'{name:<10} {statistics.median(seconds) * 1000:>10.0f} {min(seconds) * 1000:>9.0f} {rss_mb:>12.1f}')
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Compare per-worker memory of gunicorn with and without the preloading
+config in nutrifit/gunicorn_conf.py (Linux only, reads /proc).
+
+Run from the backend directory against the configured database:
+
+    python benchmarks/worker_memory.py --workers 4 --token <access token>
+
+Both configurations are started on a local port, every worker is warmed
+with requests to --path, then each worker's USS (memory only it holds),
+PSS and RSS are reported. Lower USS with the same PSS total means the
+preloaded state is shared rather than duplicated.
+
+To measure a server that is already running instead:
+
+    python benchmarks/worker_memory.py --pid <gunicorn master pid>
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFIGURATIONS = {
+    'baseline': ['nutrifit.wsgi:application'],
+    'preloaded': ['-c', 'python:nutrifit.gunicorn_conf', 'nutrifit.wsgi:application'],
+}
+
+def memory_kb(pid):
+    """USS, PSS and RSS of a process from /proc/<pid>/smaps_rollup"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    uss = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    return uss, fields.get('Pss', 0), fields.get('Rss', 0)
+
+def child_pids(pid):
+    pids = []
+    for task in os.listdir(f'/proc/{pid}/task'):
+        with open(f'/proc/{pid}/task/{task}/children') as f:
+            pids.extend(int(child) for child in f.read().split())
+    return pids
+
+def warm_up(url, token, count):
+    for _ in range(count):
+        request = urllib.request.Request(url)
+        if token:
+            request.add_header('Authorization', f'Bearer {token}')
+        try:
+            urllib.request.urlopen(request, timeout=30).read()
+        except urllib.error.HTTPError:
+            pass  # still exercised the worker
+
+def report(name, pid):
+    print(f'{name} (master {pid})')
+    print(f"  {'worker':>8} {'USS MB':>9} {'PSS MB':>9} {'RSS MB':>9}")
+    totals = [0, 0, 0]
+    for worker in sorted(child_pids(pid)):
+        values = memory_kb(worker)
+        totals = [total + value for total, value in zip(totals, values)]
+        print(f'  {worker:>8} ' + ' '.join(f'{value / 1024:>9.1f}' for value in values))
+    print(f"  {'total':>8} " + ' '.join(f'{value / 1024:>9.1f}' for value in totals))
+
+def run_configuration(name, options):
+    bind = f'127.0.0.1:{options.port}'
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', *CONFIGURATIONS[name][:-1],
+         '-w', str(options.workers), '-b', bind, CONFIGURATIONS[name][-1]],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while len(child_pids(process.pid)) < options.workers:
+            if time.monotonic() > deadline or process.poll() is not None:
+                raise RuntimeError(f'{name}: workers did not start')
+            time.sleep(0.5)
+
+        # Enough requests that every worker serves some
+        warm_up(f'http://{bind}{options.path}', options.token, options.requests * options.workers)
+        report(name, process.pid)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(30)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pid', type=int, help='measure a running gunicorn master instead')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--path', default='/api/nutrition/foods/')
+    parser.add_argument('--token', help='JWT access token for --path')
+    parser.add_argument('--requests', type=int, default=25, help='warm-up requests per worker')
+    args = parser.parse_args()
+
+    if args.pid:
+        report('running server', args.pid)
+        return
+    for name in CONFIGURATIONS:
+        run_configuration(name, args)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
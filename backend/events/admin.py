@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import OutboxEvent
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'topic', 'user', 'subject_id', 'created_at', 'dispatched_at', 'attempts')
+    list_filter = ('topic', 'dispatched_at')
+    search_fields = ('user__email', 'subject_id')
\ No newline at end of file
@@ -0,0 +1,71 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import OutboxEvent
+
+def retry_delay(attempts):
+    """Seconds before retrying a batch that failed `attempts` times"""
+    return min(2 ** attempts, settings.OUTBOX_RETRY_MAX_DELAY)
+
+def dispatch_pending(subscribers, batch_size):
+    """
+    Deliver the oldest batch of due events to every subscriber and return
+    (delivered, failed) counts.
+
+    The batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED in the
+    transaction that records the outcome, so several dispatchers can run
+    side by side, and events only count as dispatched once that commits:
+    a crash mid-batch leaves them pending (at-least-once delivery). If any
+    subscriber fails, the whole batch is retried with exponential backoff.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(dispatched_at__isnull=True)
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+            .order_by('id')[:batch_size]
+        )
+        if not events:
+            return 0, 0
+
+        errors = []
+        for subscriber in subscribers:
+            try:
+                subscriber.deliver(events)
+            except Exception as e:
+                errors.append(f'{subscriber.name}: {e}')
+
+        for event in events:
+            event.attempts += 1
+            if errors:
+                event.last_error = '; '.join(errors)
+                event.next_attempt_at = now + timedelta(seconds=retry_delay(event.attempts))
+            else:
+                event.dispatched_at = now
+                event.last_error = ''
+        OutboxEvent.objects.bulk_update(events, ['attempts', 'dispatched_at', 'next_attempt_at', 'last_error'])
+
+    return (0, len(events)) if errors else (len(events), 0)
+
+def replay_events(subscribers, from_id, batch_size):
+    """
+    Deliver every recorded event from `from_id` on again, in id order,
+    without changing delivery state. Returns the number of events sent;
+    a subscriber error stops the replay.
+    """
+    sent = 0
+    last_id = from_id - 1
+
+    while True:
+        events = list(OutboxEvent.objects.filter(id__gt=last_id).order_by('id')[:batch_size])
+        if not events:
+            return sent
+
+        for subscriber in subscribers:
+            subscriber.deliver(events)
+
+        sent += len(events)
+        last_id = events[-1].id
\ No newline at end of file
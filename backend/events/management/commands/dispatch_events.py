@@ -0,0 +1,49 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from events.dispatcher import dispatch_pending, replay_events
+from events.subscribers import get_subscribers
+
+class Command(BaseCommand):
+    help = 'Deliver outbox events (order and report status changes) to subscribers'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds to sleep when no events are due')
+        parser.add_argument('--once', action='store_true', help='Exit once no events are due')
+        parser.add_argument('--subscriber', action='append', help='Only deliver to this subscriber (repeatable)')
+        parser.add_argument('--replay-from', type=int, help='Re-deliver all events from this id on, then exit')
+    
+    def handle(self, *args, **options):
+        subscribers = get_subscribers(options['subscriber'])
+        if not subscribers:
+            raise CommandError('No matching subscribers in OUTBOX_SUBSCRIBERS')
+        
+        if options['replay_from'] is not None:
+            try:
+                sent = replay_events(subscribers, options['replay_from'], options['batch_size'])
+            except Exception as e:
+                raise CommandError(f'Replay failed: {e}')
+            self.stdout.write(self.style.SUCCESS(f'Replayed {sent} events'))
+            return
+        
+        names = ', '.join(subscriber.name for subscriber in subscribers)
+        self.stdout.write(f'Dispatching to {names}')
+        
+        try:
+            while True:
+                delivered, failed = dispatch_pending(subscribers, options['batch_size'])
+                if delivered:
+                    self.stdout.write(f'Delivered {delivered} events')
+                if failed:
+                    self.stdout.write(self.style.WARNING(f'{failed} events failed, will retry'))
+                if delivered or failed:
+                    continue
+                
+                if options['once']:
+                    break
+                # Long-running process: honour CONN_MAX_AGE and health checks between batches
+                close_old_connections()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
\ No newline at end of file
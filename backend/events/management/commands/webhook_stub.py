@@ -0,0 +1,55 @@
+import hashlib
+import hmac
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+class Command(BaseCommand):
+    help = 'Run a local webhook receiver that prints delivered outbox events (for development)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--fail-every', type=int, default=0, help='Answer every Nth delivery with a 500')
+    
+    def handle(self, *args, **options):
+        command = self
+        state = {'requests': 0, 'seen': set()}
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                state['requests'] += 1
+                
+                if settings.OUTBOX_WEBHOOK_SECRET:
+                    expected = 'sha256=' + hmac.new(
+                        settings.OUTBOX_WEBHOOK_SECRET.encode(), body, hashlib.sha256
+                    ).hexdigest()
+                    if not hmac.compare_digest(expected, self.headers.get('X-NutriFit-Signature', '')):
+                        self.send_response(401)
+                        self.end_headers()
+                        return
+                
+                if options['fail_every'] and state['requests'] % options['fail_every'] == 0:
+                    command.stdout.write(command.style.WARNING('Rejecting delivery'))
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                
+                for event in json.loads(body)['events']:
+                    duplicate = ' (duplicate)' if event['id'] in state['seen'] else ''
+                    state['seen'].add(event['id'])
+                    command.stdout.write(f"#{event['id']} {event['topic']} {event['subject_id']} {event['payload']}{duplicate}")
+                
+                self.send_response(204)
+                self.end_headers()
+            
+            def log_message(self, format, *args):
+                pass
+        
+        server = ThreadingHTTPServer(('127.0.0.1', options['port']), Handler)
+        self.stdout.write(f"Listening on http://127.0.0.1:{options['port']}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
\ No newline at end of file
@@ -0,0 +1,39 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from users.models import User
+
+class OutboxEvent(models.Model):
+    # Sequential ids order the stream and are the replay cursor
+    id = models.BigAutoField(primary_key=True)
+    topic = models.CharField(max_length=50)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='events')
+    subject_id = models.CharField(max_length=64, help_text='Primary key of the changed object')
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    # Delivery state, owned by the dispatcher
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    
+    class Meta:
+        db_table = 'outbox_events'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['dispatched_at', 'id'], name='outbox_events_pending'),
+            models.Index(fields=['user', 'id'], name='outbox_events_user_stream'),
+        ]
+    
+    def __str__(self):
+        return f"{self.topic} #{self.id} ({self.subject_id})"
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'topic': self.topic,
+            'user_id': self.user_id,
+            'subject_id': self.subject_id,
+            'payload': self.payload,
+            'created_at': self.created_at,
+        }
\ No newline at end of file
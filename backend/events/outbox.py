@@ -0,0 +1,55 @@
+from django.db import router, transaction
+from .models import OutboxEvent
+
+def record_event(topic, user_id, subject_id, payload, using=None):
+    """
+    Add an event to the outbox. Call inside the transaction that makes the
+    change, so the event exists exactly when the change is committed.
+    """
+    return OutboxEvent.objects.using(using or router.db_for_write(OutboxEvent)).create(
+        topic=topic,
+        user_id=user_id,
+        subject_id=str(subject_id),
+        payload=payload,
+    )
+
+class StatusEventsMixin:
+    """
+    Model mixin recording an `event_topic` outbox event, in the same
+    transaction as the save, whenever `status` is saved with a new value
+    (including when the object is created). Queryset .update() calls
+    bypass it, like any save() override.
+    """
+    event_topic = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_status = instance.__dict__.get('status')
+        return instance
+
+    def event_payload(self):
+        """Extra payload fields for the status event"""
+        return {}
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        # A deferred, untouched status cannot have changed
+        if 'status' not in self.__dict__ or (update_fields is not None and 'status' not in update_fields):
+            return super().save(*args, **kwargs)
+
+        previous = None if self._state.adding else getattr(self, '_saved_status', None)
+        if self.status == previous:
+            return super().save(*args, **kwargs)
+
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            record_event(
+                self.event_topic,
+                self.user_id,
+                self.pk,
+                {'status': self.status, 'previous_status': previous, **self.event_payload()},
+                using=using,
+            )
+        self._saved_status = self.status
\ No newline at end of file
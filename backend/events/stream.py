@@ -0,0 +1,81 @@
+import asyncio
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+from .models import OutboxEvent
+from .subscribers import stream_cursor_key
+
+# Ids are assigned at insert but become visible at commit, so a slightly
+# older event can appear after a newer one; events this young wait a poll
+SETTLE_SECONDS = 1
+
+# Events sent per database read
+STREAM_BATCH = 100
+
+# Reconnect delay suggested to EventSource clients, in milliseconds
+RETRY_MS = 3000
+
+def format_event(data, event=None, event_id=None):
+    """One server-sent event frame"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event:
+        lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, cls=JSONEncoder)}')
+    return '\n'.join(lines) + '\n\n'
+
+def event_stream_response(stream):
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+async def latest_event_id(user_id):
+    result = await OutboxEvent.objects.filter(user_id=user_id).aaggregate(latest=Max('id'))
+    return result['latest'] or 0
+
+async def fetch_events(user_id, cursor):
+    settled = timezone.now() - timedelta(seconds=SETTLE_SECONDS)
+    queryset = OutboxEvent.objects.filter(
+        user_id=user_id, id__gt=cursor, created_at__lte=settled
+    ).order_by('id').values('id', 'topic', 'subject_id', 'payload', 'created_at')
+    return [event async for event in queryset[:STREAM_BATCH]]
+
+async def outbox_stream(user_id, cursor):
+    """
+    A user's outbox events after `cursor`, as server-sent events.
+
+    Each tick reads one cache key, which the dispatcher's stream
+    subscriber advances; the outbox table is only read when it moved, or
+    every OUTBOX_STREAM_RESYNC seconds in case the cache is not shared
+    between processes. Streams end after OUTBOX_STREAM_MAX_AGE seconds and
+    clients resume with Last-Event-ID.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    last_read = None
+    yield f'retry: {RETRY_MS}\n\n'
+
+    while loop.time() - started < settings.OUTBOX_STREAM_MAX_AGE:
+        latest = await cache.aget(stream_cursor_key(user_id))
+        # The first pass always reads, replaying anything after the cursor
+        resync = last_read is None or loop.time() - last_read >= settings.OUTBOX_STREAM_RESYNC
+
+        if (latest is not None and latest > cursor) or resync:
+            last_read = loop.time()
+            events = await fetch_events(user_id, cursor)
+            for event in events:
+                cursor = event['id']
+                yield format_event(event, event=event['topic'], event_id=event['id'])
+            if not events and resync:
+                # Comment frame keeps proxies from timing out idle streams
+                yield ': keepalive\n\n'
+
+        await asyncio.sleep(settings.OUTBOX_STREAM_INTERVAL)
\ No newline at end of file
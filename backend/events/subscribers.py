@@ -0,0 +1,67 @@
+import hashlib
+import hmac
+import json
+import urllib.request
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from rest_framework.utils.encoders import JSONEncoder
+
+def stream_cursor_key(user_id):
+    return f"events:latest:{user_id}"
+
+class Subscriber:
+    """
+    Receives batches of outbox events from the dispatcher. deliver() must
+    raise if any event was not accepted; the whole batch is then retried,
+    so subscribers may see an event more than once and should dedupe on
+    its id.
+    """
+    name = None
+
+    def deliver(self, events):
+        raise NotImplementedError
+
+class StreamSubscriber(Subscriber):
+    """Wakes the SSE streams of the users in a batch by publishing their newest event id"""
+    name = 'stream'
+
+    def deliver(self, events):
+        latest = {}
+        for event in events:
+            latest[event.user_id] = max(event.id, latest.get(event.user_id, 0))
+        cache.set_many(
+            {stream_cursor_key(user_id): event_id for user_id, event_id in latest.items()},
+            settings.OUTBOX_STREAM_MAX_AGE
+        )
+
+class WebhookSubscriber(Subscriber):
+    """
+    POSTs each batch as {"events": [...]} to every OUTBOX_WEBHOOK_URLS
+    endpoint. With OUTBOX_WEBHOOK_SECRET set, the body's HMAC-SHA256 is
+    sent in the X-NutriFit-Signature header.
+    """
+    name = 'webhook'
+
+    def deliver(self, events):
+        if not settings.OUTBOX_WEBHOOK_URLS:
+            return
+
+        body = json.dumps({'events': [event.to_dict() for event in events]}, cls=JSONEncoder).encode()
+        headers = {'Content-Type': 'application/json'}
+        if settings.OUTBOX_WEBHOOK_SECRET:
+            signature = hmac.new(settings.OUTBOX_WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+            headers['X-NutriFit-Signature'] = f'sha256={signature}'
+
+        for url in settings.OUTBOX_WEBHOOK_URLS:
+            request = urllib.request.Request(url, data=body, headers=headers, method='POST')
+            # Non-2xx responses raise HTTPError
+            with urllib.request.urlopen(request, timeout=settings.OUTBOX_WEBHOOK_TIMEOUT):
+                pass
+
+def get_subscribers(names=None):
+    """Subscribers from OUTBOX_SUBSCRIBERS, optionally only those named"""
+    subscribers = [import_string(path)() for path in settings.OUTBOX_SUBSCRIBERS]
+    if names:
+        subscribers = [subscriber for subscriber in subscribers if subscriber.name in names]
+    return subscribers
\ No newline at end of file
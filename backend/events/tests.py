@@ -0,0 +1,128 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+from marketplace.models import Order
+from users.models import User
+from .dispatcher import dispatch_pending, replay_events
+from .models import OutboxEvent
+from .subscribers import StreamSubscriber, Subscriber, stream_cursor_key
+
+class RecordingSubscriber(Subscriber):
+    name = 'recording'
+    
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+    
+    def deliver(self, events):
+        if self.fail:
+            raise RuntimeError('unavailable')
+        self.batches.append([event.id for event in events])
+
+def create_order(user, **fields):
+    return Order.objects.create(user=user, total_amount=100, delivery_address='Kathmandu', **fields)
+
+class StatusEventsTestCase(TestCase):
+    """Status changes record exactly one outbox event, in the saving transaction"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('events@example.com', 'pass12345', first_name='Test', last_name='User')
+    
+    def statuses(self):
+        return [
+            (event.payload['previous_status'], event.payload['status'])
+            for event in OutboxEvent.objects.filter(topic='order.status')
+        ]
+    
+    def test_create_and_status_changes(self):
+        order = create_order(self.user)
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.user_id, self.user.id)
+        self.assertEqual(event.subject_id, str(order.id))
+        self.assertEqual(event.payload, {'status': 'pending', 'previous_status': None, 'total_amount': 100})
+        
+        order.notes = 'Ring twice'
+        order.save()
+        order.status = 'confirmed'
+        order.save()
+        
+        order = Order.objects.get(id=order.id)
+        order.status = 'shipped'
+        order.save()
+        self.assertEqual(self.statuses(), [(None, 'pending'), ('pending', 'confirmed'), ('confirmed', 'shipped')])
+    
+    def test_saves_that_cannot_change_status(self):
+        order = create_order(self.user)
+        
+        order.status = 'confirmed'
+        order.save(update_fields=['notes'])
+        
+        deferred = Order.objects.only('id', 'notes').get(id=order.id)
+        deferred.notes = 'Leave at the door'
+        deferred.save()
+        self.assertEqual(self.statuses(), [(None, 'pending')])
+    
+    def test_rolled_back_change_records_nothing(self):
+        order = create_order(self.user)
+        try:
+            with transaction.atomic():
+                order.status = 'cancelled'
+                order.save()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(self.statuses(), [(None, 'pending')])
+
+class DispatchTestCase(TestCase):
+    """Pending events are delivered in id order, retried with backoff on failure and replayable"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('dispatch@example.com', 'pass12345', first_name='Test', last_name='User')
+        cls.other = User.objects.create_user('other@example.com', 'pass12345', first_name='Test', last_name='User')
+        for user in (cls.user, cls.other, cls.user):
+            create_order(user)
+        cls.event_ids = list(OutboxEvent.objects.values_list('id', flat=True))
+    
+    def test_delivers_pending_batches(self):
+        subscriber = RecordingSubscriber()
+        self.assertEqual(dispatch_pending([subscriber], batch_size=2), (2, 0))
+        self.assertEqual(dispatch_pending([subscriber], batch_size=2), (1, 0))
+        self.assertEqual(dispatch_pending([subscriber], batch_size=2), (0, 0))
+        
+        self.assertEqual(subscriber.batches, [self.event_ids[:2], self.event_ids[2:]])
+        self.assertFalse(OutboxEvent.objects.filter(dispatched_at__isnull=True).exists())
+    
+    def test_failed_batch_is_retried_later(self):
+        working, failing = RecordingSubscriber(), RecordingSubscriber(fail=True)
+        self.assertEqual(dispatch_pending([working, failing], batch_size=10), (0, 3))
+        
+        for event in OutboxEvent.objects.all():
+            self.assertIsNone(event.dispatched_at)
+            self.assertEqual(event.attempts, 1)
+            self.assertEqual(event.last_error, 'recording: unavailable')
+            self.assertGreater(event.next_attempt_at, timezone.now())
+        
+        # Not due yet
+        self.assertEqual(dispatch_pending([working], batch_size=10), (0, 0))
+        
+        OutboxEvent.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(dispatch_pending([working], batch_size=10), (3, 0))
+        self.assertEqual(set(OutboxEvent.objects.values_list('attempts', 'last_error')), {(2, '')})
+    
+    def test_replay_keeps_delivery_state(self):
+        dispatch_pending([RecordingSubscriber()], batch_size=10)
+        dispatched = dict(OutboxEvent.objects.values_list('id', 'dispatched_at'))
+        
+        subscriber = RecordingSubscriber()
+        self.assertEqual(replay_events([subscriber], self.event_ids[1], batch_size=1), 2)
+        self.assertEqual(subscriber.batches, [[self.event_ids[1]], [self.event_ids[2]]])
+        self.assertEqual(dict(OutboxEvent.objects.values_list('id', 'dispatched_at')), dispatched)
+    
+    def test_stream_subscriber_publishes_newest_event_per_user(self):
+        StreamSubscriber().deliver(list(OutboxEvent.objects.all()))
+        self.assertEqual(cache.get(stream_cursor_key(self.user.id)), self.event_ids[2])
+        self.assertEqual(cache.get(stream_cursor_key(self.other.id)), self.event_ids[1])
\ No newline at end of file
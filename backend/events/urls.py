@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('stream/', views.EventStreamView.as_view(), name='event-stream'),
+]
\ No newline at end of file
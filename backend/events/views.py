@@ -0,0 +1,24 @@
+from rest_framework import status
+from nutrifit.async_views import AsyncAPIView
+from .stream import event_stream_response, latest_event_id, outbox_stream
+
+class EventStreamView(AsyncAPIView):
+    """
+    Server-sent events for the user's order and report status changes.
+    Resumes after the Last-Event-ID header (or ?last_event_id=), otherwise
+    starts with the next event. Serve under ASGI: Django buffers async
+    streams under WSGI.
+    """
+    stream_token_auth = True
+    
+    async def get(self, request):
+        cursor = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        if cursor is None:
+            cursor = await latest_event_id(request.user.pk)
+        else:
+            try:
+                cursor = int(cursor)
+            except ValueError:
+                return self.error('Invalid Last-Event-ID', status=status.HTTP_400_BAD_REQUEST)
+        
+        return event_stream_response(outbox_stream(request.user.pk, cursor))
\ No newline at end of file
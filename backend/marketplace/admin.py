@@ -1,13 +1,18 @@
 from django.contrib import admin
-from .models import Cart, Order
+from .models import Cart, Order, OrderItem
 
 @admin.register(Cart)
 class CartAdmin(admin.ModelAdmin):
     list_display = ('user', 'food', 'quantity', 'created_at')
     search_fields = ('user__email', 'food__name')
 
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    extra = 0
+
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
+    inlines = (OrderItemInline,)
     list_display = ('user', 'total_amount', 'status', 'created_at')
     list_filter = ('status', 'created_at')
     search_fields = ('user__email',)
\ No newline at end of file
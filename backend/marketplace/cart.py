@@ -0,0 +1,100 @@
+import math
+from django.db import connection, transaction
+from django.utils import timezone
+from nutrition.models import Food
+from users.dashboard import invalidate_dashboard
+from .models import Cart
+
+ADD, UPDATE, REMOVE = 'add', 'update', 'remove'
+
+# Cart quantities count 100g units, the unit cart_unit_price() charges for
+CART_UNIT_GRAMS = 100
+
+class UnknownFoods(Exception):
+    """Cart operations referencing foods that do not exist"""
+
+    def __init__(self, food_ids):
+        self.food_ids = sorted(str(food_id) for food_id in food_ids)
+        super().__init__(f"Unknown food ids: {', '.join(self.food_ids)}")
+
+def cart_unit_price(calories):
+    # Mock price calculation (100 NPR per 100g)
+    return calories * 0.5
+
+def cart_quantity(grams):
+    """Whole cart units covering `grams`"""
+    return max(math.ceil(grams / CART_UNIT_GRAMS), 1)
+
+def shopping_list_operations(items):
+    """
+    Cart operations setting each shopping list item to the quantity the list
+    needs, rounded up to whole units, so applying them twice changes nothing
+    """
+    return [
+        {'op': UPDATE, 'food_id': item['food_id'], 'quantity': cart_quantity(item['grams'])}
+        for item in items
+    ]
+
+def apply_cart_operations(user, operations):
+    """
+    Apply a list of {'op', 'food_id', 'quantity'} operations to a user's
+    cart in one transaction, in a fixed number of queries however many
+    operations there are: foods are validated with one lookup, the touched
+    cart rows are read (and locked) once, and the result is written with a
+    single upsert plus a single delete.
+
+    'add' increments the quantity (creating the item), 'update' sets it
+    and 'remove' drops the item; operations apply in order.
+    """
+    food_ids = {operation['food_id'] for operation in operations}
+    prices = {
+        food_id: cart_unit_price(calories)
+        for food_id, calories in Food.objects.filter(id__in=food_ids).values_list('id', 'calories')
+    }
+    missing = food_ids - prices.keys()
+    if missing:
+        raise UnknownFoods(missing)
+
+    with transaction.atomic():
+        existing = {
+            item.food_id: item
+            for item in Cart.objects.select_for_update().filter(user=user, food_id__in=food_ids)
+        }
+        quantities = {food_id: item.quantity for food_id, item in existing.items()}
+        for operation in operations:
+            food_id = operation['food_id']
+            if operation['op'] == REMOVE:
+                quantities.pop(food_id, None)
+            elif operation['op'] == ADD:
+                quantities[food_id] = quantities.get(food_id, 0) + operation['quantity']
+            else:
+                quantities[food_id] = operation['quantity']
+
+        now = timezone.now()
+        upserts = [
+            Cart(
+                user=user,
+                food_id=food_id,
+                quantity=quantity,
+                unit_price=existing[food_id].unit_price if food_id in existing else prices[food_id],
+                updated_at=now,
+            )
+            for food_id, quantity in quantities.items()
+            if food_id not in existing or existing[food_id].quantity != quantity
+        ]
+        if upserts:
+            # MySQL upserts on any unique key and rejects an explicit target
+            unique_fields = ['user', 'food'] if connection.features.supports_update_conflicts_with_target else None
+            Cart.objects.bulk_create(
+                upserts,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=['quantity', 'updated_at'],
+            )
+
+        removed = existing.keys() - quantities.keys()
+        if removed:
+            Cart.objects.filter(user=user, food_id__in=removed).delete()
+
+        # bulk writes skip the model signals that normally do this
+        transaction.on_commit(lambda: invalidate_dashboard(user.pk))
\ No newline at end of file
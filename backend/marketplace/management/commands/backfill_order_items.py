@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from marketplace.models import Order, OrderItem
+from nutrition.models import Food
+
+class Command(BaseCommand):
+    help = 'Create order item rows for orders that only have the legacy order_items JSON'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+    
+    def handle(self, *args, **options):
+        # Legacy lines only carry the food name; names no longer in the catalog keep a null food
+        food_ids = dict(Food.objects.values_list('name', 'id'))
+        
+        orders = items = unmatched = 0
+        last_pk = None
+        
+        while True:
+            queryset = Order.objects.filter(items__isnull=True).only(
+                'pk', 'order_items', 'created_at'
+            ).order_by('pk')
+            if last_pk is not None:
+                queryset = queryset.filter(pk__gt=last_pk)
+            batch = list(queryset[:options['batch_size']])
+            if not batch:
+                break
+            
+            rows = []
+            for order in batch:
+                for line in order.order_items or []:
+                    food_id = food_ids.get(line.get('food_name'))
+                    unmatched += food_id is None
+                    rows.append(OrderItem(
+                        order_id=order.pk,
+                        food_id=food_id,
+                        food_name=line.get('food_name') or '',
+                        quantity=line.get('quantity', 1),
+                        unit_price=line.get('unit_price', 0),
+                        created_at=order.created_at
+                    ))
+            
+            with transaction.atomic():
+                OrderItem.objects.bulk_create(rows, batch_size=options['batch_size'])
+            
+            orders += len(batch)
+            items += len(rows)
+            last_pk = batch[-1].pk
+        
+        self.stdout.write(f'{orders} orders, {items} items ({unmatched} without a matching food)')
+        self.stdout.write(self.style.SUCCESS('Backfill complete!'))
\ No newline at end of file
@@ -1,5 +1,7 @@
 import uuid
 from django.db import models
+from events.outbox import StatusEventsMixin
+from nutrifit.fields import CompressedJSONField
 from users.models import User
 from nutrition.models import Food
 
@@ -23,7 +25,7 @@ class Cart(models.Model):
     def subtotal(self):
         return self.quantity * self.unit_price
 
-class Order(models.Model):
+class Order(StatusEventsMixin, models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('confirmed', 'Confirmed'),
@@ -33,9 +35,11 @@ class Order(models.Model):
         ('cancelled', 'Cancelled'),
     ]
     
+    event_topic = 'order.status'
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='orders')
-    order_items = models.JSONField(default=list)
+    order_items = CompressedJSONField(default=list)
     total_amount = models.FloatField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     delivery_address = models.TextField()
@@ -48,4 +52,31 @@ class Order(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"Order {self.id} - {self.user.email}"
\ No newline at end of file
+        return f"Order {self.id} - {self.user.email}"
+    
+    def event_payload(self):
+        return {'total_amount': self.total_amount}
+
+class OrderItem(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
+    food = models.ForeignKey(Food, on_delete=models.SET_NULL, null=True, related_name='order_items')
+    food_name = models.CharField(max_length=200, help_text='Food name at checkout')
+    quantity = models.IntegerField()
+    unit_price = models.FloatField()
+    # Copy of the order's checkout time, so per-period aggregates skip the join
+    created_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'order_items'
+        indexes = [
+            models.Index(fields=['food', 'created_at'], name='order_items_food_period'),
+            models.Index(fields=['created_at'], name='order_items_period'),
+        ]
+    
+    def __str__(self):
+        return f"{self.food_name} x{self.quantity}"
+    
+    @property
+    def subtotal(self):
+        return self.quantity * self.unit_price
\ No newline at end of file
@@ -1,6 +1,9 @@
 from rest_framework import serializers
-from .models import Cart, Order
-from nutrition.serializers import FoodSerializer
+from .cart import ADD, REMOVE, UPDATE
+from .models import Cart, Order, OrderItem
+from nutrifit.values_serializers import ValuesSerializer
+from nutrition.models import Food
+from nutrition.serializers import FoodSerializer, FoodValuesSerializer
 
 class CartSerializer(serializers.ModelSerializer):
     food = FoodSerializer(read_only=True)
@@ -12,8 +15,41 @@ class CartSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'food', 'food_id', 'quantity', 'unit_price', 'subtotal', 'created_at', 'updated_at']
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
 
+class CartOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=[ADD, UPDATE, REMOVE])
+    food_id = serializers.UUIDField()
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+class BulkCartSerializer(serializers.Serializer):
+    operations = CartOperationSerializer(many=True, allow_empty=False, max_length=200)
+
+class OrderItemSerializer(serializers.ModelSerializer):
+    subtotal = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = OrderItem
+        fields = ['id', 'food', 'food_name', 'quantity', 'unit_price', 'subtotal']
+
 class OrderSerializer(serializers.ModelSerializer):
+    items = OrderItemSerializer(many=True, read_only=True)
+    
     class Meta:
         model = Order
-        fields = ['id', 'user', 'order_items', 'total_amount', 'status', 'delivery_address', 'notes', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
\ No newline at end of file
+        fields = ['id', 'user', 'items', 'order_items', 'total_amount', 'status', 'delivery_address', 'notes', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+
+class CartValuesSerializer(ValuesSerializer):
+    """Read-only fast path with the same output as CartSerializer"""
+    serializer_class = CartSerializer
+    computed_fields = {
+        'subtotal': (['quantity', 'unit_price'], lambda row: row['quantity'] * row['unit_price']),
+    }
+    
+    def get_nested_columns(self):
+        return ['food']
+    
+    def get_nested(self, name, rows):
+        foods = FoodValuesSerializer()
+        food_rows = list(foods.values(Food.objects.filter(id__in={row['food'] for row in rows})))
+        by_id = dict(zip((food['pk'] for food in food_rows), foods.to_representation(food_rows)))
+        return {row['pk']: by_id.get(row['food']) for row in rows}
\ No newline at end of file
@@ -0,0 +1,104 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from nutrition.models import Food
+from users.models import User
+from .cart import UnknownFoods, apply_cart_operations
+from .models import Cart
+from .serializers import CartSerializer, CartValuesSerializer
+
+class CartValuesSerializerTestCase(TestCase):
+    """The cart's .values() fast path must render the same JSON bytes as CartSerializer"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_data', stdout=StringIO())
+        cls.user = User.objects.create_user('cart@example.com', 'pass12345', first_name='Test', last_name='User')
+        foods = list(Food.objects.order_by('name')[:4])
+        apply_cart_operations(cls.user, [
+            {'op': 'add', 'food_id': food.id, 'quantity': quantity}
+            for quantity, food in enumerate(foods, start=1)
+        ])
+        Food.objects.filter(id=foods[0].id).update(vitamin_a=1e-05)
+    
+    def test_cart(self):
+        queryset = Cart.objects.filter(user=self.user)
+        self.assertEqual(queryset.count(), 4)
+        expected = JSONRenderer().render(CartSerializer(queryset, many=True).data)
+        actual = api_settings.DEFAULT_RENDERER_CLASSES[0]().render(CartValuesSerializer().serialize(queryset))
+        self.assertEqual(actual, expected)
+
+class CartOperationsTestCase(TestCase):
+    """Bulk cart operations apply in order with a fixed number of queries"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_data', stdout=StringIO())
+        cls.user = User.objects.create_user('bulk@example.com', 'pass12345', first_name='Test', last_name='User')
+        cls.foods = list(Food.objects.order_by('name')[:12])
+    
+    def quantities(self):
+        return dict(Cart.objects.filter(user=self.user).values_list('food_id', 'quantity'))
+    
+    def test_add_update_remove(self):
+        a, b, c = (food.id for food in self.foods[:3])
+        apply_cart_operations(self.user, [
+            {'op': 'add', 'food_id': a, 'quantity': 2},
+            {'op': 'add', 'food_id': b, 'quantity': 1},
+            {'op': 'add', 'food_id': c, 'quantity': 1},
+        ])
+        apply_cart_operations(self.user, [
+            {'op': 'add', 'food_id': a, 'quantity': 3},
+            {'op': 'update', 'food_id': b, 'quantity': 4},
+            {'op': 'remove', 'food_id': c},
+        ])
+        self.assertEqual(self.quantities(), {a: 5, b: 4})
+    
+    def test_operations_apply_in_order(self):
+        a, b = (food.id for food in self.foods[:2])
+        apply_cart_operations(self.user, [
+            {'op': 'add', 'food_id': a, 'quantity': 1},
+            {'op': 'remove', 'food_id': a},
+            {'op': 'add', 'food_id': a, 'quantity': 2},
+            {'op': 'update', 'food_id': b, 'quantity': 3},
+            {'op': 'add', 'food_id': b, 'quantity': 1},
+        ])
+        self.assertEqual(self.quantities(), {a: 2, b: 4})
+    
+    def test_unit_price_kept_for_existing_items(self):
+        food = self.foods[0]
+        apply_cart_operations(self.user, [{'op': 'add', 'food_id': food.id, 'quantity': 1}])
+        Cart.objects.filter(user=self.user).update(unit_price=1)
+        apply_cart_operations(self.user, [{'op': 'update', 'food_id': food.id, 'quantity': 2}])
+        self.assertEqual(Cart.objects.get(user=self.user).unit_price, 1)
+    
+    def test_unknown_foods_leave_cart_unchanged(self):
+        known = self.foods[0].id
+        apply_cart_operations(self.user, [{'op': 'add', 'food_id': known, 'quantity': 1}])
+        unknown = self.foods[1].id
+        Food.objects.filter(id=unknown).delete()
+        
+        with self.assertRaises(UnknownFoods) as raised:
+            apply_cart_operations(self.user, [
+                {'op': 'add', 'food_id': known, 'quantity': 1},
+                {'op': 'add', 'food_id': unknown, 'quantity': 1},
+            ])
+        self.assertEqual(raised.exception.food_ids, [str(unknown)])
+        self.assertEqual(self.quantities(), {known: 1})
+    
+    def test_query_count_does_not_grow_with_operations(self):
+        def count_queries(foods):
+            with CaptureQueriesContext(connection) as context:
+                apply_cart_operations(self.user, [
+                    {'op': 'add', 'food_id': food.id, 'quantity': 1} for food in foods
+                ] + [
+                    {'op': 'remove', 'food_id': food.id} for food in foods[::2]
+                ])
+            return len(context.captured_queries)
+        
+        self.assertEqual(count_queries(self.foods[:2]), count_queries(self.foods[2:]))
+        self.assertEqual(len(self.quantities()), 6)
\ No newline at end of file
@@ -4,6 +4,7 @@ from . import views
 urlpatterns = [
     path('cart/', views.CartListView.as_view(), name='cart-list'),
     path('cart/add/', views.AddToCartView.as_view(), name='add-to-cart'),
+    path('cart/bulk/', views.BulkCartView.as_view(), name='bulk-cart'),
     path('cart/<uuid:pk>/update/', views.UpdateCartView.as_view(), name='update-cart'),
     path('cart/<uuid:pk>/delete/', views.DeleteCartItemView.as_view(), name='delete-cart-item'),
     path('orders/', views.OrderListView.as_view(), name='order-list'),
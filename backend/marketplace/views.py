@@ -2,12 +2,16 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from .models import Cart, Order
-from .serializers import CartSerializer, OrderSerializer
+from django.db import transaction
+from .cart import UnknownFoods, apply_cart_operations, cart_unit_price
+from .models import Cart, Order, OrderItem
+from .serializers import BulkCartSerializer, CartSerializer, CartValuesSerializer, OrderSerializer
+from nutrifit.values_serializers import ValuesListMixin
 from nutrition.models import Food
 
-class CartListView(generics.ListAPIView):
+class CartListView(ValuesListMixin, generics.ListAPIView):
     serializer_class = CartSerializer
+    values_serializer_class = CartValuesSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
@@ -23,8 +27,7 @@ class AddToCartView(APIView):
             
             food = Food.objects.get(id=food_id)
             
-            # Mock price calculation (100 NPR per 100g)
-            unit_price = food.calories * 0.5  # Simple price calculation
+            unit_price = cart_unit_price(food.calories)
             
             cart_item, created = Cart.objects.get_or_create(
                 user=request.user,
@@ -50,6 +53,30 @@ class AddToCartView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+class BulkCartView(APIView):
+    """Apply a list of add/update/remove operations and return the cart"""
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        serializer = BulkCartSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        try:
+            apply_cart_operations(request.user, serializer.validated_data['operations'])
+        except UnknownFoods as e:
+            return Response(
+                {'error': 'Food not found', 'food_ids': e.food_ids},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        cart = CartValuesSerializer().serialize(Cart.objects.filter(user=request.user))
+        return Response(cart)
+
 class UpdateCartView(generics.UpdateAPIView):
     serializer_class = CartSerializer
     permission_classes = [IsAuthenticated]
@@ -68,7 +95,7 @@ class OrderListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        return Order.objects.filter(user=self.request.user).prefetch_related('items')
 
 class CreateOrderView(APIView):
     permission_classes = [IsAuthenticated]
@@ -84,39 +111,55 @@ class CreateOrderView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Get cart items
-            cart_items = Cart.objects.filter(user=request.user)
-            
-            if not cart_items.exists():
-                return Response(
-                    {'error': 'Cart is empty'},
-                    status=status.HTTP_400_BAD_REQUEST
+            with transaction.atomic():
+                # Get cart items
+                cart_items = list(
+                    Cart.objects.select_for_update().filter(user=request.user).select_related('food')
                 )
-            
-            # Calculate total and prepare order items
-            order_items = []
-            total_amount = 0
-            
-            for item in cart_items:
-                order_items.append({
-                    'food_name': item.food.name,
-                    'quantity': item.quantity,
-                    'unit_price': item.unit_price,
-                    'subtotal': item.subtotal
-                })
-                total_amount += item.subtotal
-            
-            # Create order
-            order = Order.objects.create(
-                user=request.user,
-                order_items=order_items,
-                total_amount=total_amount,
-                delivery_address=delivery_address,
-                notes=notes
-            )
-            
-            # Clear cart
-            cart_items.delete()
+                
+                if not cart_items:
+                    return Response(
+                        {'error': 'Cart is empty'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                
+                # Calculate total and prepare order items
+                order_items = []
+                total_amount = 0
+                
+                for item in cart_items:
+                    order_items.append({
+                        'food_name': item.food.name,
+                        'quantity': item.quantity,
+                        'unit_price': item.unit_price,
+                        'subtotal': item.subtotal
+                    })
+                    total_amount += item.subtotal
+                
+                # Create order
+                order = Order.objects.create(
+                    user=request.user,
+                    order_items=order_items,
+                    total_amount=total_amount,
+                    delivery_address=delivery_address,
+                    notes=notes
+                )
+                
+                # One row per line, written in a single insert
+                OrderItem.objects.bulk_create([
+                    OrderItem(
+                        order=order,
+                        food=item.food,
+                        food_name=item.food.name,
+                        quantity=item.quantity,
+                        unit_price=item.unit_price,
+                        created_at=order.created_at
+                    )
+                    for item in cart_items
+                ])
+                
+                # Clear cart
+                Cart.objects.filter(user=request.user).delete()
             
             serializer = OrderSerializer(order)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
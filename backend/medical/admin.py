@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import MedicalReport, Disease
+from .models import MedicalReport, Disease, ReportUpload
 
 @admin.register(MedicalReport)
 class MedicalReportAdmin(admin.ModelAdmin):
@@ -11,4 +11,10 @@ class MedicalReportAdmin(admin.ModelAdmin):
 class DiseaseAdmin(admin.ModelAdmin):
     list_display = ('name', 'severity', 'category')
     list_filter = ('severity', 'category')
-    search_fields = ('name', 'description')
\ No newline at end of file
+    search_fields = ('name', 'description')
+
+@admin.register(ReportUpload)
+class ReportUploadAdmin(admin.ModelAdmin):
+    list_display = ('user', 'file_name', 'received_size', 'total_size', 'status', 'updated_at')
+    list_filter = ('status',)
+    search_fields = ('user__email', 'file_name')
\ No newline at end of file
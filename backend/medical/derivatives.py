@@ -0,0 +1,54 @@
+import io
+import os
+from django.core.files.base import ContentFile
+from nutrifit.lazy import lazy_import
+
+Image = lazy_import('PIL.Image')
+ImageOps = lazy_import('PIL.ImageOps')
+
+# Longest edge of list-view thumbnails, and their JPEG quality
+THUMBNAIL_SIZE = 320
+THUMBNAIL_QUALITY = 70
+
+# Longest edge of the grayscale copy handed to OCR; about 300 DPI for an A4 page
+OCR_MAX_SIZE = 3000
+
+def _encode(image, format, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **options)
+    return ContentFile(buffer.getvalue())
+
+def build_thumbnail(image):
+    """Small compressed RGB preview"""
+    thumbnail = image.convert('RGB')
+    thumbnail.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    return _encode(thumbnail, 'JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+
+def build_ocr_copy(image):
+    """Grayscale copy, downscaled to OCR resolution, stored losslessly"""
+    normalized = image.convert('L')
+    normalized.thumbnail((OCR_MAX_SIZE, OCR_MAX_SIZE))
+    return _encode(normalized, 'PNG', optimize=True)
+
+def generate_report_derivatives(report):
+    """
+    Create the thumbnail and OCR copy for an uploaded report image, once.
+    Documents Pillow cannot decode (e.g. PDFs) are left without derivatives.
+    Returns True if derivatives were written.
+    """
+    try:
+        with report.file.open('rb') as f:
+            image = Image.open(f)
+            image.load()
+    except (Image.UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        # DecompressionBombError: more than twice Image.MAX_IMAGE_PIXELS
+        return False
+
+    # Phone photos carry their rotation in EXIF rather than in the pixels
+    image = ImageOps.exif_transpose(image)
+    stem = os.path.splitext(os.path.basename(report.file.name))[0]
+
+    report.thumbnail.save(f'{stem}.jpg', build_thumbnail(image), save=False)
+    report.ocr_file.save(f'{stem}.png', build_ocr_copy(image), save=False)
+    report.save(update_fields=['thumbnail', 'ocr_file', 'updated_at'])
+    return True
\ No newline at end of file
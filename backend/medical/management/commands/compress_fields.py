@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import Length
+from marketplace.models import Order
+from medical.models import MedicalReport
+
+# Models and their compressed columns
+COMPRESSED_FIELDS = [
+    (MedicalReport, ['extracted_text', 'key_findings', 'health_metrics', 'ai_insights', 'dietary_recommendations']),
+    (Order, ['order_items']),
+]
+
+class Command(BaseCommand):
+    help = 'Rewrite existing OCR text, analysis results and order items in compressed form'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+    
+    def handle(self, *args, **options):
+        for model, fields in COMPRESSED_FIELDS:
+            before = self.stored_bytes(model, fields)
+            rows = self.compress_model(model, fields, options['batch_size'])
+            after = self.stored_bytes(model, fields)
+            
+            self.stdout.write(
+                f'{model._meta.db_table}: {rows} rows, {before} -> {after} bytes'
+            )
+        
+        self.stdout.write(self.style.SUCCESS('Compression complete!'))
+    
+    def stored_bytes(self, model, fields):
+        totals = model.objects.aggregate(**{field: Sum(Length(field)) for field in fields})
+        return sum(value or 0 for value in totals.values())
+    
+    def compress_model(self, model, fields, batch_size):
+        """
+        Walk the table in primary key order; fields decode legacy plain values
+        on read and compress on write, so saving a batch back converts it.
+        """
+        rows = 0
+        last_pk = None
+        
+        while True:
+            queryset = model.objects.only('pk', *fields).order_by('pk')
+            if last_pk is not None:
+                queryset = queryset.filter(pk__gt=last_pk)
+            batch = list(queryset[:batch_size])
+            if not batch:
+                break
+            
+            with transaction.atomic():
+                model.objects.bulk_update(batch, fields)
+            
+            rows += len(batch)
+            last_pk = batch[-1].pk
+        
+        return rows
@@ -1,5 +1,7 @@
 import uuid
 from django.db import models
+from events.outbox import StatusEventsMixin
+from nutrifit.fields import CompressedJSONField, CompressedTextField
 from users.models import User
 
 class Disease(models.Model):
@@ -39,7 +41,7 @@ class Disease(models.Model):
     def __str__(self):
         return self.name
 
-class MedicalReport(models.Model):
+class MedicalReport(StatusEventsMixin, models.Model):
     REPORT_TYPE_CHOICES = [
         ('blood_test', 'Blood Test'),
         ('prescription', 'Prescription'),
@@ -54,6 +56,8 @@ class MedicalReport(models.Model):
         ('failed', 'Failed'),
     ]
     
+    event_topic = 'report.status'
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='medical_reports')
     report_type = models.CharField(max_length=20, choices=REPORT_TYPE_CHOICES)
@@ -61,18 +65,24 @@ class MedicalReport(models.Model):
     # File information
     file = models.FileField(upload_to='medical_reports/%Y/%m/')
     file_path = models.CharField(max_length=500)
+    file_hash = models.CharField(max_length=64, blank=True, db_index=True, help_text='SHA-256 of the uploaded file')
+    file_size = models.PositiveBigIntegerField(null=True, blank=True, help_text='Size in bytes')
+    
+    # Derivatives generated once at upload time
+    thumbnail = models.FileField(upload_to='medical_reports/thumbnails/%Y/%m/', blank=True)
+    ocr_file = models.FileField(upload_to='medical_reports/ocr/%Y/%m/', blank=True, help_text='Grayscale copy used for OCR')
     
     # Scan results
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
-    extracted_text = models.TextField(blank=True)
+    extracted_text = CompressedTextField(blank=True)
     detected_conditions = models.TextField(blank=True, help_text='Detected medical conditions')
     detected_diseases = models.ManyToManyField(Disease, blank=True, related_name='reports')
     
     # Analysis results
-    key_findings = models.JSONField(default=dict, blank=True)
-    health_metrics = models.JSONField(default=dict, blank=True)
-    ai_insights = models.TextField(blank=True)
-    dietary_recommendations = models.TextField(blank=True)
+    key_findings = CompressedJSONField(default=dict, blank=True)
+    health_metrics = CompressedJSONField(default=dict, blank=True)
+    ai_insights = CompressedTextField(blank=True)
+    dietary_recommendations = CompressedTextField(blank=True)
     
     scan_date = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -84,4 +94,38 @@ class MedicalReport(models.Model):
         ordering = ['-scan_date']
     
     def __str__(self):
-        return f"{self.user.email} - {self.report_type} ({self.scan_date.date()})"
\ No newline at end of file
+        return f"{self.user.email} - {self.report_type} ({self.scan_date.date()})"
+    
+    def event_payload(self):
+        return {'report_type': self.report_type}
+
+class ReportUpload(models.Model):
+    """Resumable chunked upload that becomes a MedicalReport once complete"""
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('completed', 'Completed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='report_uploads')
+    report_type = models.CharField(max_length=20, choices=MedicalReport.REPORT_TYPE_CHOICES)
+    file_name = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField(help_text='Declared size in bytes')
+    received_size = models.PositiveBigIntegerField(default=0)
+    
+    # Final storage name, chosen once the first chunk identifies the file type
+    storage_name = models.CharField(max_length=500, blank=True)
+    report = models.OneToOneField(MedicalReport, on_delete=models.SET_NULL, null=True, blank=True, related_name='upload')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'report_uploads'
+        verbose_name = 'Report Upload'
+        verbose_name_plural = 'Report Uploads'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.file_name} ({self.received_size}/{self.total_size})"
\ No newline at end of file
@@ -0,0 +1,253 @@
+import multiprocessing
+import queue
+import threading
+import time
+from django.conf import settings
+
+class OCRWorkerError(Exception):
+    """Raised when a worker dies, times out or fails a request"""
+
+class OCRTaskError(OCRWorkerError):
+    """Raised when the scanner fails on a report; the worker itself is fine"""
+
+# Seconds an idle worker has to answer a health-check ping
+PING_TIMEOUT = 5
+
+def load_ocr_engine(lang):
+    """
+    OCR callable for a worker process, returning words like
+    scanner.tesseract_words. With tesserocr installed, Tesseract instances
+    keep their language data loaded across pages (one per concurrent
+    region); otherwise pytesseract starts a tesseract process per region.
+    """
+    try:
+        import tesserocr
+    except ImportError:
+        import functools
+        from .scanner import tesseract_words
+        return functools.partial(tesseract_words, lang=lang)
+
+    from PIL import Image
+    apis = queue.LifoQueue()
+    level = tesserocr.RIL.WORD
+
+    def image_to_words(image):
+        try:
+            api = apis.get_nowait()
+        except queue.Empty:
+            api = tesserocr.PyTessBaseAPI(lang=lang, psm=tesserocr.PSM.SINGLE_BLOCK)
+
+        try:
+            if not isinstance(image, Image.Image):
+                image = Image.fromarray(image)
+            api.SetImage(image)
+            api.Recognize()
+
+            words = []
+            line = 0
+            for word in tesserocr.iterate_level(api.GetIterator(), level):
+                if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                    line += 1
+                text = word.GetUTF8Text(level)
+                if text and text.strip():
+                    words.append((text.strip(), word.Confidence(level), (line,)))
+            return words
+        finally:
+            apis.put(api)
+
+    return image_to_words
+
+def _worker_main(conn, lang):
+    """Worker process loop: load the engine once, then serve requests"""
+    from .scanner import MedicalDocumentScanner, preload_ocr_modules
+    preload_ocr_modules()
+    scanner = MedicalDocumentScanner(ocr=load_ocr_engine(lang))
+
+    # Progress is sent from the OCR threads, so sends share a lock
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            conn.send(message)
+
+    def progress(stage, detail):
+        send(('progress', (stage, detail)))
+
+    while True:
+        try:
+            command, argument = conn.recv()
+        except EOFError:
+            break
+        if command == 'stop':
+            break
+        try:
+            if command == 'ping':
+                send(('ok', None))
+            elif command == 'analyze':
+                send(('ok', scanner.analyze_report(argument, progress=progress)))
+        except Exception as e:
+            send(('error', str(e)))
+
+class OCRWorker:
+    """One warm worker process and the parent end of its pipe"""
+
+    def __init__(self, context, lang):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, lang), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+        self.last_used = time.monotonic()
+
+    def call(self, command, argument, timeout, on_progress=None):
+        """Send a request and wait for its answer, passing progress messages to `on_progress`"""
+        deadline = time.monotonic() + timeout
+        try:
+            self.conn.send((command, argument))
+            while True:
+                if not self.conn.poll(max(deadline - time.monotonic(), 0)):
+                    raise OCRWorkerError(f'OCR worker did not answer within {timeout}s')
+                outcome, result = self.conn.recv()
+                if outcome != 'progress':
+                    break
+                if on_progress is not None:
+                    on_progress(*result)
+        except (EOFError, OSError) as e:
+            raise OCRWorkerError(f'OCR worker died: {e}')
+        finally:
+            self.last_used = time.monotonic()
+
+        if outcome == 'error':
+            raise OCRTaskError(result)
+        return result
+
+    def is_healthy(self, timeout=PING_TIMEOUT):
+        if not self.process.is_alive():
+            return False
+        try:
+            self.call('ping', None, timeout)
+        except OCRWorkerError:
+            return False
+        return True
+
+    def stop(self):
+        try:
+            self.conn.send(('stop', None))
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+class OCRWorkerPool:
+    """
+    Fixed-size pool of warm OCR worker processes.
+    Workers idle longer than `health_interval` are pinged before use,
+    replaced when they time out or die (not when the scanner raises on a
+    report), and recycled after
+    `max_tasks` reports to bound memory growth in Tesseract/OpenCV.
+    """
+
+    def __init__(self, size, max_tasks, timeout, health_interval, lang):
+        self.max_tasks = max_tasks
+        self.timeout = timeout
+        self.health_interval = health_interval
+        self.lang = lang
+        # Workers never touch the database, and forking a process holding
+        # connections and threads is unsafe, so start them fresh
+        self._context = multiprocessing.get_context('spawn')
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(self._start_worker())
+
+    def analyze(self, file_path, progress=None):
+        """Run MedicalDocumentScanner.analyze_report in a warm worker"""
+        worker = self._checkout()
+        try:
+            result = worker.call('analyze', file_path, self.timeout, on_progress=progress)
+        except OCRTaskError:
+            # The scanner raised but the worker answered, so keep it
+            raise
+        except OCRWorkerError:
+            # A worker that timed out may still be busy; never reuse it
+            worker = self._replace(worker)
+            raise
+        finally:
+            self._checkin(worker)
+        return result
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+    def _start_worker(self):
+        return OCRWorker(self._context, self.lang)
+
+    def _replace(self, worker):
+        worker.stop()
+        return self._start_worker()
+
+    def _checkout(self):
+        try:
+            worker = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise OCRWorkerError('No OCR worker became available')
+
+        idle_for = time.monotonic() - worker.last_used
+        if not worker.process.is_alive() or (
+            idle_for > self.health_interval and not worker.is_healthy()
+        ):
+            worker = self._replace(worker)
+        return worker
+
+    def _checkin(self, worker):
+        worker.tasks += 1
+        if worker.tasks >= self.max_tasks:
+            worker = self._replace(worker)
+        self._idle.put(worker)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_ocr_pool():
+    """Process-wide pool, started on first use; None when OCR_POOL_SIZE is 0"""
+    global _pool
+    if settings.OCR_POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = OCRWorkerPool(
+                size=settings.OCR_POOL_SIZE,
+                max_tasks=settings.OCR_POOL_MAX_TASKS,
+                timeout=settings.OCR_POOL_TIMEOUT,
+                health_interval=settings.OCR_POOL_HEALTH_INTERVAL,
+                lang=settings.OCR_LANG,
+            )
+    return _pool
+
+def analyze_report_file(file_path, progress=None):
+    """
+    Analyze a report image in the warm pool, or in-process if it is
+    disabled. `progress` receives the scanner's (stage, detail) updates.
+    """
+    pool = get_ocr_pool()
+    if pool is None:
+        from .scanner import MedicalDocumentScanner
+        return MedicalDocumentScanner().analyze_report(file_path, progress=progress)
+
+    try:
+        return pool.analyze(file_path, progress=progress)
+    except OCRWorkerError as e:
+        # Same shape analyze_report returns when OCR fails
+        return {
+            'extracted_text': '',
+            'detected_conditions': [],
+            'health_metrics': {},
+            'ai_insights': f"Analysis failed: {str(e)}",
+            'status': 'failed'
+        }
\ No newline at end of file
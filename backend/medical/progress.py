@@ -0,0 +1,67 @@
+import asyncio
+from django.conf import settings
+from django.core.cache import cache
+from events.stream import RETRY_MS, format_event
+from .models import MedicalReport
+
+# Report statuses after which no more progress is published
+FINAL_STATUSES = ('completed', 'failed')
+
+def progress_key(report_id):
+    return f"report_progress:{report_id}"
+
+class ReportProgress:
+    """
+    Publishes the analysis stage of one report to the cache, where its
+    progress stream picks it up. Called as progress(stage, detail) by the
+    scanner and the analyze view.
+    """
+
+    def __init__(self, report_id):
+        self.key = progress_key(report_id)
+        self.seq = 0
+
+    def __call__(self, stage, detail=None):
+        self.seq += 1
+        cache.set(
+            self.key,
+            {'seq': self.seq, 'stage': stage, **(detail or {})},
+            settings.REPORT_PROGRESS_TIMEOUT
+        )
+
+async def report_status(report_id):
+    report = await MedicalReport.objects.only('id', 'status').aget(id=report_id)
+    return report.status
+
+async def progress_stream(report_id, status):
+    """
+    Stage updates of a report's analysis as server-sent events, ending
+    with a `status` event once it completes or fails.
+
+    Each tick reads only the report's progress cache key. The report's
+    status is re-read every OUTBOX_STREAM_RESYNC seconds, so streams also
+    end when the analysis ran in a process that does not share the cache.
+    """
+    loop = asyncio.get_running_loop()
+    started = last_read = loop.time()
+    seq = None
+    yield f'retry: {RETRY_MS}\n\n'
+
+    while status not in FINAL_STATUSES and loop.time() - started < settings.OUTBOX_STREAM_MAX_AGE:
+        await asyncio.sleep(settings.REPORT_PROGRESS_INTERVAL)
+
+        progress = await cache.aget(progress_key(report_id))
+        if progress is not None and progress['seq'] != seq:
+            seq = progress['seq']
+            yield format_event(progress, event='progress')
+            if progress['stage'] in FINAL_STATUSES:
+                status = progress['stage']
+                continue
+
+        if loop.time() - last_read >= settings.OUTBOX_STREAM_RESYNC:
+            last_read = loop.time()
+            status = await report_status(report_id)
+            if status not in FINAL_STATUSES:
+                yield ': keepalive\n\n'
+
+    yield format_event({'id': report_id, 'status': status}, event='status')
\ No newline at end of file
@@ -1,17 +1,69 @@
-import cv2
-import numpy as np
-import pytesseract
-from PIL import Image
+import bisect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from nutrifit.lazy import lazy_import, preload
 import re
 import json
 
+# Imported on first use; web processes that never scan skip their cost
+cv2 = lazy_import('cv2')
+np = lazy_import('numpy')
+pytesseract = lazy_import('pytesseract')
+Image = lazy_import('PIL.Image')
+
+# Layout analysis: boxes smaller than this are specks, denser than this are logos/photos
+MIN_REGION_WIDTH = 20
+MIN_REGION_HEIGHT = 8
+MAX_REGION_INK = 0.5
+REGION_PADDING = 10
+
+# Regions OCR'd concurrently per page (tesseract runs outside the GIL)
+OCR_THREADS = 4
+
+# Common patterns for blood test results, compiled once per process
+# (before fork under gunicorn): metric name -> pattern capturing its value
+METRIC_PATTERNS = {
+    name: re.compile(rf'{name}[:\s]*(\d+\.?\d*)')
+    for name in [
+        'glucose', 'hba1c', 'hemoglobin', 'cholesterol', 'ldl',
+        'hdl', 'triglycerides', 'tsh', 'creatinine',
+    ]
+}
+
+# Metric values read with a lower Tesseract word confidence (0-100) are dropped
+MIN_METRIC_CONFIDENCE = 60
+
+def preload_ocr_modules():
+    """Import the OCR and image libraries up front, for processes that scan"""
+    preload(cv2, np, pytesseract, Image)
+
+def tesseract_words(image, lang='eng'):
+    """OCR one block of text into (word, confidence, line key) tuples"""
+    data = pytesseract.image_to_data(image, lang=lang, config='--psm 6', output_type=pytesseract.Output.DICT)
+    words = []
+    for i, text in enumerate(data['text']):
+        if text.strip():
+            line = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            words.append((text.strip(), float(data['conf'][i]), line))
+    return words
+
 class MedicalDocumentScanner:
     """
     OpenCV-based medical document scanner and analyzer.
     Extracts text and detects health conditions from medical reports.
     """
     
-    def __init__(self):
+    def __init__(self, ocr=None):
+        # Callable turning an image into words (see tesseract_words); warm pool
+        # workers pass a loaded engine
+        self.ocr = ocr or tesseract_words
+        
+        # Words and confidences from the last extract_text call
+        self.words = []
+        
+        # Callable receiving (stage, detail) as analyze_report progresses
+        self.progress = None
+        
         # Common medical keywords and patterns
         self.condition_keywords = {
             'diabetes': ['diabetes', 'glucose', 'hba1c', 'blood sugar', 'hyperglycemia'],
@@ -35,18 +87,19 @@ class MedicalDocumentScanner:
             'tsh': (0.4, 4.0),
         }
     
+    def report_progress(self, stage, **detail):
+        if self.progress is not None:
+            self.progress(stage, detail)
+    
     def preprocess_image(self, image_path):
         """Preprocess image for better OCR results"""
         try:
-            # Read image
-            img = cv2.imread(image_path)
+            # Read image straight to grayscale; uploads already have a grayscale OCR copy
+            gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
             
-            if img is None:
+            if gray is None:
                 raise ValueError("Could not read image")
             
-            # Convert to grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            
             # Apply thresholding
             thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
             
@@ -58,23 +111,95 @@ class MedicalDocumentScanner:
         except Exception as e:
             raise Exception(f"Image preprocessing failed: {str(e)}")
     
+    def detect_regions(self, image):
+        """
+        Find text blocks on a preprocessed page as (x, y, w, h) boxes in
+        reading order. Characters are smeared into lines and rows, then
+        specks and ink-dense blobs (logos, photos, solid bars) are dropped.
+        """
+        height, width = image.shape[:2]
+        ink = cv2.threshold(image, 127, 255, cv2.THRESH_BINARY_INV)[1]
+        
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(width // 50, 3), max(height // 300, 1)))
+        merged = cv2.dilate(ink, kernel, iterations=2)
+        contours = cv2.findContours(merged, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0]
+        
+        regions = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            if w < MIN_REGION_WIDTH or h < MIN_REGION_HEIGHT:
+                continue
+            if cv2.countNonZero(ink[y:y + h, x:x + w]) / float(w * h) > MAX_REGION_INK:
+                continue
+            regions.append((x, y, w, h))
+        
+        return sorted(regions, key=lambda region: (region[1], region[0]))
+    
+    def crop_region(self, image, region):
+        """Region of the page with a white margin, which Tesseract reads best"""
+        x, y, w, h = region
+        crop = image[y:y + h, x:x + w]
+        return cv2.copyMakeBorder(
+            crop, REGION_PADDING, REGION_PADDING, REGION_PADDING, REGION_PADDING,
+            cv2.BORDER_CONSTANT, value=255
+        )
+    
+    def ocr_regions(self, image):
+        """OCR the text regions of a page in parallel, the whole page if none are found"""
+        regions = self.detect_regions(image)
+        crops = [self.crop_region(image, region) for region in regions] or [image]
+        
+        done = [0]
+        lock = threading.Lock()
+        self.report_progress('ocr', done=0, total=len(crops))
+        
+        def read(crop):
+            words = self.ocr(crop)
+            with lock:
+                done[0] += 1
+                self.report_progress('ocr', done=done[0], total=len(crops))
+            return words
+        
+        with ThreadPoolExecutor(max_workers=OCR_THREADS) as pool:
+            results = list(pool.map(read, crops))
+        
+        # Line keys are per crop, so prefix them with the crop index
+        return [
+            (text, confidence, (index,) + line)
+            for index, words in enumerate(results)
+            for text, confidence, line in words
+        ]
+    
+    def join_words(self, words):
+        """Rebuild text from OCR words, one line per OCR line"""
+        lines = []
+        previous = None
+        for text, _, line in words:
+            if line != previous:
+                lines.append([])
+                previous = line
+            lines[-1].append(text)
+        return "\n".join(" ".join(line) for line in lines)
+    
     def extract_text(self, image_path):
         """Extract text from image using OCR"""
         try:
             # Preprocess image
+            self.report_progress('preprocess')
             processed_img = self.preprocess_image(image_path)
             
-            # Perform OCR
-            text = pytesseract.image_to_string(processed_img)
+            # Perform OCR on the detected text regions
+            self.words = self.ocr_regions(processed_img)
             
-            return text.strip()
+            return self.join_words(self.words).strip()
         
         except Exception as e:
             # Fallback: try with original image
             try:
                 img = Image.open(image_path)
-                text = pytesseract.image_to_string(img)
-                return text.strip()
+                self.report_progress('ocr', done=0, total=1)
+                self.words = self.ocr(img)
+                return self.join_words(self.words).strip()
             except:
                 raise Exception(f"Text extraction failed: {str(e)}")
     
@@ -91,29 +216,44 @@ class MedicalDocumentScanner:
         
         return list(set(detected))
     
-    def extract_health_metrics(self, text):
-        """Extract numerical health metrics from text"""
+    def word_confidences(self, words):
+        """Start offsets and confidences of each word in join_words' output"""
+        starts, confidences = [], []
+        offset = 0
+        previous = None
+        for text, confidence, line in words:
+            if previous is not None:
+                offset += 1  # newline or space separator
+            previous = line
+            starts.append(offset)
+            confidences.append(confidence)
+            offset += len(text)
+        return starts, confidences
+    
+    def is_confident(self, match, starts, confidences):
+        """Whether the word holding a matched value passed the confidence cutoff"""
+        if not starts:
+            return True
+        word = bisect.bisect_right(starts, match.start(1)) - 1
+        return confidences[word] >= MIN_METRIC_CONFIDENCE
+    
+    def extract_health_metrics(self, text, words=None):
+        """
+        Extract numerical health metrics from text. With OCR words, values
+        Tesseract read with low confidence are skipped.
+        """
         metrics = {}
-        
-        # Common patterns for blood test results
-        patterns = [
-            r'glucose[:\s]*(\d+\.?\d*)',
-            r'hba1c[:\s]*(\d+\.?\d*)',
-            r'hemoglobin[:\s]*(\d+\.?\d*)',
-            r'cholesterol[:\s]*(\d+\.?\d*)',
-            r'ldl[:\s]*(\d+\.?\d*)',
-            r'hdl[:\s]*(\d+\.?\d*)',
-            r'triglycerides[:\s]*(\d+\.?\d*)',
-            r'tsh[:\s]*(\d+\.?\d*)',
-            r'creatinine[:\s]*(\d+\.?\d*)',
-        ]
+        starts, confidences = self.word_confidences(words) if words else ([], [])
         
         text_lower = text.lower()
         
-        for pattern in patterns:
-            match = re.search(pattern, text_lower)
+        for metric_name, pattern in METRIC_PATTERNS.items():
+            # First occurrence whose value was read with enough confidence
+            match = next(
+                (m for m in pattern.finditer(text_lower) if self.is_confident(m, starts, confidences)),
+                None
+            )
             if match:
-                metric_name = pattern.split('[')[0]
                 value = float(match.group(1))
                 metrics[metric_name] = value
                 
@@ -159,8 +299,13 @@ class MedicalDocumentScanner:
         
         return " ".join(insights)
     
-    def analyze_report(self, image_path):
-        """Complete analysis of medical report"""
+    def analyze_report(self, image_path, progress=None):
+        """
+        Complete analysis of medical report. `progress` is called with
+        (stage, detail) at each stage: preprocess, ocr (once per region
+        read, with done and total counts) and metrics.
+        """
+        self.progress = progress
         result = {
             'extracted_text': '',
             'detected_conditions': [],
@@ -184,7 +329,8 @@ class MedicalDocumentScanner:
             result['detected_conditions'] = conditions
             
             # Extract metrics
-            metrics = self.extract_health_metrics(text)
+            self.report_progress('metrics')
+            metrics = self.extract_health_metrics(text, self.words)
             result['health_metrics'] = metrics
             
             # Generate insights
@@ -194,5 +340,7 @@ class MedicalDocumentScanner:
         except Exception as e:
             result['status'] = 'failed'
             result['ai_insights'] = f"Analysis failed: {str(e)}"
+        finally:
+            self.progress = None
         
         return result
\ No newline at end of file
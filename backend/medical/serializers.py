@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import MedicalReport, Disease
+from .models import MedicalReport, Disease, ReportUpload
+from .derivatives import generate_report_derivatives
+from .uploads import StoredUpload, UploadRejected, check_size
 
 class DiseaseSerializer(serializers.ModelSerializer):
     class Meta:
@@ -12,18 +14,39 @@ class MedicalReportSerializer(serializers.ModelSerializer):
     class Meta:
         model = MedicalReport
         fields = [
-            'id', 'user', 'report_type', 'file', 'file_path',
-            'status', 'extracted_text', 'detected_conditions',
+            'id', 'user', 'report_type', 'file', 'thumbnail', 'file_path',
+            'file_hash', 'file_size', 'status', 'extracted_text', 'detected_conditions',
             'detected_diseases', 'key_findings', 'health_metrics',
             'ai_insights', 'dietary_recommendations',
             'scan_date', 'updated_at'
         ]
         read_only_fields = [
-            'id', 'user', 'file_path', 'status', 'extracted_text',
+            'id', 'user', 'thumbnail', 'file_path', 'file_hash', 'file_size', 'status', 'extracted_text',
             'detected_conditions', 'key_findings', 'health_metrics',
             'ai_insights', 'dietary_recommendations', 'scan_date', 'updated_at'
         ]
 
+class DiseaseSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Disease
+        fields = ['id', 'name', 'category', 'severity']
+
+class MedicalReportListSerializer(serializers.ModelSerializer):
+    """
+    Compact list representation. Previews use the thumbnail, and the large
+    text and JSON analysis fields are only returned by the detail endpoint.
+    """
+    detected_diseases = DiseaseSummarySerializer(many=True, read_only=True)
+    
+    class Meta:
+        model = MedicalReport
+        fields = [
+            'id', 'report_type', 'thumbnail', 'status',
+            'detected_conditions', 'detected_diseases',
+            'scan_date', 'updated_at'
+        ]
+        read_only_fields = fields
+
 class MedicalReportUploadSerializer(serializers.ModelSerializer):
     class Meta:
         model = MedicalReport
@@ -31,5 +54,39 @@ class MedicalReportUploadSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
-        validated_data['file_path'] = validated_data['file'].name
-        return MedicalReport.objects.create(**validated_data)
\ No newline at end of file
+        upload = validated_data['file']
+        
+        if isinstance(upload, StoredUpload):
+            # Already streamed to its final path; point the field at it instead of copying
+            validated_data['file'] = upload.storage_name
+            validated_data['file_hash'] = upload.sha256
+            validated_data['file_size'] = upload.size
+            validated_data['file_path'] = upload.storage_name
+        else:
+            validated_data['file_path'] = upload.name
+        
+        report = MedicalReport.objects.create(**validated_data)
+        generate_report_derivatives(report)
+        return report
+
+class ReportUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ReportUpload
+        fields = [
+            'id', 'report_type', 'file_name', 'total_size', 'received_size',
+            'status', 'report', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'received_size', 'status', 'report', 'created_at', 'updated_at']
+    
+    def validate_total_size(self, value):
+        try:
+            check_size(value)
+        except UploadRejected as e:
+            raise serializers.ValidationError(str(e))
+        if value <= 0:
+            raise serializers.ValidationError('File is empty.')
+        return value
+    
+    def create(self, validated_data):
+        validated_data['user'] = self.context['request'].user
+        return ReportUpload.objects.create(**validated_data)
\ No newline at end of file
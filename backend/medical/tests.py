@@ -0,0 +1,226 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import StopUpload
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from nutrifit import fields
+from rest_framework.test import APIClient
+from marketplace.models import Order
+from users.models import User
+from .models import MedicalReport, ReportUpload
+from .uploads import UploadRejected, ValidatingUploadHandler, detect_extension
+
+PDF = b'%PDF-1.4\n' + b'report line\n' * 200
+
+class DetectExtensionTestCase(SimpleTestCase):
+    """Uploads are typed by their leading bytes, not their name or content type"""
+    
+    def test_accepted_signatures(self):
+        for header, extension in [
+            (PDF, 'pdf'),
+            (b'\xff\xd8\xff\xe0\x00\x10JFIF', 'jpg'),
+            (b'\x89PNG\r\n\x1a\n\x00\x00', 'png'),
+            (b'II*\x00\x08\x00', 'tif'),
+            (b'MM\x00*\x00\x00', 'tif'),
+        ]:
+            self.assertEqual(detect_extension(header), extension)
+    
+    def test_rejected_signatures(self):
+        for header in [b'GIF89a', b'<html>', b'%PDF', b'']:
+            with self.assertRaises(UploadRejected):
+                detect_extension(header)
+
+class UploadTestCase(TestCase):
+    """Uploads are validated from their content and never leave stray files behind"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('uploads@example.com', 'pass12345', first_name='Test', last_name='User')
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+    
+    def stored_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.media_root)
+            for root, _, names in os.walk(self.media_root) for name in names
+        )
+    
+    def upload(self, content, name='report.pdf'):
+        return self.client.post('/api/medical/reports/upload/', {
+            'report_type': 'blood_test',
+            'file': SimpleUploadedFile(name, content, content_type='application/pdf'),
+        }, format='multipart')
+    
+    def test_upload_stored_under_detected_extension(self):
+        response = self.upload(PDF, name='scan.png')
+        self.assertEqual(response.status_code, 201)
+        
+        report = MedicalReport.objects.get(user=self.user)
+        self.assertTrue(report.file.name.endswith('.pdf'))
+        self.assertEqual(report.file_hash, hashlib.sha256(PDF).hexdigest())
+        self.assertEqual(report.file_size, len(PDF))
+        self.assertEqual(self.stored_files(), [report.file.name])
+    
+    def test_unsupported_content_rejected(self):
+        response = self.upload(b'<html><body>not a report</body></html>')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(MedicalReport.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+    
+    @override_settings(MEDICAL_UPLOAD_MAX_BYTES=1024)
+    def test_oversized_upload_rejected(self):
+        response = self.upload(PDF)
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(MedicalReport.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+    
+    @override_settings(MEDICAL_UPLOAD_MAX_BYTES=1024)
+    def test_streamed_size_limit(self):
+        # Without a usable Content-Length the limit is enforced chunk by chunk
+        handler = ValidatingUploadHandler()
+        handler.new_file('file', 'report.pdf', 'application/pdf', None)
+        handler.receive_data_chunk(PDF[:800], 0)
+        self.assertEqual(len(self.stored_files()), 1)
+        
+        with self.assertRaises(StopUpload):
+            handler.receive_data_chunk(PDF[800:1600], 800)
+        self.assertEqual(handler.error.status_code, 413)
+        self.assertEqual(self.stored_files(), [])
+    
+    def start_chunked_upload(self, content):
+        response = self.client.post('/api/medical/reports/uploads/', {
+            'report_type': 'blood_test', 'file_name': 'report.pdf', 'total_size': len(content),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return f"/api/medical/reports/uploads/{response.data['id']}/"
+    
+    def put_chunk(self, url, chunk, offset):
+        return self.client.generic(
+            'PUT', url, chunk, content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset)
+        )
+    
+    def test_chunked_upload(self):
+        url = self.start_chunked_upload(PDF)
+        
+        response = self.put_chunk(url, PDF[:1000], 0)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['received_size'], 1000)
+        self.assertEqual(self.client.get(url).data['received_size'], 1000)
+        
+        # Retried or skipped chunks are refused with the offset to resume from
+        for offset in (0, 1500):
+            response = self.put_chunk(url, PDF[offset:offset + 500], offset)
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.data['received_size'], 1000)
+        
+        # A chunk running past the declared size is refused
+        response = self.put_chunk(url, PDF[1000:] + b'extra', 1000)
+        self.assertEqual(response.status_code, 400)
+        
+        response = self.put_chunk(url, PDF[1000:], 1000)
+        self.assertEqual(response.status_code, 201)
+        report = MedicalReport.objects.get(user=self.user)
+        with report.file.open('rb') as f:
+            self.assertEqual(f.read(), PDF)
+        self.assertEqual(report.file_hash, hashlib.sha256(PDF).hexdigest())
+        self.assertEqual(ReportUpload.objects.get().status, 'completed')
+    
+    def test_chunked_upload_checks_first_chunk_signature(self):
+        url = self.start_chunked_upload(b'GIF89a' + PDF)
+        response = self.put_chunk(url, b'GIF89a' + PDF[:100], 0)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ReportUpload.objects.get().received_size, 0)
+        self.assertEqual(self.stored_files(), [])
+
+class CompressedFieldTestCase(TestCase):
+    """Compressed columns round-trip their values and still read legacy plain ones"""
+    
+    TEXT = 'Hemoglobin 13.5 g/dL, glucose 110 mg/dL, बाँकी सामान्य. ' * 40
+    METRICS = {'glucose': {'value': 110.0, 'unit': 'mg/dL'}, 'notes': TEXT}
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('compressed@example.com', 'pass12345', first_name='Test', last_name='User')
+    
+    def create_report(self, **fields):
+        return MedicalReport.objects.create(user=self.user, report_type='blood_test', file='medical_reports/r.pdf', **fields)
+    
+    def raw_column(self, report, column):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT {column} FROM medical_reports WHERE id = %s',
+                [MedicalReport._meta.pk.get_db_prep_value(report.id, connection)]
+            )
+            return bytes(cursor.fetchone()[0])
+    
+    def write_raw_column(self, report, column, value):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE medical_reports SET {column} = %s WHERE id = %s',
+                [value, MedicalReport._meta.pk.get_db_prep_value(report.id, connection)]
+            )
+    
+    def test_compress_round_trip(self):
+        for text in ['', 'short', self.TEXT]:
+            self.assertEqual(fields.decompress(fields.compress(text)), text)
+        
+        self.assertEqual(fields.compress('short'), b'short')
+        compressed = fields.compress(self.TEXT)
+        self.assertTrue(compressed.startswith(fields.MAGIC + fields.CODEC_ZLIB))
+        self.assertLess(len(compressed), len(self.TEXT.encode()))
+    
+    @override_settings(COMPRESSED_FIELD_CODEC='zstd')
+    def test_zstd_round_trip(self):
+        compressed = fields.compress(self.TEXT)
+        if fields.zstandard is None:
+            # Falls back to zlib without the optional package
+            self.assertTrue(compressed.startswith(fields.MAGIC + fields.CODEC_ZLIB))
+        else:
+            self.assertTrue(compressed.startswith(fields.MAGIC + fields.CODEC_ZSTD))
+        self.assertEqual(fields.decompress(compressed), self.TEXT)
+    
+    def test_model_round_trip(self):
+        report = self.create_report(extracted_text=self.TEXT, health_metrics=self.METRICS, ai_insights='Normal')
+        self.assertTrue(self.raw_column(report, 'extracted_text').startswith(fields.MAGIC))
+        self.assertTrue(self.raw_column(report, 'health_metrics').startswith(fields.MAGIC))
+        
+        report = MedicalReport.objects.get(id=report.id)
+        self.assertEqual(report.extracted_text, self.TEXT)
+        self.assertEqual(report.health_metrics, self.METRICS)
+        self.assertEqual(report.ai_insights, 'Normal')
+        self.assertEqual(report.key_findings, {})
+    
+    def test_reads_legacy_plain_values(self):
+        report = self.create_report()
+        self.write_raw_column(report, 'extracted_text', self.TEXT.encode())
+        self.write_raw_column(report, 'health_metrics', b'{"glucose": 110}')
+        
+        report = MedicalReport.objects.get(id=report.id)
+        self.assertEqual(report.extracted_text, self.TEXT)
+        self.assertEqual(report.health_metrics, {'glucose': 110})
+    
+    def test_bulk_update(self):
+        orders = [
+            Order.objects.create(user=self.user, total_amount=100, delivery_address='Kathmandu')
+            for _ in range(2)
+        ]
+        items = [{'food_name': 'Dal', 'quantity': quantity, 'notes': self.TEXT} for quantity in (1, 2)]
+        for order, item in zip(orders, items):
+            order.order_items = [item]
+        Order.objects.bulk_update(orders, ['order_items'])
+        
+        self.assertEqual(
+            dict(Order.objects.filter(user=self.user).values_list('id', 'order_items')),
+            {order.id: [item] for order, item in zip(orders, items)}
+        )
\ No newline at end of file
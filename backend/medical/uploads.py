@@ -0,0 +1,182 @@
+import hashlib
+import os
+import uuid
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.utils import timezone
+
+# Leading bytes of the document formats we accept -> stored file extension
+FILE_SIGNATURES = [
+    (b'%PDF-', 'pdf'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'II*\x00', 'tif'),
+    (b'MM\x00*', 'tif'),
+]
+
+# Longest signature; the first chunk must contain at least this many bytes
+SIGNATURE_LENGTH = max(len(signature) for signature, _ in FILE_SIGNATURES)
+
+class UploadRejected(Exception):
+    """Raised when an upload fails size or content validation"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+def detect_extension(header):
+    """Match the first bytes of a file against the accepted formats"""
+    for signature, extension in FILE_SIGNATURES:
+        if header.startswith(signature):
+            return extension
+    raise UploadRejected('Unsupported file type. Upload a PDF, JPEG, PNG or TIFF document.')
+
+def check_size(size):
+    """Reject an upload larger than MEDICAL_UPLOAD_MAX_BYTES"""
+    if size and size > settings.MEDICAL_UPLOAD_MAX_BYTES:
+        raise UploadRejected(
+            f'File too large. The limit is {settings.MEDICAL_UPLOAD_MAX_BYTES // (1024 * 1024)} MB.',
+            status_code=413
+        )
+
+def build_report_path(extension):
+    """Final storage name for a report, matching MedicalReport.file's upload_to"""
+    return timezone.now().strftime(f'medical_reports/%Y/%m/{uuid.uuid4().hex}.{extension}')
+
+def reserve_report_path(extension):
+    """Pick a free final storage name for a report and create its directory"""
+    name = default_storage.get_available_name(build_report_path(extension))
+    os.makedirs(os.path.dirname(default_storage.path(name)), exist_ok=True)
+    return name
+
+def hash_stored_file(name):
+    """SHA-256 of a stored file, read in chunks"""
+    digest = hashlib.sha256()
+    with default_storage.open(name, 'rb') as f:
+        for chunk in f.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class StoredUpload(UploadedFile):
+    """
+    An upload already written to its final storage path. The file is only
+    opened if something reads it, so no descriptor is held per upload.
+    """
+
+    def __init__(self, storage_name, sha256, **kwargs):
+        super().__init__(**kwargs)
+        self.storage_name = storage_name
+        self.sha256 = sha256
+
+    def open(self, mode='rb'):
+        if self.closed:
+            self.file = default_storage.open(self.storage_name, mode)
+        else:
+            self.file.seek(0)
+        return self
+
+class ValidatingUploadHandler(FileUploadHandler):
+    """
+    Streams a multipart upload straight to its final storage path.
+    The file type is checked from the first chunk, the size is enforced as
+    chunks arrive, and the SHA-256 is computed on the way through, so bad
+    or oversized uploads are stopped without buffering the whole body.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.error = None
+        self.storage_name = None
+        self.completed_names = []
+        self._path = None
+        self._file = None
+        self._hash = None
+        self._size = 0
+        self._header = b''
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._header = b''
+
+    def receive_data_chunk(self, raw_data, start):
+        try:
+            if self._file is None:
+                # Hold back bytes until there are enough to identify the format
+                self._header += raw_data
+                if len(self._header) < SIGNATURE_LENGTH:
+                    return None
+                raw_data, self._header = self._header, b''
+                self._open(detect_extension(raw_data))
+
+            self._size += len(raw_data)
+            check_size(self._size)
+        except UploadRejected as e:
+            self.error = e
+            self.discard()
+            raise StopUpload(connection_reset=True)
+
+        self._hash.update(raw_data)
+        self._file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if self._file is None:
+            if not self._header:
+                return None
+            try:
+                # Whole file was shorter than the longest signature
+                self._open(detect_extension(self._header))
+            except UploadRejected as e:
+                self.error = e
+                return None
+            self._hash.update(self._header)
+            self._file.write(self._header)
+            self._size += len(self._header)
+
+        self._file.close()
+        self._file = None
+        self._path = None
+        self.completed_names.append(self.storage_name)
+        return StoredUpload(
+            storage_name=self.storage_name,
+            sha256=self._hash.hexdigest(),
+            file=None,
+            name=self.file_name,
+            content_type=self.content_type,
+            size=self._size,
+            charset=self.charset,
+        )
+
+    def upload_interrupted(self):
+        self.discard()
+
+    def discard_completed(self, keep=None):
+        """Remove files that were fully received but will not be used, except `keep`"""
+        for name in self.completed_names:
+            if name != keep:
+                default_storage.delete(name)
+        self.completed_names = []
+
+    def discard(self):
+        """Remove the partially written current file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._path and os.path.exists(self._path):
+            os.remove(self._path)
+        self._path = None
+
+    def _open(self, extension):
+        self.storage_name = reserve_report_path(extension)
+        self._path = default_storage.path(self.storage_name)
+        self._file = open(self._path, 'wb')
+
+def install_upload_handler(request):
+    """Replace a request's upload handlers with a ValidatingUploadHandler"""
+    handler = ValidatingUploadHandler(request)
+    request.upload_handlers = [handler]
+    return handler
\ No newline at end of file
@@ -4,7 +4,12 @@ from . import views
 urlpatterns = [
     path('reports/', views.MedicalReportListView.as_view(), name='medical-reports'),
     path('reports/upload/', views.MedicalReportUploadView.as_view(), name='upload-report'),
+    path('reports/upload/async/', views.AsyncMedicalReportUploadView.as_view(), name='upload-report-async'),
+    path('reports/uploads/', views.ReportUploadCreateView.as_view(), name='report-upload-create'),
+    path('reports/uploads/<uuid:pk>/', views.ReportUploadChunkView.as_view(), name='report-upload-chunk'),
     path('reports/<uuid:pk>/', views.MedicalReportDetailView.as_view(), name='report-detail'),
+    path('reports/<uuid:pk>/status/', views.MedicalReportStatusView.as_view(), name='report-status'),
+    path('reports/<uuid:pk>/progress/', views.MedicalReportProgressView.as_view(), name='report-progress'),
     path('reports/<uuid:pk>/analyze/', views.AnalyzeMedicalReportView.as_view(), name='analyze-report'),
     path('diseases/', views.DiseaseListView.as_view(), name='diseases'),
 ]
\ No newline at end of file
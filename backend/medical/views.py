@@ -3,42 +3,226 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import Prefetch
+from nutrifit.async_views import AsyncAPIView, run_in_executor
 import os
-from .models import MedicalReport, Disease
-from .serializers import MedicalReportSerializer, MedicalReportUploadSerializer, DiseaseSerializer
-from .scanner import MedicalDocumentScanner
+from .models import MedicalReport, Disease, ReportUpload
+from .serializers import (
+    MedicalReportSerializer, MedicalReportListSerializer, MedicalReportUploadSerializer,
+    DiseaseSerializer, ReportUploadSerializer
+)
+from .derivatives import generate_report_derivatives
+from events.stream import event_stream_response
+from .ocr_pool import analyze_report_file
+from .progress import ReportProgress, progress_stream
+from .uploads import (
+    SIGNATURE_LENGTH, UploadRejected, check_size, detect_extension, hash_stored_file,
+    install_upload_handler, reserve_report_path
+)
+
+# Columns loaded for the report list; the large text and JSON fields stay deferred
+LIST_REPORT_FIELDS = [
+    'id', 'user_id', 'report_type', 'thumbnail', 'status',
+    'detected_conditions', 'scan_date', 'updated_at',
+]
+
+# Bytes read from the request body per write during chunked uploads
+UPLOAD_READ_SIZE = 64 * 1024
+
+def save_report_upload(request):
+    """
+    Validate and store a multipart report upload.
+    The body is streamed through a ValidatingUploadHandler, so oversized or
+    unsupported files are rejected before the rest of the body is read.
+    `request` is the Django HttpRequest; returns (response data, status code).
+    """
+    try:
+        check_size(int(request.META.get('CONTENT_LENGTH') or 0))
+    except UploadRejected as e:
+        return {'error': str(e)}, e.status_code
+    
+    handler = install_upload_handler(request)
+    data = {
+        'report_type': request.POST.get('report_type'),
+        'file': request.FILES.get('file'),
+    }
+    
+    if handler.error:
+        handler.discard_completed()
+        return {'error': str(handler.error)}, handler.error.status_code
+    
+    serializer = MedicalReportUploadSerializer(data=data, context={'request': request})
+    if not serializer.is_valid():
+        handler.discard_completed()
+        return serializer.errors, status.HTTP_400_BAD_REQUEST
+    
+    report = serializer.save()
+    # Files sent under other field names are not part of the report
+    handler.discard_completed(keep=report.file.name)
+    return (
+        {
+            'report': MedicalReportSerializer(report).data,
+            'message': 'Report uploaded successfully. Use the analyze endpoint to process it.'
+        },
+        status.HTTP_201_CREATED
+    )
 
 class MedicalReportListView(generics.ListAPIView):
-    serializer_class = MedicalReportSerializer
+    serializer_class = MedicalReportListSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return MedicalReport.objects.filter(user=self.request.user)
+        # Load only what the compact representation needs
+        return MedicalReport.objects.filter(user=self.request.user).only(
+            *LIST_REPORT_FIELDS
+        ).prefetch_related(
+            Prefetch('detected_diseases', queryset=Disease.objects.only('id', 'name', 'category', 'severity'))
+        )
 
 class MedicalReportDetailView(generics.RetrieveAPIView):
     serializer_class = MedicalReportSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return MedicalReport.objects.filter(user=self.request.user)
+        return MedicalReport.objects.filter(user=self.request.user).prefetch_related('detected_diseases')
 
 class MedicalReportUploadView(generics.CreateAPIView):
     serializer_class = MedicalReportUploadSerializer
     permission_classes = [IsAuthenticated]
     
     def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        report = serializer.save()
+        data, status_code = save_report_upload(request._request)
+        return Response(data, status=status_code)
+
+class ReportUploadCreateView(generics.CreateAPIView):
+    """Start a resumable chunked upload"""
+    serializer_class = ReportUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+class ReportUploadChunkView(APIView):
+    """
+    Resumable upload protocol: GET returns the current offset, PUT appends the
+    raw request body at the offset given in the Upload-Offset header. The
+    report is created once the declared size has been received.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, pk):
+        try:
+            upload = ReportUpload.objects.get(id=pk, user=request.user)
+        except ReportUpload.DoesNotExist:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response(ReportUploadSerializer(upload).data)
+    
+    def put(self, request, pk):
+        try:
+            upload = ReportUpload.objects.get(id=pk, user=request.user)
+        except ReportUpload.DoesNotExist:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        if upload.status == 'completed':
+            return Response(ReportUploadSerializer(upload).data, status=status.HTTP_200_OK)
+        
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return Response(
+                {'error': 'Upload-Offset and Content-Length headers are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # The client resumes from the offset we report, never from its own guess
+        if offset != upload.received_size:
+            return Response(
+                {'error': 'Offset mismatch', 'received_size': upload.received_size},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        if length <= 0 or offset + length > upload.total_size:
+            return Response(
+                {'error': 'Chunk does not fit the declared file size'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            written = self.write_chunk(request, upload, offset, length)
+        except UploadRejected as e:
+            return Response({'error': str(e)}, status=e.status_code)
+        
+        # Only advance if nobody else moved the offset while we were writing
+        updated = ReportUpload.objects.filter(id=upload.id, received_size=offset).update(
+            received_size=offset + written
+        )
+        if not updated:
+            upload.refresh_from_db()
+            return Response(
+                {'error': 'Offset mismatch', 'received_size': upload.received_size},
+                status=status.HTTP_409_CONFLICT
+            )
+        upload.received_size = offset + written
+        
+        if upload.received_size < upload.total_size:
+            return Response(ReportUploadSerializer(upload).data, status=status.HTTP_200_OK)
+        
+        report = MedicalReport.objects.create(
+            user=request.user,
+            report_type=upload.report_type,
+            file=upload.storage_name,
+            file_path=upload.storage_name,
+            file_hash=hash_stored_file(upload.storage_name),
+            file_size=upload.total_size
+        )
+        generate_report_derivatives(report)
+        upload.report = report
+        upload.status = 'completed'
+        upload.save(update_fields=['report', 'status', 'updated_at'])
         
-        # Return report with message
         return Response(
             {
+                'upload': ReportUploadSerializer(upload).data,
                 'report': MedicalReportSerializer(report).data,
                 'message': 'Report uploaded successfully. Use the analyze endpoint to process it.'
             },
             status=status.HTTP_201_CREATED
         )
+    
+    def write_chunk(self, request, upload, offset, length):
+        """Stream the request body to the upload's file at `offset`"""
+        stream = request.stream
+        first = b''
+        
+        if not upload.storage_name:
+            # First chunk decides the file type and the final storage path
+            first = stream.read(min(length, SIGNATURE_LENGTH)) if stream else b''
+            if len(first) < min(length, SIGNATURE_LENGTH):
+                raise UploadRejected('Incomplete chunk')
+            upload.storage_name = reserve_report_path(detect_extension(first))
+            upload.save(update_fields=['storage_name', 'updated_at'])
+        
+        path = default_storage.path(upload.storage_name)
+        mode = 'r+b' if os.path.exists(path) else 'wb'
+        written = 0
+        
+        with open(path, mode) as f:
+            # Drop any tail left by an interrupted earlier attempt at this chunk
+            f.truncate(offset)
+            f.seek(offset)
+            
+            if first:
+                f.write(first)
+                written += len(first)
+            
+            while written < length:
+                data = stream.read(min(UPLOAD_READ_SIZE, length - written))
+                if not data:
+                    break
+                f.write(data)
+                written += len(data)
+        
+        return written
 
 class AnalyzeMedicalReportView(APIView):
     permission_classes = [IsAuthenticated]
@@ -58,14 +242,19 @@ class AnalyzeMedicalReportView(APIView):
             report.status = 'processing'
             report.save()
             
-            # Get file path
-            file_path = report.file.path
+            # Stage updates for the report's progress stream
+            progress = ReportProgress(report.id)
+            progress('processing')
+            
+            # Reports uploaded before derivatives existed get them now
+            if not report.ocr_file:
+                generate_report_derivatives(report)
             
-            # Initialize scanner
-            scanner = MedicalDocumentScanner()
+            # Prefer the pre-normalized grayscale copy over the original
+            file_path = report.ocr_file.path if report.ocr_file else report.file.path
             
-            # Analyze report
-            analysis_result = scanner.analyze_report(file_path)
+            # Analyze report in a warm OCR worker
+            analysis_result = analyze_report_file(file_path, progress=progress)
             
             # Update report with results
             report.extracted_text = analysis_result['extracted_text']
@@ -82,12 +271,14 @@ class AnalyzeMedicalReportView(APIView):
                 report.detected_diseases.set(diseases)
             
             # Generate dietary recommendations
+            progress('recommendations')
             dietary_recs = []
             for disease in report.detected_diseases.all():
                 dietary_recs.append(f"For {disease.name}: {disease.dietary_guidelines}")
             
             report.dietary_recommendations = "\n\n".join(dietary_recs) if dietary_recs else "Maintain a balanced, wholesome diet."
             report.save()
+            progress(report.status)
             
             serializer = MedicalReportSerializer(report)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -101,6 +292,7 @@ class AnalyzeMedicalReportView(APIView):
             report.status = 'failed'
             report.ai_insights = f"Analysis failed: {str(e)}"
             report.save()
+            ReportProgress(report.id)('failed', {'error': str(e)})
             
             return Response(
                 {'error': str(e)},
@@ -110,4 +302,46 @@ class AnalyzeMedicalReportView(APIView):
 class DiseaseListView(generics.ListAPIView):
     queryset = Disease.objects.all()
     serializer_class = DiseaseSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    permission_classes = [IsAuthenticated]
+
+class AsyncMedicalReportUploadView(AsyncAPIView):
+    """Upload endpoint for ASGI; parsing and file writes run off the event loop"""
+    
+    async def post(self, request):
+        data, status_code = await run_in_executor(save_report_upload, request)
+        return self.respond(data, status=status_code)
+
+class MedicalReportStatusView(AsyncAPIView):
+    """Cheap status check for clients waiting on an analysis"""
+    
+    async def get(self, request, pk):
+        try:
+            report = await MedicalReport.objects.only('id', 'status', 'updated_at').aget(
+                id=pk, user=request.user
+            )
+        except MedicalReport.DoesNotExist:
+            return self.error('Report not found', status=status.HTTP_404_NOT_FOUND)
+        
+        return self.respond({
+            'id': report.id,
+            'status': report.status,
+            'updated_at': report.updated_at,
+        })
+
+class MedicalReportProgressView(AsyncAPIView):
+    """
+    Server-sent analysis progress for a report: `progress` events per stage
+    (processing, preprocess, ocr with done/total regions, metrics,
+    recommendations) and a final `status` event. Serve under ASGI.
+    """
+    stream_token_auth = True
+    
+    async def get(self, request, pk):
+        try:
+            report = await MedicalReport.objects.only('id', 'status').aget(
+                id=pk, user=request.user
+            )
+        except MedicalReport.DoesNotExist:
+            return self.error('Report not found', status=status.HTTP_404_NOT_FOUND)
+        
+        return event_stream_response(progress_stream(report.id, report.status))
\ No newline at end of file
@@ -2,4 +2,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nutrifit.settings')
+# Sync code runs on a different thread each request under ASGI, so persistent
+# connections would pile up unused; close them after each request instead
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 application = get_asgi_application()
\ No newline at end of file
@@ -0,0 +1,77 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import JsonResponse
+from django.views import View
+from rest_framework.exceptions import APIException
+from rest_framework.utils.encoders import JSONEncoder
+from users.authentication import CachedJWTAuthentication, stream_tokens
+
+# Threads for CPU-bound and sync-only work started from async views
+_executor = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_EXECUTOR_WORKERS,
+    thread_name_prefix='nutrifit-async'
+)
+
+def _run_with_db_cleanup(func, *args, **kwargs):
+    try:
+        return func(*args, **kwargs)
+    finally:
+        # Executor threads outlive requests, so release their connections
+        close_old_connections()
+
+async def run_in_executor(func, *args, **kwargs):
+    """Run a sync callable on the shared executor without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor,
+        functools.partial(_run_with_db_cleanup, func, *args, **kwargs)
+    )
+
+class AsyncAPIView(View):
+    """
+    Minimal async counterpart of DRF's APIView for ASGI deployments.
+    Authenticates with the same JWT settings, is CSRF exempt and returns
+    JSON encoded like DRF responses. Handlers must be `async def`.
+
+    Views with `stream_token_auth` (server-sent event streams) also accept
+    a stream token as ?token=, for clients using EventSource.
+    """
+    stream_token_auth = False
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        token = request.GET.get('token') if self.stream_token_auth else None
+        if token:
+            user = await sync_to_async(stream_tokens.authenticate)(token)
+            if user is None:
+                return self.respond({'detail': 'Stream token is invalid or expired.'}, status=401)
+            request.user, request.auth = user, None
+            return await super().dispatch(request, *args, **kwargs)
+
+        try:
+            result = await sync_to_async(CachedJWTAuthentication().authenticate)(request)
+        except APIException as e:
+            # Same body DRF sends for authentication failures
+            detail = e.detail if isinstance(e.detail, dict) else {'detail': e.detail}
+            return self.respond(detail, status=e.status_code)
+
+        if result is None:
+            return self.respond({'detail': 'Authentication credentials were not provided.'}, status=401)
+
+        request.user, request.auth = result
+        return await super().dispatch(request, *args, **kwargs)
+
+    def respond(self, data, status=200):
+        return JsonResponse(data, status=status, encoder=JSONEncoder, safe=False)
+
+    def error(self, message, status=400):
+        return self.respond({'error': message}, status=status)
\ No newline at end of file
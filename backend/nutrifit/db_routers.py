@@ -0,0 +1,44 @@
+from contextlib import contextmanager
+from asgiref.local import Local
+from django.db import connections
+
+REPLICA = 'replica'
+
+# Reference data that is only written by admins and seed scripts
+CATALOG_MODELS = {'nutrition.Food', 'medical.Disease'}
+
+_state = Local()
+
+@contextmanager
+def read_from_replica():
+    """Route every read inside the block to the replica, if one is configured"""
+    previous = getattr(_state, 'replica', False)
+    _state.replica = True
+    try:
+        yield
+    finally:
+        _state.replica = previous
+
+class ReplicaRouter:
+    """
+    Sends catalog reads, and reads inside read_from_replica(), to the
+    'replica' database when it is configured. Writes and everything else
+    use 'default', and so do all reads when there is no replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        if REPLICA not in connections.databases:
+            return None
+        if model._meta.label in CATALOG_MODELS or getattr(_state, 'replica', False):
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA
\ No newline at end of file
@@ -0,0 +1,86 @@
+import json
+import zlib
+from django.conf import settings
+from django.db import models
+
+try:
+    import zstandard
+except ImportError:  # optional, zlib is always available
+    zstandard = None
+
+# Compressed values start with this marker followed by a one-byte codec id.
+# Anything without it is a legacy plain UTF-8 value and is read as-is.
+MAGIC = b'\x00cf'
+CODEC_ZLIB = b'z'
+CODEC_ZSTD = b's'
+
+def compress(text):
+    """Encode text for a compressed column; short values are stored plain"""
+    data = text.encode('utf-8')
+    if len(data) < settings.COMPRESSED_FIELD_MIN_BYTES:
+        return data
+
+    if settings.COMPRESSED_FIELD_CODEC == 'zstd' and zstandard is not None:
+        return MAGIC + CODEC_ZSTD + zstandard.ZstdCompressor(level=settings.COMPRESSED_FIELD_LEVEL).compress(data)
+    return MAGIC + CODEC_ZLIB + zlib.compress(data, settings.COMPRESSED_FIELD_LEVEL)
+
+def decompress(value):
+    """Decode a value read from a compressed column"""
+    if isinstance(value, str):
+        return value
+    data = bytes(value)
+    if not data.startswith(MAGIC):
+        return data.decode('utf-8')
+
+    codec, payload = data[len(MAGIC):len(MAGIC) + 1], data[len(MAGIC) + 1:]
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError('zstandard is required to read this value')
+        return zstandard.ZstdDecompressor().decompress(payload).decode('utf-8')
+    return zlib.decompress(payload).decode('utf-8')
+
+class CompressedTextField(models.TextField):
+    """
+    TextField stored compressed in a binary column.
+    Behaves like a TextField in Python, forms and serializers; the column
+    can not be filtered on, so only use it for large write-once text.
+    """
+
+    def get_internal_type(self):
+        return 'BinaryField'
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return decompress(value)
+
+    def to_python(self, value):
+        if isinstance(value, (bytes, memoryview)):
+            return decompress(value)
+        return super().to_python(value)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is None:
+            return value
+        return connection.Database.Binary(compress(value))
+
+class CompressedJSONField(models.JSONField):
+    """JSONField stored as compressed JSON text in a binary column"""
+
+    def get_internal_type(self):
+        return 'BinaryField'
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return json.loads(decompress(value), cls=self.decoder)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        # bulk_update() passes Case() expressions; they prepare their own values
+        if value is None or hasattr(value, 'as_sql'):
+            return value
+        return connection.Database.Binary(compress(json.dumps(value, cls=self.encoder)))
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Production gunicorn settings. From the backend directory:
+
+    gunicorn -c python:nutrifit.gunicorn_conf nutrifit.wsgi:application
+
+The application is loaded once in the master process, which also builds the
+read-only state every worker needs (URLconf and view modules, the food
+catalog snapshot, compiled scanner patterns, NumPy and Pillow, and the
+memory-mapped models in the registry). Forked
+workers share those pages copy-on-write instead of each building its own.
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))  # report analysis can take a while
+
+# Import nutrifit.wsgi (and so django.setup()) in the master before forking
+preload_app = True
+
+def when_ready(server):
+    """Build shared read-only state in the master, after the app is loaded and before workers fork"""
+    from django.conf import settings
+    from django.db import connections
+    from django.urls import get_resolver
+    from medical import scanner
+    from nutrifit.lazy import preload
+    from nutrifit.model_registry import registry
+    from nutrition import portions
+    from nutrition.catalog import load_catalog_snapshot
+
+    # Resolving the URLconf imports every view, serializer and model module
+    get_resolver().url_patterns
+
+    try:
+        snapshot = load_catalog_snapshot()
+        server.log.info('Preloaded food catalog snapshot with %d foods', len(snapshot.foods))
+    except Exception as e:
+        # Workers load the snapshot themselves on first use
+        server.log.warning('Food catalog snapshot not preloaded: %s', e)
+
+    preload(portions.np, scanner.Image)
+    # Models register when their modules are imported by the URLconf above;
+    # workers then share the mapped pages and only remap on a new version
+    registry.preload()
+    for loaded in registry.loaded():
+        server.log.info(
+            'Preloaded model %s version %s in %.1fms (%.1f MiB mapped)',
+            loaded.name, loaded.version, loaded.load_seconds * 1000, loaded.mapped_bytes / 2 ** 20
+        )
+    if settings.OCR_POOL_SIZE <= 0:
+        # Reports are scanned inside web workers, so share OpenCV as well
+        scanner.preload_ocr_modules()
+
+    # Database connections must never be shared across forks
+    connections.close_all()
+
+    # Keep the collector from writing to (and so copying) the shared objects
+    gc.collect()
+    gc.freeze()
\ No newline at end of file
@@ -0,0 +1,28 @@
+import importlib
+
+class LazyModule:
+    """
+    Stand-in for a heavy module that is imported on first attribute access,
+    so processes that never use it (most web workers, manage.py commands)
+    skip its import time and memory.
+    """
+
+    def __init__(self, name):
+        self._lazy_name = name
+
+    def __getattr__(self, attr):
+        # importlib caches in sys.modules and holds the import lock
+        return getattr(importlib.import_module(self._lazy_name), attr)
+
+    def __repr__(self):
+        return f'<lazy module {self._lazy_name!r}>'
+
+def lazy_import(name):
+    """Module proxy for `name`, e.g. `cv2 = lazy_import('cv2')`"""
+    return LazyModule(name)
+
+def preload(*modules):
+    """Import lazy modules now, e.g. in a process that is about to use them"""
+    for module in modules:
+        if isinstance(module, LazyModule):
+            importlib.import_module(module._lazy_name)
\ No newline at end of file
@@ -0,0 +1,206 @@
+import json
+import logging
+import os
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+from django.conf import settings
+from nutrifit.lazy import lazy_import
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+class LoadedModel:
+    """One version of a model as loaded in this process"""
+
+    def __init__(self, name, version, path, meta, arrays):
+        self.name = name
+        self.version = version
+        self.path = path
+        self.meta = meta
+        # Read-only numpy memmaps: pages come from the OS page cache and are
+        # shared by every process mapping the same file
+        self.arrays = arrays
+        self.model = None
+        self.load_seconds = 0.0
+        self.checked_at = 0.0
+
+    @property
+    def mapped_bytes(self):
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def resident_bytes(self):
+        """Bytes of the mapped files resident in this process (Linux), or None"""
+        try:
+            with open('/proc/self/smaps') as f:
+                lines = f.readlines()
+        except OSError:
+            return None
+
+        total = 0
+        counting = False
+        for line in lines:
+            fields = line.split()
+            if '-' in fields[0] and len(fields) >= 5:
+                # Mapping header: address range, perms, offset, device, inode[, path]
+                counting = len(fields) >= 6 and fields[5].startswith(self.path + os.sep)
+            elif counting and fields[0] == 'Rss:':
+                total += int(fields[1]) * 1024
+        return total
+
+class ModelRegistry:
+    """
+    Versioned model artifacts under `root`, one directory per model:
+
+        <root>/<name>/versions/<version>/meta.json and <array>.npy files
+        <root>/<name>/CURRENT    name of the active version
+
+    publish() writes a new version to a hidden directory, renames it into
+    place and then atomically replaces CURRENT, so readers only ever see
+    complete versions. Each process loads a model once, memory-mapping its
+    arrays, and get() checks CURRENT at most every `check_interval`
+    seconds to hot-swap to a newly published version. A version in use is
+    never modified, so requests already holding it finish on it.
+
+    A factory registered for a model turns a LoadedModel into the object
+    get() returns (built once per version).
+    """
+
+    def __init__(self, root, check_interval=30, keep=3):
+        self.root = root
+        self.check_interval = check_interval
+        self.keep = keep
+        self._factories = {}
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, factory=None):
+        self._factories[name] = factory
+
+    def model_path(self, name):
+        return os.path.join(self.root, name)
+
+    def version_path(self, name, version):
+        return os.path.join(self.root, name, 'versions', version)
+
+    def models(self):
+        """Names of the models with published versions"""
+        try:
+            entries = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(entry for entry in entries if os.path.isdir(os.path.join(self.root, entry, 'versions')))
+
+    def versions(self, name):
+        """Published versions of a model, oldest first"""
+        try:
+            entries = os.listdir(os.path.join(self.model_path(name), 'versions'))
+        except FileNotFoundError:
+            return []
+        return sorted(entry for entry in entries if not entry.startswith('.'))
+
+    def current_version(self, name):
+        try:
+            with open(os.path.join(self.model_path(name), 'CURRENT')) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def publish(self, name, arrays, meta=None):
+        """Write `arrays` ({name: ndarray}) and `meta` as a new version and activate it"""
+        version = time.strftime('%Y%m%dT%H%M%S') + '-' + secrets.token_hex(3)
+        versions_dir = os.path.join(self.model_path(name), 'versions')
+        os.makedirs(versions_dir, exist_ok=True)
+
+        staging = tempfile.mkdtemp(prefix=f'.{version}-', dir=versions_dir)
+        for key, array in arrays.items():
+            np.save(os.path.join(staging, f'{key}.npy'), np.ascontiguousarray(array))
+        with open(os.path.join(staging, 'meta.json'), 'w') as f:
+            json.dump({**(meta or {}), 'arrays': list(arrays), 'published_at': time.time()}, f)
+        os.chmod(staging, 0o755)
+        os.rename(staging, self.version_path(name, version))
+
+        self.activate(name, version)
+        self.prune(name)
+        return version
+
+    def activate(self, name, version):
+        """Point CURRENT at a published version (also used to roll back)"""
+        if not os.path.isdir(self.version_path(name, version)):
+            raise ValueError(f'{name} has no version {version!r}')
+        current = os.path.join(self.model_path(name), 'CURRENT')
+        temp_path = f'{current}.{secrets.token_hex(3)}.tmp'
+        with open(temp_path, 'w') as f:
+            f.write(version)
+        os.replace(temp_path, current)
+
+    def prune(self, name):
+        """Delete all but the newest `keep` versions, never the active one"""
+        current = self.current_version(name)
+        for version in self.versions(name)[:-self.keep]:
+            if version != current:
+                shutil.rmtree(self.version_path(name, version), ignore_errors=True)
+
+    def load(self, name, version):
+        start = time.perf_counter()
+        path = self.version_path(name, version)
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        arrays = {
+            key: np.load(os.path.join(path, f'{key}.npy'), mmap_mode='r')
+            for key in meta['arrays']
+        }
+
+        loaded = LoadedModel(name, version, path, meta, arrays)
+        factory = self._factories.get(name)
+        loaded.model = factory(loaded) if factory else loaded
+        loaded.load_seconds = time.perf_counter() - start
+        logger.info(
+            'Loaded model %s version %s in %.1fms (%.1f MiB mapped)',
+            name, version, loaded.load_seconds * 1000, loaded.mapped_bytes / 2 ** 20
+        )
+        return loaded
+
+    def get(self, name):
+        """The active version of a model in this process, or None if none is published"""
+        loaded = self._loaded.get(name)
+        if loaded is not None and time.monotonic() - loaded.checked_at < self.check_interval:
+            return loaded.model
+
+        with self._lock:
+            loaded = self._loaded.get(name)
+            if loaded is None or time.monotonic() - loaded.checked_at >= self.check_interval:
+                loaded = self._refresh(name, loaded)
+        return loaded.model if loaded is not None else None
+
+    def _refresh(self, name, loaded):
+        version = self.current_version(name)
+        if version is not None and (loaded is None or loaded.version != version):
+            try:
+                loaded = self.load(name, version)
+            except (OSError, ValueError, KeyError) as e:
+                # Keep serving the previous version
+                logger.warning('Could not load model %s version %s: %s', name, version, e)
+            else:
+                self._loaded[name] = loaded
+        if loaded is not None:
+            loaded.checked_at = time.monotonic()
+        return loaded
+
+    def preload(self):
+        """Load every registered model now, e.g. in the gunicorn master before forking"""
+        return [name for name in self._factories if self.get(name) is not None]
+
+    def loaded(self):
+        """Models loaded in this process"""
+        return list(self._loaded.values())
+
+# Process-wide registry over settings.ML_MODEL_PATH
+registry = ModelRegistry(
+    settings.ML_MODEL_PATH,
+    check_interval=settings.MODEL_REGISTRY_CHECK_INTERVAL,
+    keep=settings.MODEL_REGISTRY_KEEP_VERSIONS,
+)
\ No newline at end of file
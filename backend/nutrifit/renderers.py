@@ -0,0 +1,49 @@
+import re
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # fall back to DRF's json-based rendering
+    orjson = None
+
+# orjson writes some floats differently from json: exponents ('1e-5', '1e20'
+# vs '1e-05', '1e+20') and fixed notation below 1e-4 ('0.00001' vs '1e-05').
+# Output that may hold one (a string like "e-mail" also matches) is rendered
+# by JSONRenderer instead, which is faster than rewriting the floats.
+_EXPONENT = re.compile(rb'e[-\d]')
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson, rendering the same bytes as JSONRenderer.
+    Dates, times and other types orjson does not format like DRF are handed
+    to DRF's JSONEncoder and U+2028/U+2029 are escaped. Indented, ASCII-only
+    or non-compact output, and output with floats orjson formats differently,
+    is left to JSONRenderer. NaN and infinity, which JSONRenderer refuses,
+    render as null.
+    """
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type or '', renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder.default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if b'0.0000' in ret or _EXPONENT.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
\ No newline at end of file
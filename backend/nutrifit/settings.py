@@ -27,6 +27,7 @@ INSTALLED_APPS = [
     'nutrition',
     'medical',
     'marketplace',
+    'events',
 ]
 
 MIDDLEWARE = [
@@ -61,21 +62,46 @@ TEMPLATES = [
 WSGI_APPLICATION = 'nutrifit.wsgi.application'
 
 # Database
-DATABASES = {
-    'default': {
+# Persistent connections: each worker thread keeps its connection for
+# DB_CONN_MAX_AGE seconds (0 closes it after every request, None never does)
+# and pings it before reuse, so a connection dropped by the server is
+# replaced instead of failing the request. The ASGI entry point defaults it
+# to 0, since there each request's sync code runs on a new thread
+DB_CONN_MAX_AGE = os.getenv('DB_CONN_MAX_AGE', '60')
+
+def mysql_database(prefix):
+    """MySQL settings read from <prefix>_NAME, <prefix>_HOST, ..., defaulting to the DB_* values"""
+    def env(name, default):
+        return os.getenv(f'{prefix}_{name}', os.getenv(f'DB_{name}', default))
+    
+    return {
         'ENGINE': 'django.db.backends.mysql',
-        'NAME': os.getenv('DB_NAME', 'nutrifit_db'),
-        'USER': os.getenv('DB_USER', 'root'),
-        'PASSWORD': os.getenv('DB_PASSWORD', ''),
-        'HOST': os.getenv('DB_HOST', 'localhost'),
-        'PORT': os.getenv('DB_PORT', '3306'),
+        'NAME': env('NAME', 'nutrifit_db'),
+        'USER': env('USER', 'root'),
+        'PASSWORD': env('PASSWORD', ''),
+        'HOST': env('HOST', 'localhost'),
+        'PORT': env('PORT', '3306'),
+        'CONN_MAX_AGE': None if DB_CONN_MAX_AGE == 'None' else int(DB_CONN_MAX_AGE),
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
             'charset': 'utf8mb4',
         },
     }
+
+DATABASES = {
+    'default': mysql_database('DB'),
 }
 
+# Optional read replica (set DB_REPLICA_HOST, and DB_REPLICA_NAME/USER/... where
+# they differ from the primary). The food and disease catalog is read from it.
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = mysql_database('DB_REPLICA')
+    # Tests run against the primary only
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['nutrifit.db_routers.ReplicaRouter']
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -89,8 +115,12 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': [
+        'nutrifit.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
@@ -109,6 +139,15 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Authenticated users (with their profile) are cached per process for this
+# many seconds; saves invalidate the local entry, other processes expire it
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', 30))
+AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', 1024))
+
+# Seconds a user's dashboard response is cached; changes to the data it
+# shows invalidate it earlier
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', 30))
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = os.getenv(
     'CORS_ORIGIN_WHITELIST',
@@ -131,10 +170,72 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = 'media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Large text/JSON columns (OCR text, analysis results, order items) are stored
+# compressed; 'zstd' needs the optional zstandard package, otherwise zlib is used
+COMPRESSED_FIELD_CODEC = os.getenv('COMPRESSED_FIELD_CODEC', 'zlib')
+COMPRESSED_FIELD_LEVEL = int(os.getenv('COMPRESSED_FIELD_LEVEL', 6))
+COMPRESSED_FIELD_MIN_BYTES = int(os.getenv('COMPRESSED_FIELD_MIN_BYTES', 256))
+
+# Warm OCR worker processes per web process (0 runs OCR in the request thread).
+# Install tesserocr to keep Tesseract's language data loaded between reports.
+OCR_POOL_SIZE = int(os.getenv('OCR_POOL_SIZE', 2))
+OCR_POOL_MAX_TASKS = int(os.getenv('OCR_POOL_MAX_TASKS', 200))  # reports before a worker is recycled
+OCR_POOL_TIMEOUT = int(os.getenv('OCR_POOL_TIMEOUT', 120))  # seconds per report
+OCR_POOL_HEALTH_INTERVAL = int(os.getenv('OCR_POOL_HEALTH_INTERVAL', 30))  # ping workers idle this long
+OCR_LANG = os.getenv('OCR_LANG', 'eng')
+
+# Largest medical report accepted, in bytes (checked while streaming)
+MEDICAL_UPLOAD_MAX_BYTES = int(os.getenv('MEDICAL_UPLOAD_MAX_BYTES', 20 * 1024 * 1024))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # ML Model Settings
 ML_MODEL_PATH = os.path.join(BASE_DIR, 'ml_models')
 
+# Model registry (nutrifit/model_registry.py): seconds between checks for a
+# newly published version of a loaded model, and versions kept for rollback
+MODEL_REGISTRY_CHECK_INTERVAL = float(os.getenv('MODEL_REGISTRY_CHECK_INTERVAL', 30))
+MODEL_REGISTRY_KEEP_VERSIONS = int(os.getenv('MODEL_REGISTRY_KEEP_VERSIONS', 3))
+
+# Collaborative-filtering embeddings (python manage.py train_recommender):
+# latent factors per user and food, and how strongly learned affinity
+# outweighs the random shuffle when picking meal foods (0 disables it)
+COLLAB_FACTORS = int(os.getenv('COLLAB_FACTORS', 32))
+COLLAB_WEIGHT = float(os.getenv('COLLAB_WEIGHT', 1.0))
+
+# Seconds a generated meal recommendation stays in the result cache
+RECOMMENDATION_CACHE_TIMEOUT = int(os.getenv('RECOMMENDATION_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# Outbox event delivery (python manage.py dispatch_events)
+OUTBOX_SUBSCRIBERS = [
+    'events.subscribers.StreamSubscriber',
+    'events.subscribers.WebhookSubscriber',
+]
+# Comma-separated endpoints receiving event batches; signed when a secret is set
+OUTBOX_WEBHOOK_URLS = [url for url in os.getenv('OUTBOX_WEBHOOK_URLS', '').split(',') if url]
+OUTBOX_WEBHOOK_SECRET = os.getenv('OUTBOX_WEBHOOK_SECRET', '')
+OUTBOX_WEBHOOK_TIMEOUT = int(os.getenv('OUTBOX_WEBHOOK_TIMEOUT', 5))
+OUTBOX_RETRY_MAX_DELAY = int(os.getenv('OUTBOX_RETRY_MAX_DELAY', 300))  # seconds between retries, at most
+
+# Event streams check for new events every OUTBOX_STREAM_INTERVAL seconds
+# (a cache read), re-read the table every OUTBOX_STREAM_RESYNC seconds and
+# close after OUTBOX_STREAM_MAX_AGE seconds for the client to resume (report
+# progress streams use the same resync and maximum age)
+OUTBOX_STREAM_INTERVAL = float(os.getenv('OUTBOX_STREAM_INTERVAL', 1))
+OUTBOX_STREAM_RESYNC = int(os.getenv('OUTBOX_STREAM_RESYNC', 15))
+OUTBOX_STREAM_MAX_AGE = int(os.getenv('OUTBOX_STREAM_MAX_AGE', 300))
+
+# Report progress streams read the report's progress key every
+# REPORT_PROGRESS_INTERVAL seconds; the key expires after REPORT_PROGRESS_TIMEOUT
+REPORT_PROGRESS_INTERVAL = float(os.getenv('REPORT_PROGRESS_INTERVAL', 0.5))
+REPORT_PROGRESS_TIMEOUT = int(os.getenv('REPORT_PROGRESS_TIMEOUT', 600))
+
+# Seconds a stream token (POST /api/users/stream-token/) can be used to open
+# an event stream with ?token=; EventSource cannot send the JWT header
+STREAM_TOKEN_MAX_AGE = int(os.getenv('STREAM_TOKEN_MAX_AGE', 60))
+
+# Threads available to async views for CPU-bound and sync-only work
+ASYNC_EXECUTOR_WORKERS = int(os.getenv('ASYNC_EXECUTOR_WORKERS', 8))
+
 # Gemini API
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
\ No newline at end of file
@@ -9,6 +9,7 @@ urlpatterns = [
     path('api/nutrition/', include('nutrition.urls')),
     path('api/medical/', include('medical.urls')),
     path('api/marketplace/', include('marketplace.urls')),
+    path('api/events/', include('events.urls')),
 ]
 
 if settings.DEBUG:
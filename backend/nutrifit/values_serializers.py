@@ -0,0 +1,105 @@
+from rest_framework import serializers
+from rest_framework.response import Response
+
+COLUMN, COMPUTED, NESTED = range(3)
+
+class ValuesSerializer:
+    """
+    Read-only fast path for a ModelSerializer's output.
+    Rows are read with queryset.values() instead of model instances, and
+    each column goes through the mirrored DRF field's to_representation,
+    so the result (keys, order and values) matches `serializer_class`.
+
+    Fields that are not plain columns are declared by subclasses:
+    `computed_fields` maps a name to (columns needed, function(row)), and
+    nested serializers are filled by get_nested().
+    """
+    serializer_class = None
+    computed_fields = {}
+
+    @classmethod
+    def get_plan(cls):
+        """(kind, name, column, converter or many) per output field, built once per class"""
+        if '_plan' not in cls.__dict__:
+            plan = []
+            for name, field in cls.serializer_class().fields.items():
+                if field.write_only:
+                    continue
+                if name in cls.computed_fields:
+                    plan.append((COMPUTED, name, None, cls.computed_fields[name][1]))
+                elif isinstance(field, serializers.BaseSerializer):
+                    plan.append((NESTED, name, None, getattr(field, 'many', False)))
+                else:
+                    column = field.source.replace('.', '__')
+                    # values() already returns the primary key a related field renders
+                    convert = None if isinstance(field, serializers.RelatedField) else field.to_representation
+                    plan.append((COLUMN, name, column, convert))
+            cls._plan = plan
+        return cls._plan
+
+    def get_columns(self):
+        columns = ['pk']
+        for kind, name, column, _ in self.get_plan():
+            if kind == COLUMN:
+                columns.append(column)
+            elif kind == COMPUTED:
+                columns.extend(self.computed_fields[name][0])
+        columns.extend(self.get_nested_columns())
+        return list(dict.fromkeys(columns))
+
+    def get_nested_columns(self):
+        """Extra columns get_nested() needs from each row"""
+        return []
+
+    def get_nested(self, name, rows):
+        """{row pk: representation} for nested field `name`"""
+        raise NotImplementedError(f'{type(self).__name__} must provide nested field {name!r}')
+
+    def values(self, queryset):
+        return queryset.values(*self.get_columns())
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        plan = self.get_plan()
+        nested = {
+            name: self.get_nested(name, rows)
+            for kind, name, _, _ in plan if kind == NESTED
+        }
+
+        data = []
+        for row in rows:
+            item = {}
+            for kind, name, column, convert in plan:
+                if kind == COLUMN:
+                    value = row[column]
+                    item[name] = value if value is None or convert is None else convert(value)
+                elif kind == COMPUTED:
+                    item[name] = convert(row)
+                else:
+                    item[name] = nested[name].get(row['pk'], [] if convert else None)
+            data.append(item)
+        return data
+
+    def serialize(self, queryset):
+        return self.to_representation(self.values(queryset))
+
+def group_by(serializer, rows, key):
+    """Serialize rows and group the results by row[key], keeping their order"""
+    rows = list(rows)
+    groups = {}
+    for row, item in zip(rows, serializer.to_representation(rows)):
+        groups.setdefault(row[key], []).append(item)
+    return groups
+
+class ValuesListMixin:
+    """ListAPIView.list() using `values_serializer_class`; same response, no model instances"""
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        fast = self.values_serializer_class()
+        queryset = fast.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.to_representation(page))
+        return Response(fast.to_representation(queryset))
\ No newline at end of file
@@ -1,14 +1,19 @@
 from django.contrib import admin
-from .models import Food, MealRecommendation, NutritionPlan
+from .models import Food, MealFood, MealRecommendation, NutritionPlan
 
 @admin.register(Food)
 class FoodAdmin(admin.ModelAdmin):
-    list_display = ('name', 'category', 'season', 'calories', 'is_available')
+    list_display = ('name', 'category', 'season', 'calories', 'dietary_flags', 'is_available')
     list_filter = ('category', 'season', 'is_available')
     search_fields = ('name', 'description')
 
+class MealFoodInline(admin.TabularInline):
+    model = MealFood
+    extra = 0
+
 @admin.register(MealRecommendation)
 class MealRecommendationAdmin(admin.ModelAdmin):
+    inlines = (MealFoodInline,)
     list_display = ('user', 'meal_type', 'date', 'created_at')
     list_filter = ('meal_type', 'date')
     search_fields = ('user__email',)
@@ -1,7 +1,34 @@
+import hashlib
 import random
 from datetime import datetime, timedelta
-from django.db.models import Q
-from .models import Food, MealRecommendation, NutritionPlan
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from users.dashboard import invalidate_dashboard
+from .catalog import fetch_catalog_version, get_catalog_snapshot
+from .collaborative import get_collaborative_model
+from .dietary import filter_flagged, get_excluded_flags
+from .models import MealFood, MealRecommendation, NutritionPlan
+from .portions import DEFAULT_PORTION_GRAMS, SOLVER_NUTRIENTS, PortionSolver
+
+# Nutrient lookup tables: summary key -> Food column
+MACRO_FIELDS = {
+    'calories': 'calories',
+    'protein': 'protein',
+    'carbs': 'carbohydrates',
+    'fat': 'fat',
+}
+
+MICRO_FIELDS = {
+    'fiber': 'fiber',
+    'vitamin_a': 'vitamin_a',
+    'vitamin_c': 'vitamin_c',
+    'calcium': 'calcium',
+    'iron': 'iron',
+}
 
 class NutritionAI:
     """
@@ -32,6 +59,16 @@ class NutritionAI:
                 'keywords': ['low calorie', 'high fiber', 'protein']
             },
         }
+        
+        self.meal_calorie_distribution = {
+            'breakfast': 0.25,
+            'lunch': 0.35,
+            'dinner': 0.30,
+            'snack': 0.10,
+        }
+        
+        self.portion_solver = PortionSolver()
+        self._catalog_version = None
     
     def get_current_nepali_season(self):
         """Determine current Nepali season based on month"""
@@ -57,7 +94,8 @@ class NutritionAI:
             'fat': 0,
             'focus_areas': [],
             'avoid_categories': [],
-            'preferred_categories': []
+            'preferred_categories': [],
+            'excluded_flags': get_excluded_flags(profile)
         }
         
         # Calculate macronutrient targets
@@ -88,29 +126,39 @@ class NutritionAI:
         
         return requirements
     
-    def select_foods_for_meal(self, meal_type, user, target_calories):
+    def get_catalog_version(self):
+        """Fingerprint of the food catalog; changes whenever a food is added or edited"""
+        if self._catalog_version is None:
+            self._catalog_version = fetch_catalog_version()
+        return self._catalog_version
+    
+    def get_recommendation_key(self, user, meal_type, date):
+        """Stable key for a (user, date, meal type) slot"""
+        # Allergy and diet changes keep the key: the slot's meal is fixed in
+        # place (see refresh_meals) rather than replaced by a second one
+        raw = f"{user.pk}:{date}:{meal_type}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    def select_foods_for_meal(self, meal_type, user, target_calories, rng=None):
         """Select appropriate foods for a meal based on user profile"""
         profile = user.profile
         requirements = self.analyze_user_health(user)
         current_season = self.get_current_nepali_season()
         
-        # Build query for suitable foods
-        query = Q(is_available=True) & (Q(season=current_season) | Q(season='all'))
-        
-        # Filter by preferred categories if any
-        if requirements['preferred_categories']:
-            query &= Q(category__in=requirements['preferred_categories'])
-        
-        # Exclude avoided categories
-        if requirements['avoid_categories']:
-            query &= ~Q(category__in=requirements['avoid_categories'])
-        
-        # Get suitable foods
-        suitable_foods = list(Food.objects.filter(query))
+        # Suitable foods come from the in-memory catalog snapshot; allergy and
+        # diet exclusions are hard filters
+        catalog = get_catalog_snapshot(self.get_catalog_version())
+        excluded_flags = requirements['excluded_flags']
+        suitable_foods = catalog.select(
+            seasons=(current_season, 'all'),
+            categories=requirements['preferred_categories'],
+            avoid_categories=requirements['avoid_categories'],
+            excluded_flags=excluded_flags
+        )
         
         if not suitable_foods:
-            # Fallback to all available foods
-            suitable_foods = list(Food.objects.filter(is_available=True))
+            # Fallback to all available foods the user can safely eat
+            suitable_foods = catalog.select(excluded_flags=excluded_flags)
         
         # Select foods to meet calorie target
         selected_foods = []
@@ -118,7 +166,12 @@ class NutritionAI:
         
         # Ensure variety
         categories_used = set()
-        random.shuffle(suitable_foods)
+        (rng or random).shuffle(suitable_foods)
+        
+        # Foods the user and similar users picked before come first
+        model = get_collaborative_model()
+        if model is not None and settings.COLLAB_WEIGHT > 0 and suitable_foods:
+            suitable_foods = model.rank(user.pk, suitable_foods, rng or random, settings.COLLAB_WEIGHT)
         
         for food in suitable_foods:
             if len(selected_foods) >= 5:  # Max 5 ingredients per meal
@@ -126,7 +179,7 @@ class NutritionAI:
             
             if food.category not in categories_used or len(selected_foods) < 3:
                 selected_foods.append(food)
-                total_calories += food.calories * 0.5  # Assume 50g portion
+                total_calories += food.calories * DEFAULT_PORTION_GRAMS / 100
                 categories_used.add(food.category)
                 
                 if total_calories >= target_calories * 0.9:
@@ -134,29 +187,145 @@ class NutritionAI:
         
         return selected_foods
     
-    def generate_meal_recommendation(self, user, meal_type, date):
+    def solve_meal_portions(self, meals):
+        """
+        Find gram amounts for a batch of meals in one solver call.
+        `meals` is a list of (selected_foods, targets) pairs; returns a list
+        of gram lists aligned with each meal's foods.
+        """
+        columns = [MACRO_FIELDS[key] for key in SOLVER_NUTRIENTS]
+        return self.portion_solver.solve([
+            (
+                [[getattr(food, column) for column in columns] for food in foods],
+                [targets[key] for key in SOLVER_NUTRIENTS]
+            )
+            for foods, targets in meals
+        ])
+    
+    def generate_meal_recommendation(self, user, meal_type, date, seed_key=None):
         """Generate AI-powered meal recommendation"""
+        seed_key = seed_key or self.get_recommendation_key(user, meal_type, date)
+        return self.generate_meal_recommendations(user, [(meal_type, date, seed_key)])[0]
+    
+    def generate_meal_recommendations(self, user, slots):
+        """
+        Generate meals for a list of (meal_type, date, seed_key) slots.
+        Portions for all slots are solved in a single batch and the meals and
+        their food rows are written with one insert each.
+        """
         requirements = self.analyze_user_health(user)
         
-        # Determine calorie target for meal type
-        daily_calories = requirements['calories']
-        meal_calorie_distribution = {
-            'breakfast': 0.25,
-            'lunch': 0.35,
-            'dinner': 0.30,
-            'snack': 0.10,
-        }
+        selections = []
+        for meal_type, date, seed_key in slots:
+            targets = self.get_meal_targets(requirements, meal_type)
+            
+            # Select foods, seeded so identical inputs give identical meals
+            selected_foods = self.select_foods_for_meal(
+                meal_type, user, targets['calories'], rng=random.Random(seed_key)
+            )
+            selections.append((selected_foods, targets))
+        
+        portions = self.solve_meal_portions(selections)
+        
+        meals = []
+        meal_foods = []
+        for (meal_type, date, seed_key), (selected_foods, _), grams in zip(slots, selections, portions):
+            meal = MealRecommendation(
+                user=user,
+                meal_type=meal_type,
+                date=date,
+                seed_key=seed_key,
+                **self.build_meal_fields(user, meal_type, requirements, selected_foods, grams)
+            )
+            meals.append(meal)
+            meal_foods.extend(
+                MealFood(meal=meal, food=food, quantity=quantity)
+                for food, quantity in zip(selected_foods, grams)
+            )
+        
+        with transaction.atomic():
+            MealRecommendation.objects.bulk_create(meals)
+            MealFood.objects.bulk_create(meal_foods)
+            # Bulk writes send no signals, so refresh today's meals on the dashboard here
+            if meals:
+                transaction.on_commit(lambda: invalidate_dashboard(user.pk))
+        
+        return meals
+    
+    def missing_slots(self, user, slots):
+        """The (meal_type, date, seed_key) slots that have no meal yet"""
+        existing = set(MealRecommendation.objects.filter(
+            user=user,
+            seed_key__in=[seed_key for _, _, seed_key in slots]
+        ).values_list('seed_key', flat=True))
+        return [slot for slot in slots if slot[2] not in existing]
+    
+    def generate_missing_meals(self, user, slots):
+        """
+        Generate meals for the slots that have none yet and return them. A
+        slot filled by a concurrent request in the meantime is left as is.
+        """
+        try:
+            return self.generate_meal_recommendations(user, self.missing_slots(user, slots))
+        except IntegrityError:
+            # Another request inserted one of the slots first; retry without it
+            return self.generate_meal_recommendations(user, self.missing_slots(user, slots))
+    
+    def get_or_generate_meal_recommendation(self, user, meal_type, date):
+        """
+        Return the meal for a (user, date, meal type) slot, generating it only
+        if the slot has no meal yet.
+        Returns a (meal, created) tuple.
+        """
+        if isinstance(date, str):
+            date = parse_date(date)
+            if date is None:
+                raise ValueError('Invalid date, expected YYYY-MM-DD')
         
-        target_calories = daily_calories * meal_calorie_distribution.get(meal_type, 0.30)
+        seed_key = self.get_recommendation_key(user, meal_type, date)
+        cache_key = f"meal_recommendation:{seed_key}"
         
-        # Select foods
-        selected_foods = self.select_foods_for_meal(meal_type, user, target_calories)
+        meal = None
+        meal_id = cache.get(cache_key)
+        if meal_id:
+            meal = MealRecommendation.objects.filter(id=meal_id, user=user).first()
         
-        # Calculate nutritional totals
-        total_calories = sum(f.calories * 0.5 for f in selected_foods)
-        total_protein = sum(f.protein * 0.5 for f in selected_foods)
-        total_carbs = sum(f.carbohydrates * 0.5 for f in selected_foods)
-        total_fat = sum(f.fat * 0.5 for f in selected_foods)
+        created = False
+        if meal is None:
+            generated = self.generate_missing_meals(user, [(meal_type, date, seed_key)])
+            if generated:
+                meal, created = generated[0], True
+            else:
+                meal = MealRecommendation.objects.get(user=user, seed_key=seed_key)
+        
+        if not created:
+            # A meal generated before an allergy or diet change may hold foods now excluded
+            excluded_flags = get_excluded_flags(user.profile)
+            if filter_flagged(meal.meal_foods.all(), excluded_flags, field='food__dietary_flags').exists():
+                meal = MealRecommendation.objects.prefetch_related('meal_foods').get(id=meal.id)
+                self.refresh_meals(user, self.analyze_user_health(user), [meal])
+        
+        cache.set(cache_key, meal.id, settings.RECOMMENDATION_CACHE_TIMEOUT)
+        return meal, created
+    
+    def get_meal_targets(self, requirements, meal_type):
+        """Split daily requirements into calorie and macro targets for one meal"""
+        share = self.meal_calorie_distribution.get(meal_type, 0.30)
+        return {
+            'calories': requirements['calories'] * share,
+            'protein': requirements['protein'] * share,
+            'carbs': requirements['carbs'] * share,
+            'fat': requirements['fat'] * share,
+        }
+    
+    def build_meal_fields(self, user, meal_type, requirements, selected_foods, portions):
+        """Compute totals and descriptive text for selected foods and their gram portions"""
+        # Calculate nutritional totals in a single pass over the foods
+        totals = dict.fromkeys(MACRO_FIELDS, 0)
+        for food, grams in zip(selected_foods, portions):
+            for key, column in MACRO_FIELDS.items():
+                totals[key] += getattr(food, column) * grams / 100
+        total_calories = totals['calories']
         
         # Generate meal name and instructions
         food_names = [f.name for f in selected_foods]
@@ -173,24 +342,17 @@ class NutritionAI:
         if requirements['focus_areas']:
             ai_reasoning += f" and {', '.join(requirements['focus_areas'])} management"
         
-        # Create meal recommendation
-        meal = MealRecommendation.objects.create(
-            user=user,
-            meal_type=meal_type,
-            date=date,
-            meal_name=meal_name,
-            instructions=instructions,
-            portion_size="Standard serving",
-            total_calories=round(total_calories, 2),
-            total_protein=round(total_protein, 2),
-            total_carbs=round(total_carbs, 2),
-            total_fat=round(total_fat, 2),
-            ai_summary=ai_summary,
-            ai_reasoning=ai_reasoning
-        )
-        
-        meal.foods.set(selected_foods)
-        return meal
+        return {
+            'meal_name': meal_name,
+            'instructions': instructions,
+            'portion_size': f"{int(sum(portions))}g total",
+            'total_calories': round(totals['calories'], 2),
+            'total_protein': round(totals['protein'], 2),
+            'total_carbs': round(totals['carbs'], 2),
+            'total_fat': round(totals['fat'], 2),
+            'ai_summary': ai_summary,
+            'ai_reasoning': ai_reasoning,
+        }
     
     def create_nutrition_plan(self, user, duration_days=7):
         """Create a comprehensive nutrition plan"""
@@ -200,13 +362,8 @@ class NutritionAI:
         start_date = datetime.now().date()
         end_date = start_date + timedelta(days=duration_days)
         
-        plan_description = f"""Personalized {duration_days}-day nutrition plan designed for your {profile.goal} goal.
-        This plan provides approximately {int(requirements['calories'])} calories per day with balanced macronutrients.
-        """
-        
-        health_focus = "General wellness"
-        if requirements['focus_areas']:
-            health_focus = f"Managing {', '.join(requirements['focus_areas'])}"
+        plan_description = self.build_plan_description(profile, requirements, duration_days)
+        health_focus = self.build_health_focus(requirements)
         
         # Create plan
         plan = NutritionPlan.objects.create(
@@ -222,10 +379,288 @@ class NutritionAI:
             is_active=True
         )
         
-        # Generate meal recommendations for the plan
+        # Generate meal recommendations for the plan, reusing slots that
+        # already have a meal and solving the rest in one batch
+        slots = []
         for day in range(duration_days):
             meal_date = start_date + timedelta(days=day)
             for meal_type in ['breakfast', 'lunch', 'dinner']:
-                self.generate_meal_recommendation(user, meal_type, meal_date)
+                slots.append((meal_type, meal_date, self.get_recommendation_key(user, meal_type, meal_date)))
+        
+        for meal in self.generate_missing_meals(user, slots):
+            cache.set(f"meal_recommendation:{meal.seed_key}", meal.id, settings.RECOMMENDATION_CACHE_TIMEOUT)
+        
+        return plan
+    
+    def build_plan_description(self, profile, requirements, duration_days):
+        """Describe a plan for the given profile and requirements"""
+        return f"""Personalized {duration_days}-day nutrition plan designed for your {profile.goal} goal.
+        This plan provides approximately {int(requirements['calories'])} calories per day with balanced macronutrients.
+        """
+    
+    def build_health_focus(self, requirements):
+        """Summarise the health conditions a plan addresses"""
+        if requirements['focus_areas']:
+            return f"Managing {', '.join(requirements['focus_areas'])}"
+        return "General wellness"
+    
+    def relative_deviation(self, actual, target):
+        """Relative difference between an actual value and its target"""
+        if not target:
+            return 0 if not actual else 1
+        return abs(actual - target) / target
+    
+    def replan_nutrition_plan(self, user, plan, tolerance=0.10):
+        """
+        Bring an existing plan in line with the user's current profile.
+        Only meals whose calorie or macro totals deviate from the new targets
+        by more than `tolerance`, or that contain a food the user's allergies
+        or diet now exclude, are recomputed; untouched rows are not written
+        and food rows are only written where a food or its portion changes.
+        Returns the list of meals that were recomputed.
+        """
+        requirements = self.analyze_user_health(user)
+        plan_targets = {
+            'calories': plan.daily_calorie_target,
+            'protein': plan.daily_protein_target,
+            'carbs': plan.daily_carbs_target,
+            'fat': plan.daily_fat_target,
+        }
+        
+        plan_meals = MealRecommendation.objects.filter(
+            user=user,
+            date__gte=plan.start_date,
+            date__lt=plan.end_date
+        )
+        
+        unsafe_meal_ids = set()
+        if requirements['excluded_flags']:
+            unsafe_meal_ids = set(filter_flagged(
+                MealFood.objects.filter(meal__in=plan_meals),
+                requirements['excluded_flags'],
+                field='food__dietary_flags'
+            ).values_list('meal_id', flat=True).order_by())
+        
+        if not unsafe_meal_ids and all(
+            self.relative_deviation(requirements[key], target) <= tolerance
+            for key, target in plan_targets.items()
+        ):
+            return []
+        
+        duration_days = (plan.end_date - plan.start_date).days
+        
+        with transaction.atomic():
+            plan.daily_calorie_target = requirements['calories']
+            plan.daily_protein_target = requirements['protein']
+            plan.daily_carbs_target = requirements['carbs']
+            plan.daily_fat_target = requirements['fat']
+            plan.plan_description = self.build_plan_description(user.profile, requirements, duration_days)
+            plan.health_focus = self.build_health_focus(requirements)
+            plan.save(update_fields=[
+                'daily_calorie_target', 'daily_protein_target',
+                'daily_carbs_target', 'daily_fat_target',
+                'plan_description', 'health_focus', 'updated_at',
+            ])
+            
+            drifted = []
+            for meal in plan_meals.prefetch_related('meal_foods'):
+                targets = self.get_meal_targets(requirements, meal.meal_type)
+                actual = {
+                    'calories': meal.total_calories,
+                    'protein': meal.total_protein,
+                    'carbs': meal.total_carbs,
+                    'fat': meal.total_fat,
+                }
+                
+                if meal.id not in unsafe_meal_ids and all(
+                    self.relative_deviation(actual[key], target) <= tolerance
+                    for key, target in targets.items()
+                ):
+                    continue
+                drifted.append(meal)
+            
+            return self.refresh_meals(user, requirements, drifted)
+    
+    def refresh_meals(self, user, requirements, meals):
+        """
+        Reselect the foods and portions of existing meals (with their
+        meal_foods prefetched) in place, keeping each meal's id and seed.
+        Food rows are only written where a food or its portion changes.
+        """
+        meal_fields = [
+            'meal_name', 'instructions', 'portion_size',
+            'total_calories', 'total_protein', 'total_carbs', 'total_fat',
+            'ai_summary', 'ai_reasoning', 'updated_at',
+        ]
+        
+        selections = []
+        for meal in meals:
+            targets = self.get_meal_targets(requirements, meal.meal_type)
+            rng = random.Random(meal.seed_key or self.get_recommendation_key(user, meal.meal_type, meal.date))
+            selections.append((self.select_foods_for_meal(meal.meal_type, user, targets['calories'], rng=rng), targets))
+        
+        portions = self.solve_meal_portions(selections)
+        
+        # Diff each meal's food rows so only added, removed or resized portions are written
+        rows_to_create, rows_to_update, row_ids_to_delete = [], [], []
+        now = timezone.now()
+        for meal, (selected_foods, _), grams in zip(meals, selections, portions):
+            for field, value in self.build_meal_fields(user, meal.meal_type, requirements, selected_foods, grams).items():
+                setattr(meal, field, value)
+            meal.updated_at = now
+            
+            current = {row.food_id: row for row in meal.meal_foods.all()}
+            wanted = {food.pk: quantity for food, quantity in zip(selected_foods, grams)}
+            
+            for food_id, row in current.items():
+                if food_id not in wanted:
+                    row_ids_to_delete.append(row.id)
+                elif row.quantity != wanted[food_id]:
+                    row.quantity = wanted[food_id]
+                    rows_to_update.append(row)
+            rows_to_create.extend(
+                MealFood(meal=meal, food_id=food_id, quantity=quantity)
+                for food_id, quantity in wanted.items()
+                if food_id not in current
+            )
+        
+        with transaction.atomic():
+            if meals:
+                MealRecommendation.objects.bulk_update(meals, meal_fields)
+            if row_ids_to_delete:
+                MealFood.objects.filter(id__in=row_ids_to_delete).delete()
+            if rows_to_update:
+                MealFood.objects.bulk_update(rows_to_update, ['quantity'])
+            if rows_to_create:
+                MealFood.objects.bulk_create(rows_to_create)
+            if meals:
+                transaction.on_commit(lambda: invalidate_dashboard(user.pk))
+        
+        return meals
+    
+    def get_plan_version(self, plan):
+        """Fingerprint of a plan and the meals in its date range"""
+        # updated_at covers meals refreshed in place, which keep their ids
+        meals = MealRecommendation.objects.filter(
+            user_id=plan.user_id,
+            date__gte=plan.start_date,
+            date__lt=plan.end_date
+        ).aggregate(count=Count('id'), latest=Max('updated_at'))
+        latest = meals['latest'].isoformat() if meals['latest'] else ''
+        return f"{plan.updated_at.isoformat()}:{meals['count']}:{latest}"
+    
+    def summarize_nutrition_plan(self, plan):
+        """
+        Per-day and per-week nutrient totals for a plan, with adherence to its
+        daily targets. Totals are aggregated in the database and the result is
+        cached until the plan or its meals change.
+        """
+        cache_key = f"plan_summary:{plan.id}:{self.get_plan_version(plan)}"
+        summary = cache.get(cache_key)
+        if summary is not None:
+            return summary
+        
+        meal_filter = {
+            'user_id': plan.user_id,
+            'date__gte': plan.start_date,
+            'date__lt': plan.end_date,
+        }
+        
+        # Macros come from the stored meal totals, one row per day
+        macro_rows = MealRecommendation.objects.filter(**meal_filter).values('date').annotate(
+            meals=Count('id'),
+            calories=Sum('total_calories'),
+            protein=Sum('total_protein'),
+            carbs=Sum('total_carbs'),
+            fat=Sum('total_fat'),
+        ).order_by()
+        
+        # Micros are summed over the portioned meal/food rows, one row per day
+        micro_rows = MealFood.objects.filter(
+            **{f"meal__{key}": value for key, value in meal_filter.items()}
+        ).values('meal__date').annotate(**{
+            key: Sum(F(f"food__{column}") * F('quantity') / 100)
+            for key, column in MICRO_FIELDS.items()
+        }).order_by()
+        
+        nutrient_keys = list(MACRO_FIELDS) + list(MICRO_FIELDS)
+        by_date = {}
+        for row in macro_rows:
+            by_date[row['date']] = row
+        for row in micro_rows:
+            by_date.setdefault(row['meal__date'], {}).update(row)
+        
+        targets = {
+            'calories': plan.daily_calorie_target,
+            'protein': plan.daily_protein_target,
+            'carbs': plan.daily_carbs_target,
+            'fat': plan.daily_fat_target,
+        }
+        
+        def adherence(totals, days):
+            return {
+                key: round(totals[key] / (target * days) * 100, 1) if target else None
+                for key, target in targets.items()
+            }
+        
+        days = []
+        for offset in range(max((plan.end_date - plan.start_date).days, 1)):
+            date = plan.start_date + timedelta(days=offset)
+            row = by_date.get(date, {})
+            totals = {key: round(row.get(key) or 0, 2) for key in nutrient_keys}
+            days.append({
+                'date': date,
+                'meals': row.get('meals', 0),
+                'totals': totals,
+                'adherence': adherence(totals, 1),
+            })
+        
+        weeks = []
+        for index in range(0, len(days), 7):
+            week_days = days[index:index + 7]
+            totals = {
+                key: round(sum(day['totals'][key] for day in week_days), 2)
+                for key in nutrient_keys
+            }
+            weeks.append({
+                'week': index // 7 + 1,
+                'start_date': week_days[0]['date'],
+                'end_date': week_days[-1]['date'],
+                'meals': sum(day['meals'] for day in week_days),
+                'totals': totals,
+                'adherence': adherence(totals, len(week_days)),
+            })
+        
+        summary = {
+            'plan': plan.id,
+            'daily_targets': targets,
+            'days': days,
+            'weeks': weeks,
+        }
+        cache.set(cache_key, summary, settings.RECOMMENDATION_CACHE_TIMEOUT)
+        return summary
+    
+    def plan_shopping_list(self, plan):
+        """
+        Grams of each food needed across all meals in a plan's date range,
+        aggregated in a single query however many meals the plan has.
+        """
+        rows = MealFood.objects.filter(
+            meal__user_id=plan.user_id,
+            meal__date__gte=plan.start_date,
+            meal__date__lt=plan.end_date
+        ).values('food_id', 'food__name', 'food__category').annotate(
+            grams=Sum('quantity'),
+            meals=Count('meal_id', distinct=True),
+        ).order_by('food__category', 'food__name')
         
-        return plan
\ No newline at end of file
+        return [
+            {
+                'food_id': row['food_id'],
+                'name': row['food__name'],
+                'category': row['food__category'],
+                'grams': round(row['grams'], 1),
+                'meals': row['meals'],
+            }
+            for row in rows
+        ]
\ No newline at end of file
@@ -0,0 +1,50 @@
+import threading
+from django.db.models import Count, Max
+from .models import Food
+
+class CatalogSnapshot:
+    """Read-only copy of the available foods, in name order, for one catalog version"""
+
+    def __init__(self, version, foods):
+        self.version = version
+        self.foods = tuple(foods)
+
+    def select(self, seasons=None, categories=None, avoid_categories=None, excluded_flags=0):
+        """Available foods in any of `seasons` and `categories`, none of `avoid_categories`, without `excluded_flags`"""
+        return [
+            food for food in self.foods
+            if (not seasons or food.season in seasons)
+            and (not categories or food.category in categories)
+            and (not avoid_categories or food.category not in avoid_categories)
+            and not food.dietary_flags & excluded_flags
+        ]
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+def fetch_catalog_version():
+    """Fingerprint of the food catalog; changes whenever a food is added or edited"""
+    stats = Food.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    latest = stats['latest'].isoformat() if stats['latest'] else ''
+    return f"{stats['count']}:{latest}"
+
+def load_catalog_snapshot(version=None):
+    """Load the available foods into this process's snapshot"""
+    global _snapshot
+    version = version or fetch_catalog_version()
+    foods = Food.objects.filter(is_available=True).order_by('name', 'id')
+    _snapshot = CatalogSnapshot(version, foods)
+    return _snapshot
+
+def get_catalog_snapshot(version):
+    """
+    Snapshot for `version`, reloaded only when the catalog changed.
+    Loaded in the gunicorn master before fork so workers share its pages.
+    """
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    with _snapshot_lock:
+        if _snapshot is not None and _snapshot.version == version:
+            return _snapshot
+        return load_catalog_snapshot(version)
\ No newline at end of file
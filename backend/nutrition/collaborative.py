@@ -0,0 +1,219 @@
+import json
+import os
+from django.db.models import Count, Max, Sum
+from nutrifit.lazy import lazy_import
+from nutrifit.model_registry import registry
+
+# Offline training needs SciPy; online scoring only NumPy, loaded on first use
+np = lazy_import('numpy')
+sparse = lazy_import('scipy.sparse')
+sparse_linalg = lazy_import('scipy.sparse.linalg')
+
+MODEL_NAME = 'collaborative'
+
+# Interaction matrix kept between training runs, next to the published versions
+TRAINING_DIR = os.path.join(registry.model_path(MODEL_NAME), 'training')
+
+# Implicit feedback weight per interaction: being recommended a food is a
+# weak signal, adding it to the cart a stronger one, buying it the strongest
+SIGNAL_WEIGHTS = {
+    'recommended': 1.0,
+    'cart': 2.0,
+    'ordered': 4.0,
+}
+
+def interaction_sources():
+    """
+    (name, queryset factory) per signal. Each factory takes the source's
+    watermark and returns (user_id, food_id, count, latest) rows for the
+    interactions recorded after it, aggregated in the database.
+
+    Every source counts insert events on rows whose timestamp never
+    changes (a food added to a meal or to the cart, an order line), so
+    later edits to a row are never counted again.
+    """
+    from marketplace.models import Cart, OrderItem
+    from .models import MealFood
+
+    def recommended(since):
+        # Foods a replan adds to an older meal are counted when they are added
+        queryset = MealFood.objects.all()
+        if since:
+            queryset = queryset.filter(created_at__gt=since)
+        return queryset.values_list('meal__user_id', 'food_id').annotate(
+            count=Count('id'), latest=Max('created_at')
+        ).order_by()
+
+    def cart(since):
+        # Quantity edits bump updated_at but are not new interactions
+        queryset = Cart.objects.all()
+        if since:
+            queryset = queryset.filter(created_at__gt=since)
+        return queryset.values_list('user_id', 'food_id').annotate(
+            count=Count('id'), latest=Max('created_at')
+        ).order_by()
+
+    def ordered(since):
+        queryset = OrderItem.objects.filter(food__isnull=False)
+        if since:
+            queryset = queryset.filter(created_at__gt=since)
+        return queryset.values_list('order__user_id', 'food_id').annotate(
+            count=Sum('quantity'), latest=Max('created_at')
+        ).order_by()
+
+    return [('recommended', recommended), ('cart', cart), ('ordered', ordered)]
+
+class InteractionMatrix:
+    """
+    Weighted user-by-food interaction counts as a SciPy CSR matrix, with
+    the ids behind its rows and columns. update() only reads interactions
+    newer than each source's watermark and adds them to the matrix, so
+    retraining does not rescan the history. Rows deleted later (a cart
+    emptied at checkout, a food a replan dropped) stay counted; a --full
+    rebuild only sees the rows that still exist.
+    """
+
+    def __init__(self, user_ids=None, food_ids=None, matrix=None, watermarks=None):
+        self.user_ids = list(user_ids or [])
+        self.food_ids = list(food_ids or [])
+        self.user_index = {user_id: row for row, user_id in enumerate(self.user_ids)}
+        self.food_index = {food_id: column for column, food_id in enumerate(self.food_ids)}
+        self.matrix = matrix if matrix is not None else sparse.csr_matrix((0, 0), dtype=np.float32)
+        self.watermarks = watermarks or {}
+
+    @classmethod
+    def load(cls, path=TRAINING_DIR):
+        """Saved matrix state, or an empty one if there is none"""
+        try:
+            with open(os.path.join(path, 'interactions.json')) as f:
+                state = json.load(f)
+            matrix = sparse.load_npz(os.path.join(path, 'interactions.npz')).tocsr()
+        except FileNotFoundError:
+            return cls()
+        return cls(state['users'], state['foods'], matrix, state['watermarks'])
+
+    def save(self, path=TRAINING_DIR):
+        os.makedirs(path, exist_ok=True)
+        sparse.save_npz(os.path.join(path, 'interactions.npz'), self.matrix)
+        write_json(os.path.join(path, 'interactions.json'), {
+            'users': self.user_ids,
+            'foods': self.food_ids,
+            'watermarks': self.watermarks,
+        })
+
+    def _index(self, index, ids, key):
+        position = index.get(key)
+        if position is None:
+            position = index[key] = len(ids)
+            ids.append(key)
+        return position
+
+    def update(self):
+        """Add interactions recorded since the last update; returns how many groups were read"""
+        rows, columns, values = [], [], []
+        for name, source in interaction_sources():
+            weight = SIGNAL_WEIGHTS[name]
+            latest = self.watermarks.get(name)
+            for user_id, food_id, count, seen in source(latest):
+                rows.append(self._index(self.user_index, self.user_ids, str(user_id)))
+                columns.append(self._index(self.food_index, self.food_ids, str(food_id)))
+                values.append(weight * count)
+                seen = seen.isoformat()
+                if latest is None or seen > latest:
+                    latest = seen
+            if latest is not None:
+                self.watermarks[name] = latest
+
+        shape = (len(self.user_ids), len(self.food_ids))
+        matrix = self.matrix.copy()
+        matrix.resize(shape)
+        if values:
+            # Duplicate (row, column) pairs are summed by the conversion
+            matrix = matrix + sparse.coo_matrix(
+                (np.asarray(values, dtype=np.float32), (rows, columns)), shape=shape
+            ).tocsr()
+        self.matrix = matrix.tocsr()
+        return len(values)
+
+def factorize(matrix, factors):
+    """
+    User and food embeddings from a truncated SVD of the log-scaled
+    interaction matrix, so a user's affinity for a food is the dot product
+    of their rows.
+    """
+    scaled = matrix.astype(np.float64)
+    scaled.data = np.log1p(scaled.data)
+    rank = min(factors, min(scaled.shape) - 1)
+    if rank < 1:
+        raise ValueError('Not enough users and foods with interactions to factorize')
+
+    u, s, vt = sparse_linalg.svds(scaled, k=rank)
+    root = np.sqrt(s)
+    return (u * root).astype(np.float32), (vt.T * root).astype(np.float32)
+
+def write_json(path, data):
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+def save_embeddings(interactions, user_factors, food_factors, registry=registry):
+    """Publish embeddings as a new registry version; returns the version"""
+    return registry.publish(
+        MODEL_NAME,
+        {'user_factors': user_factors, 'food_factors': food_factors},
+        {
+            'users': interactions.user_ids,
+            'foods': interactions.food_ids,
+            'factors': int(food_factors.shape[1]),
+        },
+    )
+
+class CollaborativeModel:
+    """Memory-mapped embeddings of one registry version with vectorized per-user scoring"""
+
+    def __init__(self, version):
+        meta = version.meta
+        self.version = version.version
+        self.user_factors = version.arrays['user_factors']
+        self.food_factors = version.arrays['food_factors']
+        if self.user_factors.shape[0] != len(meta['users']) or self.food_factors.shape[0] != len(meta['foods']):
+            raise ValueError('Embeddings do not match their ids')
+        self.user_index = {user_id: row for row, user_id in enumerate(meta['users'])}
+        self.food_index = {food_id: row for row, food_id in enumerate(meta['foods'])}
+
+    def score(self, user_id, food_ids):
+        """Affinity of a user for each food (0 for unseen foods), or None for unseen users"""
+        row = self.user_index.get(str(user_id))
+        if row is None:
+            return None
+        columns = np.fromiter(
+            (self.food_index.get(str(food_id), -1) for food_id in food_ids),
+            dtype=np.intp, count=len(food_ids)
+        )
+        known = columns >= 0
+        scores = np.zeros(len(food_ids), dtype=np.float32)
+        scores[known] = self.food_factors[columns[known]] @ self.user_factors[row]
+        return scores
+
+    def rank(self, user_id, foods, rng, weight):
+        """
+        Foods ordered by `weight` * normalized affinity plus a seeded
+        random draw in [0, 1), so preferred foods come first without
+        every meal repeating them. Unchanged for unseen users.
+        """
+        scores = self.score(user_id, [food.id for food in foods])
+        if scores is None:
+            return foods
+        spread = scores.max() - scores.min()
+        if spread > 0:
+            scores = (scores - scores.min()) / spread
+        noise = np.array([rng.random() for _ in foods], dtype=np.float32)
+        order = np.argsort(-(weight * scores + noise), kind='stable')
+        return [foods[index] for index in order]
+
+registry.register(MODEL_NAME, CollaborativeModel)
+
+def get_collaborative_model():
+    """Current embeddings for this process, swapped when a new version is published; None if untrained"""
+    return registry.get(MODEL_NAME)
\ No newline at end of file
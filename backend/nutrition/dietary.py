@@ -0,0 +1,64 @@
+from django.db.models import F
+from .models import Food
+
+# Allergy names (as typed into the profile) -> Food flags they exclude
+ALLERGY_FLAGS = {
+    'meat': Food.FLAG_MEAT,
+    'fish': Food.FLAG_FISH,
+    'shellfish': Food.FLAG_SHELLFISH,
+    'prawn': Food.FLAG_SHELLFISH,
+    'shrimp': Food.FLAG_SHELLFISH,
+    'egg': Food.FLAG_EGG,
+    'dairy': Food.FLAG_DAIRY,
+    'milk': Food.FLAG_DAIRY,
+    'lactose': Food.FLAG_DAIRY,
+    'gluten': Food.FLAG_GLUTEN,
+    'wheat': Food.FLAG_GLUTEN,
+    'nut': Food.FLAG_TREE_NUTS | Food.FLAG_PEANUTS,
+    'tree-nut': Food.FLAG_TREE_NUTS,
+    'almond': Food.FLAG_TREE_NUTS,
+    'cashew': Food.FLAG_TREE_NUTS,
+    'walnut': Food.FLAG_TREE_NUTS,
+    'peanut': Food.FLAG_PEANUTS,
+    'soy': Food.FLAG_SOY,
+    'soya': Food.FLAG_SOY,
+    'sesame': Food.FLAG_SESAME,
+}
+
+# Dietary preferences -> Food flags they exclude
+DIET_FLAGS = {
+    'vegetarian': Food.FLAG_MEAT | Food.FLAG_FISH | Food.FLAG_SHELLFISH,
+    'veg': Food.FLAG_MEAT | Food.FLAG_FISH | Food.FLAG_SHELLFISH,
+    'vegan': Food.FLAG_MEAT | Food.FLAG_FISH | Food.FLAG_SHELLFISH | Food.FLAG_EGG | Food.FLAG_DAIRY,
+    'pescatarian': Food.FLAG_MEAT,
+    'eggless': Food.FLAG_EGG,
+    'gluten-free': Food.FLAG_GLUTEN,
+    'dairy-free': Food.FLAG_DAIRY,
+    'lactose-free': Food.FLAG_DAIRY,
+    'nut-free': Food.FLAG_TREE_NUTS | Food.FLAG_PEANUTS,
+}
+
+def parse_flags(text, mapping):
+    """Combine the flags of every comma-separated term found in `mapping`"""
+    flags = 0
+    for term in (text or '').split(','):
+        term = '-'.join(term.strip().lower().split())
+        if term not in mapping and term.endswith('s'):
+            term = term[:-1]
+        flags |= mapping.get(term, 0)
+    return flags
+
+def get_excluded_flags(profile):
+    """Bitmask of Food flags a profile's allergies and diet rule out"""
+    return (
+        parse_flags(profile.allergies, ALLERGY_FLAGS)
+        | parse_flags(profile.dietary_preferences, DIET_FLAGS)
+    )
+
+def filter_flagged(queryset, flags, field='dietary_flags'):
+    """Keep only rows whose food carries at least one of `flags`"""
+    if not flags:
+        return queryset.none()
+    return queryset.alias(
+        blocked_flags=F(field).bitand(flags)
+    ).exclude(blocked_flags=0)
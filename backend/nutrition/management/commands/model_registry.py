@@ -0,0 +1,51 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import get_resolver
+from nutrifit.model_registry import registry
+
+class Command(BaseCommand):
+    help = 'List the model versions under ML_MODEL_PATH, switch the active version, or time loading them'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--activate', nargs=2, metavar=('MODEL', 'VERSION'), help='Make VERSION active (e.g. to roll back)')
+        parser.add_argument('--load', action='store_true', help='Load the active versions and report load time and memory')
+    
+    def handle(self, *args, **options):
+        if options['activate']:
+            name, version = options['activate']
+            try:
+                registry.activate(name, version)
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(
+                f'{name} now serves {version}; web processes switch within {registry.check_interval:g}s'
+            ))
+            return
+        
+        names = registry.models()
+        if not names:
+            self.stdout.write(f'No models published under {registry.root}')
+            return
+        
+        for name in names:
+            current = registry.current_version(name)
+            self.stdout.write(name)
+            for version in registry.versions(name):
+                marker = '*' if version == current else ' '
+                self.stdout.write(f'  {marker} {version}')
+        
+        if options['load']:
+            # Importing the URLconf registers each model's factory, as in the gunicorn master
+            get_resolver().url_patterns
+            start = time.perf_counter()
+            for name in names:
+                registry.get(name)
+            self.stdout.write(f'\nLoaded {len(names)} model(s) in {(time.perf_counter() - start) * 1000:.1f}ms')
+            self.stdout.write(f"{'model':<16} {'version':<24} {'load ms':>8} {'mapped KiB':>11} {'resident KiB':>13}")
+            for loaded in registry.loaded():
+                resident = loaded.resident_bytes()
+                resident = f'{resident / 1024:.1f}' if resident is not None else '-'
+                self.stdout.write(
+                    f'{loaded.name:<16} {loaded.version:<24} {loaded.load_seconds * 1000:>8.1f} '
+                    f'{loaded.mapped_bytes / 1024:>11.1f} {resident:>13}'
+                )
\ No newline at end of file
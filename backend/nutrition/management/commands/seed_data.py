@@ -86,6 +86,7 @@ class Command(BaseCommand):
                 'carbohydrates': 0,
                 'fat': 3.6,
                 'iron': 0.9,
+                'dietary_flags': Food.FLAG_MEAT,
                 'health_benefits': 'Lean protein source, good for muscle building',
                 'suitable_for': 'weight management, muscle building, general health',
             },
@@ -156,6 +157,7 @@ class Command(BaseCommand):
                 'carbohydrates': 4.7,
                 'fat': 3.3,
                 'calcium': 121,
+                'dietary_flags': Food.FLAG_DAIRY,
                 'health_benefits': 'Probiotic, good for digestion and gut health',
                 'suitable_for': 'digestion, bone health, immunity',
             },
@@ -172,6 +174,7 @@ class Command(BaseCommand):
                 'vitamin_a': 0.3,
                 'calcium': 269,
                 'iron': 3.7,
+                'dietary_flags': Food.FLAG_TREE_NUTS,
                 'health_benefits': 'Heart healthy fats, protein rich',
                 'suitable_for': 'heart health, brain health, weight management',
             },
@@ -233,13 +236,24 @@ class Command(BaseCommand):
             },
         ]
         
+        flagged = 0
         for food_data in foods_data:
-            Food.objects.get_or_create(
+            food, created = Food.objects.get_or_create(
                 name=food_data['name'],
                 defaults=food_data
             )
+            
+            # Foods seeded before dietary flags existed get their flags added;
+            # flags set by hand are kept
+            flags = food_data.get('dietary_flags', 0)
+            if not created and food.dietary_flags | flags != food.dietary_flags:
+                food.dietary_flags |= flags
+                food.save(update_fields=['dietary_flags', 'updated_at'])
+                flagged += 1
         
         self.stdout.write(f'Added {len(foods_data)} foods')
+        if flagged:
+            self.stdout.write(f'Backfilled dietary flags on {flagged} existing foods')
     
     def seed_diseases(self):
         diseases_data = [
@@ -0,0 +1,35 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from nutrition.collaborative import InteractionMatrix, factorize, save_embeddings
+
+class Command(BaseCommand):
+    help = 'Update the user-by-food interaction matrix and retrain the collaborative-filtering embeddings'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--factors', type=int, default=settings.COLLAB_FACTORS)
+        parser.add_argument('--full', action='store_true', help='Rebuild the matrix from the whole history')
+    
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        interactions = InteractionMatrix() if options['full'] else InteractionMatrix.load()
+        groups = interactions.update()
+        interactions.save()
+        matrix = interactions.matrix
+        self.stdout.write(
+            f'Interactions: {groups} new groups, {matrix.shape[0]} users x {matrix.shape[1]} foods, '
+            f'{matrix.nnz} non-zero ({time.perf_counter() - start:.2f}s)'
+        )
+        
+        start = time.perf_counter()
+        try:
+            user_factors, food_factors = factorize(matrix, options['factors'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        version = save_embeddings(interactions, user_factors, food_factors)
+        self.stdout.write(
+            f'Embeddings: version {version}, {food_factors.shape[1]} factors, '
+            f'{(user_factors.nbytes + food_factors.nbytes) / 1024:.1f} KiB ({time.perf_counter() - start:.2f}s)'
+        )
+        
+        self.stdout.write(self.style.SUCCESS('Recommender trained!'))
\ No newline at end of file
@@ -22,6 +22,31 @@ class Food(models.Model):
         ('all', 'All Seasons'),
     ]
     
+    # Allergens and animal products, combined into the dietary_flags bitmask
+    FLAG_MEAT = 1 << 0
+    FLAG_FISH = 1 << 1
+    FLAG_SHELLFISH = 1 << 2
+    FLAG_EGG = 1 << 3
+    FLAG_DAIRY = 1 << 4
+    FLAG_GLUTEN = 1 << 5
+    FLAG_TREE_NUTS = 1 << 6
+    FLAG_PEANUTS = 1 << 7
+    FLAG_SOY = 1 << 8
+    FLAG_SESAME = 1 << 9
+    
+    DIETARY_FLAG_CHOICES = [
+        (FLAG_MEAT, 'Meat'),
+        (FLAG_FISH, 'Fish'),
+        (FLAG_SHELLFISH, 'Shellfish'),
+        (FLAG_EGG, 'Egg'),
+        (FLAG_DAIRY, 'Dairy'),
+        (FLAG_GLUTEN, 'Gluten'),
+        (FLAG_TREE_NUTS, 'Tree Nuts'),
+        (FLAG_PEANUTS, 'Peanuts'),
+        (FLAG_SOY, 'Soy'),
+        (FLAG_SESAME, 'Sesame'),
+    ]
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=200)
     name_nepali = models.CharField(max_length=200, blank=True)
@@ -46,6 +71,7 @@ class Food(models.Model):
     health_benefits = models.TextField(blank=True, help_text='Health benefits and properties')
     suitable_for = models.TextField(blank=True, help_text='Suitable for conditions (e.g., diabetes, hypertension)')
     avoid_in = models.TextField(blank=True, help_text='Conditions to avoid this food')
+    dietary_flags = models.PositiveIntegerField(default=0, help_text='Bitmask of allergens and animal products contained')
     
     # Availability
     is_available = models.BooleanField(default=True)
@@ -62,6 +88,14 @@ class Food(models.Model):
     
     def __str__(self):
         return self.name
+    
+    @property
+    def dietary_tags(self):
+        return self.tags_for_flags(self.dietary_flags)
+    
+    @classmethod
+    def tags_for_flags(cls, dietary_flags):
+        return [label for flag, label in cls.DIETARY_FLAG_CHOICES if dietary_flags & flag]
 
 class MealRecommendation(models.Model):
     MEAL_TYPE_CHOICES = [
@@ -73,7 +107,7 @@ class MealRecommendation(models.Model):
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='meal_recommendations')
-    foods = models.ManyToManyField(Food, related_name='recommendations')
+    foods = models.ManyToManyField(Food, related_name='recommendations', through='MealFood')
     meal_type = models.CharField(max_length=20, choices=MEAL_TYPE_CHOICES)
     date = models.DateField()
     
@@ -92,17 +126,45 @@ class MealRecommendation(models.Model):
     ai_summary = models.TextField(blank=True, help_text='AI-generated meal description')
     ai_reasoning = models.TextField(blank=True, help_text='Why this meal was recommended')
     
+    # Generation inputs (user, date, meal type) used to seed and dedupe; unique
+    # per user so concurrent requests cannot fill one slot twice (null for
+    # meals generated before seeding, which the constraint ignores)
+    seed_key = models.CharField(max_length=64, null=True, blank=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
+    # Also set by refresh_meals, whose bulk_update skips auto_now
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'meal_recommendations'
         verbose_name = 'Meal Recommendation'
         verbose_name_plural = 'Meal Recommendations'
         ordering = ['-date', 'meal_type']
+        unique_together = ['user', 'seed_key']
     
     def __str__(self):
         return f"{self.user.email} - {self.meal_name} ({self.date})"
 
+class MealFood(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    meal = models.ForeignKey(MealRecommendation, on_delete=models.CASCADE, related_name='meal_foods')
+    food = models.ForeignKey(Food, on_delete=models.CASCADE, related_name='meal_foods')
+    quantity = models.FloatField(default=50, help_text='Portion in grams')
+    # When the food was added to the meal (at generation, or later by a replan)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'meal_foods'
+        verbose_name = 'Meal Food'
+        verbose_name_plural = 'Meal Foods'
+        unique_together = ['meal', 'food']
+        indexes = [
+            models.Index(fields=['created_at'], name='meal_foods_created'),
+        ]
+    
+    def __str__(self):
+        return f"{self.food.name} ({self.quantity:g}g)"
+
 class NutritionPlan(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='nutrition_plans')
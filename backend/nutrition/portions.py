@@ -0,0 +1,81 @@
+from nutrifit.lazy import lazy_import
+
+# Loaded on the first solve rather than at URL import in every worker
+np = lazy_import('numpy')
+
+# Per-food portion bounds in grams
+MIN_PORTION_GRAMS = 20
+MAX_PORTION_GRAMS = 300
+
+# Portion assumed before solving, and for foods added without a quantity
+DEFAULT_PORTION_GRAMS = 50
+
+# Order of the nutrient columns passed to the solver
+SOLVER_NUTRIENTS = ['calories', 'protein', 'carbs', 'fat']
+
+class PortionSolver:
+    """
+    Batched bounded least-squares solver for meal portions.
+    Finds per-food gram amounts so each meal's calories and macros land as
+    close as possible to its targets, for many meals at once.
+    """
+
+    def __init__(self, min_grams=MIN_PORTION_GRAMS, max_grams=MAX_PORTION_GRAMS,
+                 iterations=300, step_grams=5):
+        self.min_grams = min_grams
+        self.max_grams = max_grams
+        self.iterations = iterations
+        self.step_grams = step_grams
+
+    def solve(self, meals):
+        """
+        Solve portions for a batch of meals.
+        `meals` is a list of (foods, targets) pairs, where `foods` is a list of
+        per-100g nutrient rows in SOLVER_NUTRIENTS order and `targets` the
+        meal's target for each nutrient. Returns a list of gram lists.
+        """
+        if not meals:
+            return []
+
+        batch = len(meals)
+        width = max(len(foods) for foods, _ in meals) or 1
+        depth = len(SOLVER_NUTRIENTS)
+
+        # A[b] maps grams of each food to nutrient totals, scaled so every
+        # target row becomes 1 and errors are relative rather than absolute
+        A = np.zeros((batch, depth, width))
+        t = np.zeros((batch, depth))
+        lower = np.zeros((batch, width))
+        upper = np.zeros((batch, width))
+
+        for b, (foods, targets) in enumerate(meals):
+            if not foods:
+                continue
+            per_gram = np.asarray(foods, dtype=float).T / 100
+            targets = np.asarray(targets, dtype=float)
+            scale = np.divide(1.0, targets, out=np.zeros_like(targets), where=targets > 0)
+            A[b, :, :len(foods)] = per_gram * scale[:, None]
+            t[b] = (targets > 0).astype(float)
+            lower[b, :len(foods)] = self.min_grams
+            upper[b, :len(foods)] = self.max_grams
+
+        # Step size from the largest eigenvalue of A^T A in each meal
+        lipschitz = np.linalg.norm(A, ord=2, axis=(1, 2)) ** 2
+        step = np.divide(1.0, lipschitz, out=np.zeros_like(lipschitz), where=lipschitz > 0)[:, None]
+
+        # Accelerated projected gradient (FISTA), all meals in lockstep
+        x = np.clip(np.full((batch, width), float(DEFAULT_PORTION_GRAMS)), lower, upper)
+        y = x.copy()
+        momentum = 1.0
+        for _ in range(self.iterations):
+            residual = np.einsum('bnf,bf->bn', A, y) - t
+            gradient = np.einsum('bnf,bn->bf', A, residual)
+            x_next = np.clip(y - step * gradient, lower, upper)
+            momentum_next = (1 + np.sqrt(1 + 4 * momentum ** 2)) / 2
+            y = x_next + ((momentum - 1) / momentum_next) * (x_next - x)
+            x, momentum = x_next, momentum_next
+
+        # Round to kitchen-friendly steps without leaving the bounds
+        x = np.clip(np.round(x / self.step_grams) * self.step_grams, lower, upper)
+
+        return [x[b, :len(foods)].tolist() for b, (foods, _) in enumerate(meals)]
\ No newline at end of file
@@ -1,13 +1,26 @@
+from django.db.models import F
 from rest_framework import serializers
-from .models import Food, MealRecommendation, NutritionPlan
+from nutrifit.values_serializers import ValuesSerializer, group_by
+from .models import Food, MealFood, MealRecommendation, NutritionPlan
 
 class FoodSerializer(serializers.ModelSerializer):
+    dietary_tags = serializers.ReadOnlyField()
+    
     class Meta:
         model = Food
         fields = '__all__'
 
+class MealFoodSerializer(serializers.ModelSerializer):
+    food_id = serializers.UUIDField(read_only=True)
+    food_name = serializers.CharField(source='food.name', read_only=True)
+    
+    class Meta:
+        model = MealFood
+        fields = ['food_id', 'food_name', 'quantity']
+
 class MealRecommendationSerializer(serializers.ModelSerializer):
     foods = FoodSerializer(many=True, read_only=True)
+    portions = MealFoodSerializer(many=True, read_only=True, source='meal_foods')
     food_ids = serializers.ListField(
         child=serializers.UUIDField(),
         write_only=True,
@@ -17,7 +30,7 @@ class MealRecommendationSerializer(serializers.ModelSerializer):
     class Meta:
         model = MealRecommendation
         fields = [
-            'id', 'user', 'foods', 'food_ids', 'meal_type', 'date',
+            'id', 'user', 'foods', 'portions', 'food_ids', 'meal_type', 'date',
             'meal_name', 'instructions', 'portion_size',
             'total_calories', 'total_protein', 'total_carbs', 'total_fat',
             'ai_summary', 'ai_reasoning', 'created_at'
@@ -44,4 +57,44 @@ class NutritionPlanSerializer(serializers.ModelSerializer):
             'plan_description', 'health_focus', 'is_active',
             'created_at', 'updated_at', 'meal_recommendations'
         ]
-        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+
+# Read-only fast paths for list views: same output as the serializers above,
+# built from .values() rows
+
+class FoodValuesSerializer(ValuesSerializer):
+    serializer_class = FoodSerializer
+    computed_fields = {
+        'dietary_tags': (['dietary_flags'], lambda row: Food.tags_for_flags(row['dietary_flags'])),
+    }
+
+class MealFoodValuesSerializer(ValuesSerializer):
+    serializer_class = MealFoodSerializer
+
+class MealRecommendationValuesSerializer(ValuesSerializer):
+    serializer_class = MealRecommendationSerializer
+    
+    def get_nested(self, name, rows):
+        meal_ids = [row['pk'] for row in rows]
+        
+        if name == 'foods':
+            foods = FoodValuesSerializer()
+            return group_by(foods, Food.objects.filter(meal_foods__meal__in=meal_ids).values(
+                *foods.get_columns(), meal_id=F('meal_foods__meal')
+            ), 'meal_id')
+        
+        portions = MealFoodValuesSerializer()
+        return group_by(portions, MealFood.objects.filter(meal__in=meal_ids).values(
+            *portions.get_columns(), 'meal_id'
+        ), 'meal_id')
+
+class NutritionPlanValuesSerializer(ValuesSerializer):
+    serializer_class = NutritionPlanSerializer
+    
+    def get_nested(self, name, rows):
+        # Every plan lists all of its user's meals; load them once per user
+        meals = MealRecommendationValuesSerializer()
+        by_user = group_by(meals, MealRecommendation.objects.filter(
+            user__in={row['user'] for row in rows}
+        ).values(*meals.get_columns(), 'user'), 'user')
+        return {row['pk']: by_user.get(row['user'], []) for row in rows}
\ No newline at end of file
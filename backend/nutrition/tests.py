@@ -0,0 +1,127 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from users.models import User
+from .ai_engine import NutritionAI
+from .models import Food, MealRecommendation, NutritionPlan
+from .portions import MAX_PORTION_GRAMS, MIN_PORTION_GRAMS, PortionSolver
+from .serializers import (
+    FoodSerializer, FoodValuesSerializer, MealRecommendationSerializer,
+    MealRecommendationValuesSerializer, NutritionPlanSerializer, NutritionPlanValuesSerializer
+)
+
+def create_user(email, **profile_fields):
+    user = User.objects.create_user(email, 'pass12345', first_name='Test', last_name='User')
+    profile = user.profile
+    for field, value in {'age': 30, 'gender': 'F', 'weight': 60, 'height': 165, **profile_fields}.items():
+        setattr(profile, field, value)
+    profile.save()
+    return user
+
+class ValuesSerializerTestCase(TestCase):
+    """The .values() fast paths must render the same JSON bytes as their DRF serializers"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_data', stdout=StringIO())
+        Food.objects.filter(name='Mango (Aap)').update(
+            is_available=False, vitamin_c=0.1 + 0.2, description='Sweet\u2028seasonal'
+        )
+        
+        cls.user = create_user('values@example.com', diseases='diabetes', allergies='dairy')
+        other = create_user('other@example.com', goal='gain')
+        for user in (cls.user, other):
+            NutritionAI().create_nutrition_plan(user, duration_days=3)
+        NutritionAI().get_or_generate_meal_recommendation(cls.user, 'snack', '2026-01-01')
+        NutritionAI().create_nutrition_plan(cls.user, duration_days=1)
+    
+    def assertSameJSON(self, queryset, serializer_class, values_serializer_class):
+        self.assertTrue(queryset.exists())
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        # Responses are rendered by the configured default renderer
+        actual = api_settings.DEFAULT_RENDERER_CLASSES[0]().render(values_serializer_class().serialize(queryset))
+        self.assertEqual(actual, expected)
+    
+    def test_foods(self):
+        self.assertSameJSON(Food.objects.all(), FoodSerializer, FoodValuesSerializer)
+    
+    def test_meal_recommendations(self):
+        self.assertSameJSON(
+            MealRecommendation.objects.filter(user=self.user),
+            MealRecommendationSerializer, MealRecommendationValuesSerializer
+        )
+    
+    def test_nutrition_plans(self):
+        self.assertSameJSON(NutritionPlan.objects.all(), NutritionPlanSerializer, NutritionPlanValuesSerializer)
+
+class PlanSummaryTestCase(TestCase):
+    """Cached plan summaries must not outlive changes to the plan's meals"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_data', stdout=StringIO())
+        cls.user = create_user('summary@example.com')
+    
+    def test_summary_follows_meals_refreshed_in_place(self):
+        ai_engine = NutritionAI()
+        plan = ai_engine.create_nutrition_plan(self.user, duration_days=1)
+        before = ai_engine.summarize_nutrition_plan(plan)
+        
+        requirements = ai_engine.analyze_user_health(self.user)
+        for key in ('calories', 'protein', 'carbs', 'fat'):
+            requirements[key] *= 1.5
+        meals = list(MealRecommendation.objects.filter(user=self.user).prefetch_related('meal_foods'))
+        ai_engine.refresh_meals(self.user, requirements, meals)
+        
+        after = ai_engine.summarize_nutrition_plan(plan)
+        calories = sum(MealRecommendation.objects.filter(user=self.user).values_list('total_calories', flat=True))
+        self.assertEqual(after['days'][0]['totals']['calories'], round(calories, 2))
+        self.assertNotEqual(after['days'][0]['totals'], before['days'][0]['totals'])
+
+class PortionSolverTestCase(SimpleTestCase):
+    """Portions stay within the per-food bounds and land on whole 5g steps"""
+    
+    # Per-100g calories, protein, carbs and fat
+    RICE = [130, 2.7, 28, 0.3]
+    LENTILS = [116, 9, 20, 0.4]
+    
+    def nutrients(self, foods, grams):
+        return [sum(food[i] * g / 100 for food, g in zip(foods, grams)) for i in range(4)]
+    
+    def test_reachable_targets(self):
+        foods = [self.RICE, self.LENTILS]
+        [grams] = PortionSolver().solve([(foods, self.nutrients(foods, [120, 85]))])
+        self.assertEqual(grams, [120, 85])
+    
+    def test_rounds_to_steps(self):
+        [grams] = PortionSolver().solve([([self.RICE], self.nutrients([self.RICE], [152]))])
+        self.assertEqual(grams, [150])
+        
+        [grams] = PortionSolver(step_grams=10).solve([([self.RICE], self.nutrients([self.RICE], [147]))])
+        self.assertEqual(grams, [150])
+    
+    def test_bounds(self):
+        foods = [self.RICE, self.LENTILS]
+        large, small = PortionSolver().solve([
+            (foods, [5000, 200, 1000, 50]),
+            (foods, [1, 0.1, 0.1, 0.01]),
+        ])
+        self.assertEqual(large, [MAX_PORTION_GRAMS, MAX_PORTION_GRAMS])
+        self.assertEqual(small, [MIN_PORTION_GRAMS, MIN_PORTION_GRAMS])
+    
+    def test_batch_shapes(self):
+        solver = PortionSolver()
+        self.assertEqual(solver.solve([]), [])
+        
+        results = solver.solve([
+            ([self.RICE, self.LENTILS, self.RICE], [600, 20, 100, 2]),
+            ([], [600, 20, 100, 2]),
+            ([self.LENTILS], [150, 10, 25, 0.5]),
+        ])
+        self.assertEqual([len(grams) for grams in results], [3, 0, 1])
+        for grams in results:
+            for g in grams:
+                self.assertTrue(MIN_PORTION_GRAMS <= g <= MAX_PORTION_GRAMS)
+                self.assertEqual(g % 5, 0)
\ No newline at end of file
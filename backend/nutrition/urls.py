@@ -7,6 +7,11 @@ urlpatterns = [
     path('foods/season/<str:season>/', views.SeasonalFoodsView.as_view(), name='seasonal-foods'),
     path('recommendations/', views.MealRecommendationListView.as_view(), name='meal-recommendations'),
     path('recommendations/generate/', views.GenerateMealRecommendationView.as_view(), name='generate-recommendations'),
+    path('recommendations/generate/async/', views.AsyncGenerateMealRecommendationView.as_view(), name='generate-recommendations-async'),
     path('plans/', views.NutritionPlanListView.as_view(), name='nutrition-plans'),
     path('plans/create/', views.CreateNutritionPlanView.as_view(), name='create-plan'),
+    path('plans/<uuid:pk>/summary/', views.NutritionPlanSummaryView.as_view(), name='plan-summary'),
+    path('plans/<uuid:pk>/shopping-list/', views.PlanShoppingListView.as_view(), name='plan-shopping-list'),
+    path('plans/<uuid:pk>/shopping-list/cart/', views.FillCartFromPlanView.as_view(), name='plan-fill-cart'),
+    path('plans/<uuid:pk>/replan/', views.ReplanNutritionPlanView.as_view(), name='replan-plan'),
 ]
\ No newline at end of file
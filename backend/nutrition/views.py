@@ -5,13 +5,23 @@ from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 from django.db import models as django_models
 from datetime import datetime, timedelta
+import json
 from .models import Food, MealRecommendation, NutritionPlan
-from .serializers import FoodSerializer, MealRecommendationSerializer, NutritionPlanSerializer
+from .serializers import (
+    FoodSerializer, FoodValuesSerializer, MealRecommendationSerializer,
+    MealRecommendationValuesSerializer, NutritionPlanSerializer, NutritionPlanValuesSerializer
+)
 from .ai_engine import NutritionAI
+from nutrifit.async_views import AsyncAPIView, run_in_executor
+from nutrifit.values_serializers import ValuesListMixin
+from marketplace.cart import apply_cart_operations, cart_quantity, shopping_list_operations
+from marketplace.models import Cart
+from marketplace.serializers import CartValuesSerializer
 
-class FoodListView(generics.ListAPIView):
+class FoodListView(ValuesListMixin, generics.ListAPIView):
     queryset = Food.objects.filter(is_available=True)
     serializer_class = FoodSerializer
+    values_serializer_class = FoodValuesSerializer
     permission_classes = [IsAuthenticated]
 
 class FoodDetailView(generics.RetrieveAPIView):
@@ -19,8 +29,9 @@ class FoodDetailView(generics.RetrieveAPIView):
     serializer_class = FoodSerializer
     permission_classes = [IsAuthenticated]
 
-class SeasonalFoodsView(generics.ListAPIView):
+class SeasonalFoodsView(ValuesListMixin, generics.ListAPIView):
     serializer_class = FoodSerializer
+    values_serializer_class = FoodValuesSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
@@ -29,8 +40,9 @@ class SeasonalFoodsView(generics.ListAPIView):
             django_models.Q(season=season) | django_models.Q(season='all')
         )
 
-class MealRecommendationListView(generics.ListAPIView):
+class MealRecommendationListView(ValuesListMixin, generics.ListAPIView):
     serializer_class = MealRecommendationSerializer
+    values_serializer_class = MealRecommendationValuesSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
@@ -48,15 +60,18 @@ class GenerateMealRecommendationView(APIView):
             # Initialize AI engine
             ai_engine = NutritionAI()
             
-            # Generate meal recommendation
-            recommendation = ai_engine.generate_meal_recommendation(
+            # Reuse the meal already generated for this slot, if any
+            recommendation, created = ai_engine.get_or_generate_meal_recommendation(
                 user=user,
                 meal_type=meal_type,
                 date=date
             )
             
             serializer = MealRecommendationSerializer(recommendation)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            return Response(
+                serializer.data,
+                status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+            )
         
         except Exception as e:
             return Response(
@@ -64,8 +79,41 @@ class GenerateMealRecommendationView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-class NutritionPlanListView(generics.ListAPIView):
+class AsyncGenerateMealRecommendationView(AsyncAPIView):
+    """Recommendation endpoint for ASGI; selection and portion solving run on the executor"""
+    
+    async def post(self, request):
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return self.error('Invalid JSON body')
+        if not isinstance(data, dict):
+            return self.error('JSON body must be an object')
+        
+        meal_type = data.get('meal_type', 'lunch')
+        date = data.get('date', timezone.now().date())
+        
+        def generate():
+            recommendation, created = NutritionAI().get_or_generate_meal_recommendation(
+                user=request.user,
+                meal_type=meal_type,
+                date=date
+            )
+            return MealRecommendationSerializer(recommendation).data, created
+        
+        try:
+            meal_data, created = await run_in_executor(generate)
+        except Exception as e:
+            return self.error(str(e))
+        
+        return self.respond(
+            meal_data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
+class NutritionPlanListView(ValuesListMixin, generics.ListAPIView):
     serializer_class = NutritionPlanSerializer
+    values_serializer_class = NutritionPlanValuesSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
@@ -91,6 +139,128 @@ class CreateNutritionPlanView(APIView):
             serializer = NutritionPlanSerializer(plan)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+class NutritionPlanSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, pk):
+        try:
+            plan = NutritionPlan.objects.get(id=pk, user=request.user)
+            
+            ai_engine = NutritionAI()
+            summary = ai_engine.summarize_nutrition_plan(plan)
+            
+            return Response(summary, status=status.HTTP_200_OK)
+        
+        except NutritionPlan.DoesNotExist:
+            return Response(
+                {'error': 'Plan not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+class PlanShoppingListView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, pk):
+        try:
+            plan = NutritionPlan.objects.get(id=pk, user=request.user)
+            
+            ai_engine = NutritionAI()
+            items = ai_engine.plan_shopping_list(plan)
+            for item in items:
+                item['cart_quantity'] = cart_quantity(item['grams'])
+            
+            return Response(
+                {
+                    'plan': plan.id,
+                    'start_date': plan.start_date,
+                    'end_date': plan.end_date,
+                    'items': items
+                },
+                status=status.HTTP_200_OK
+            )
+        
+        except NutritionPlan.DoesNotExist:
+            return Response(
+                {'error': 'Plan not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+class FillCartFromPlanView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, pk):
+        try:
+            plan = NutritionPlan.objects.get(id=pk, user=request.user)
+            
+            # Whole shopping list goes into the cart in one transaction, each
+            # food set to the quantity the plan needs
+            ai_engine = NutritionAI()
+            operations = shopping_list_operations(ai_engine.plan_shopping_list(plan))
+            if operations:
+                apply_cart_operations(request.user, operations)
+            
+            cart = CartValuesSerializer().serialize(Cart.objects.filter(user=request.user))
+            return Response(
+                {'updated': len(operations), 'cart': cart},
+                status=status.HTTP_200_OK
+            )
+        
+        except NutritionPlan.DoesNotExist:
+            return Response(
+                {'error': 'Plan not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+class ReplanNutritionPlanView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, pk):
+        try:
+            plan = NutritionPlan.objects.get(id=pk, user=request.user)
+            
+            try:
+                tolerance = float(request.data.get('tolerance', 0.10))
+            except (TypeError, ValueError):
+                tolerance = None
+            # Also rejects NaN, which would fail every comparison and refresh every meal
+            if tolerance is None or not 0 <= tolerance <= 1:
+                return Response(
+                    {'error': 'tolerance must be a number between 0 and 1'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Recompute only the meals that drifted from the current targets
+            ai_engine = NutritionAI()
+            changed_meals = ai_engine.replan_nutrition_plan(
+                user=request.user,
+                plan=plan,
+                tolerance=tolerance
+            )
+            
+            return Response(
+                {
+                    'plan': NutritionPlanSerializer(plan).data,
+                    'updated_meals': [str(meal.id) for meal in changed_meals]
+                },
+                status=status.HTTP_200_OK
+            )
+        
+        except NutritionPlan.DoesNotExist:
+            return Response(
+                {'error': 'Plan not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         except Exception as e:
             return Response(
                 {'error': str(e)},
@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core import signing
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .models import User, UserProfile
+
+def _row(instance):
+    """Column values in the order Model.from_db expects"""
+    return tuple(getattr(instance, field.attname) for field in instance._meta.concrete_fields)
+
+class UserCache:
+    """
+    Small per-process LRU of users (with their profile) by id, each entry
+    valid for `ttl` seconds. Only column values are cached and fresh
+    instances are built on every hit, so a view changing request.user
+    never changes the cached entry.
+    """
+
+    def __init__(self, ttl, max_size):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, row = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+
+        user_row, profile_row = row
+        user = User.from_db('default', None, user_row)
+        if profile_row is not None:
+            user.profile = UserProfile.from_db('default', None, profile_row)
+        return user
+
+    def set(self, user_id, user):
+        if self.ttl <= 0:
+            return
+        profile = getattr(user, 'profile', None)
+        row = (_row(user), _row(profile) if profile is not None else None)
+        entry = (time.monotonic() + self.ttl, row)
+        with self._lock:
+            self._entries[str(user_id)] = entry
+            self._entries.move_to_end(str(user_id))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_TTL, settings.AUTH_USER_CACHE_SIZE)
+
+def load_user(user_id):
+    """User and profile in one joined query, from the cache when fresh"""
+    user = user_cache.get(user_id)
+    if user is None:
+        user = User.objects.select_related('profile').filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).first()
+        if user is not None:
+            user_cache.set(user_id, user)
+    return user
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that loads request.user together with its profile
+    and keeps both in a short-lived per-process cache, so most requests
+    authenticate without touching the database.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        user = load_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        return user
+
+class StreamTokens:
+    """
+    Signed, short-lived tokens for server-sent event URLs. Browser
+    EventSource cannot send an Authorization header, so a client trades
+    its JWT for one of these and passes it as ?token= when opening a
+    stream. A token only identifies the user and expires after
+    STREAM_TOKEN_MAX_AGE seconds.
+    """
+    salt = 'nutrifit.stream-token'
+
+    def create(self, user):
+        return signing.TimestampSigner(salt=self.salt).sign(str(user.pk))
+
+    def authenticate(self, token):
+        """The active user a token was issued to, or None if it is invalid or expired"""
+        try:
+            user_id = signing.TimestampSigner(salt=self.salt).unsign(
+                token, max_age=settings.STREAM_TOKEN_MAX_AGE
+            )
+        except signing.BadSignature:
+            return None
+        user = load_user(user_id)
+        if user is None or not user.is_active:
+            return None
+        return user
+
+stream_tokens = StreamTokens()
\ No newline at end of file
@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from marketplace.models import Cart
+from medical.models import MedicalReport
+from nutrition.models import MealRecommendation, NutritionPlan
+from nutrition.serializers import MealRecommendationValuesSerializer
+from .serializers import UserSerializer
+
+PLAN_FIELDS = [
+    'id', 'start_date', 'end_date', 'daily_calorie_target', 'daily_protein_target',
+    'daily_carbs_target', 'daily_fat_target', 'health_focus',
+]
+
+REPORT_FIELDS = ['id', 'report_type', 'status', 'scan_date', 'updated_at']
+
+# Meal total column -> plan target column
+TODAY_TARGETS = {
+    'calories': ('total_calories', 'daily_calorie_target'),
+    'protein': ('total_protein', 'daily_protein_target'),
+    'carbs': ('total_carbs', 'daily_carbs_target'),
+    'fat': ('total_fat', 'daily_fat_target'),
+}
+
+def dashboard_cache_key(user_id):
+    return f"dashboard:{user_id}"
+
+def invalidate_dashboard(user_id):
+    cache.delete(dashboard_cache_key(user_id))
+
+def summarize_today(plan, meals):
+    """Today's meal totals against the plan's daily targets"""
+    today = {}
+    for key, (total_field, target_field) in TODAY_TARGETS.items():
+        total = round(sum(meal[total_field] for meal in meals), 2)
+        target = plan[target_field]
+        today[key] = {
+            'total': total,
+            'target': target,
+            'adherence': round(total / target * 100, 1) if target else None,
+        }
+    return today
+
+def build_dashboard(user):
+    """
+    Everything the frontend shows on load, in a fixed number of queries:
+    the active plan, today's meals (three, with their foods and portions),
+    the cart totals and the latest report. The user and profile come from
+    the authentication cache.
+    """
+    today = timezone.localdate()
+
+    plan = NutritionPlan.objects.filter(user=user, is_active=True).values(*PLAN_FIELDS).first()
+    meals = MealRecommendationValuesSerializer().serialize(
+        MealRecommendation.objects.filter(user=user, date=today)
+    )
+    cart = Cart.objects.filter(user=user).aggregate(
+        count=Count('id'),
+        total=Sum(F('quantity') * F('unit_price')),
+    )
+    report = MedicalReport.objects.filter(user=user).order_by('-scan_date').values(*REPORT_FIELDS).first()
+
+    if plan:
+        plan['today'] = summarize_today(plan, meals)
+
+    return {
+        'user': UserSerializer(user).data,
+        'active_plan': plan,
+        'todays_meals': meals,
+        'cart': {'count': cart['count'], 'total': round(cart['total'] or 0, 2)},
+        'latest_report': report,
+    }
+
+def get_dashboard(user):
+    """Dashboard for a user, cached for DASHBOARD_CACHE_TIMEOUT seconds"""
+    key = dashboard_cache_key(user.pk)
+    dashboard = cache.get(key)
+    if dashboard is None:
+        dashboard = build_dashboard(user)
+        cache.set(key, dashboard, settings.DASHBOARD_CACHE_TIMEOUT)
+    return dashboard
\ No newline at end of file
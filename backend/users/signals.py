@@ -1,8 +1,30 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from marketplace.models import Cart
+from medical.models import MedicalReport
+from nutrition.models import MealRecommendation, NutritionPlan
+from .authentication import user_cache
+from .dashboard import invalidate_dashboard
 from .models import User, UserProfile
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
-        UserProfile.objects.create(user=instance)
\ No newline at end of file
+        UserProfile.objects.create(user=instance)
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+    invalidate_dashboard(instance.pk)
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    user_cache.invalidate(instance.user_id)
+    invalidate_dashboard(instance.user_id)
+
+@receiver([post_save, post_delete], sender=Cart)
+@receiver([post_save, post_delete], sender=NutritionPlan)
+@receiver([post_save, post_delete], sender=MealRecommendation)
+@receiver([post_save, post_delete], sender=MedicalReport)
+def invalidate_cached_dashboard(sender, instance, **kwargs):
+    invalidate_dashboard(instance.user_id)
\ No newline at end of file
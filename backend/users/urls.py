@@ -9,4 +9,6 @@ urlpatterns = [
     path('profile/', views.UserProfileView.as_view(), name='user-profile'),
     path('profile/update/', views.UserProfileUpdateView.as_view(), name='profile-update'),
     path('me/', views.CurrentUserView.as_view(), name='current-user'),
+    path('dashboard/', views.DashboardView.as_view(), name='dashboard'),
+    path('stream-token/', views.StreamTokenView.as_view(), name='stream-token'),
 ]
\ No newline at end of file
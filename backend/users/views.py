@@ -1,9 +1,13 @@
+from django.conf import settings
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
+from .authentication import stream_tokens
 from .models import User, UserProfile
+from .dashboard import get_dashboard
 from .serializers import UserRegistrationSerializer, UserSerializer, UserProfileSerializer
+from nutrition.ai_engine import NutritionAI
 
 class UserRegistrationView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -40,5 +44,43 @@ class UserProfileUpdateView(generics.UpdateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = UserProfileSerializer
     
+    # Profile fields that feed into the nutrition requirements
+    PLAN_FIELDS = [
+        'age', 'gender', 'weight', 'height', 'activity_level', 'goal',
+        'diseases', 'allergies', 'dietary_preferences',
+    ]
+    
     def get_object(self):
-        return self.request.user.profile
\ No newline at end of file
+        # request.user.profile may come from the auth cache; saving that copy
+        # would revert edits made through another worker within its TTL
+        return UserProfile.objects.get(user=self.request.user)
+    
+    def perform_update(self, serializer):
+        previous = {field: getattr(serializer.instance, field) for field in self.PLAN_FIELDS}
+        profile = serializer.save()
+        self.request.user.profile = profile
+        
+        if all(getattr(profile, field) == value for field, value in previous.items()):
+            return
+        
+        # Re-target the active plan in place instead of generating a new one
+        plan = self.request.user.nutrition_plans.filter(is_active=True).first()
+        if plan:
+            NutritionAI().replan_nutrition_plan(self.request.user, plan)
+
+class DashboardView(APIView):
+    """User, active plan, today's meals, cart and latest report in one response"""
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        return Response(get_dashboard(request.user))
+
+class StreamTokenView(APIView):
+    """Short-lived token for opening event streams with EventSource (?token=)"""
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        return Response({
+            'token': stream_tokens.create(request.user),
+            'expires_in': settings.STREAM_TOKEN_MAX_AGE,
+        })
\ No newline at end of file
@@ -1,6 +1,8 @@
 import axios from 'axios';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
+// Event streams need the ASGI server; point this at it when it runs separately
+const STREAM_BASE_URL = import.meta.env.VITE_STREAM_URL || API_BASE_URL;
 
 const api = axios.create({
   baseURL: API_BASE_URL,
@@ -53,6 +55,19 @@ api.interceptors.response.use(
   }
 );
 
+// Server-sent event streams. EventSource cannot send the Authorization
+// header, so each stream is opened with a short-lived stream token instead.
+// `handlers` maps event names to callbacks receiving the parsed data.
+export const openEventStream = async (path, handlers, params = {}) => {
+  const response = await api.post('/users/stream-token/');
+  const query = new URLSearchParams({ ...params, token: response.data.token });
+  const source = new EventSource(`${STREAM_BASE_URL}${path}?${query}`);
+  Object.entries(handlers).forEach(([event, handler]) => {
+    source.addEventListener(event, (e) => handler(JSON.parse(e.data)));
+  });
+  return source;
+};
+
 // Auth APIs
 export const authAPI = {
   register: (data) => api.post('/users/register/', data),
@@ -86,6 +101,7 @@ export const medicalAPI = {
     });
   },
   analyzeReport: (id) => api.post(`/medical/reports/${id}/analyze/`),
+  followReportProgress: (id, handlers) => openEventStream(`/medical/reports/${id}/progress/`, handlers),
   getDiseases: () => api.get('/medical/diseases/'),
 };
 
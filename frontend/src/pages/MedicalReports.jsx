@@ -1,6 +1,23 @@
 import React, { useState, useEffect } from 'react';
 import { medicalAPI } from '../api';
 
+// Button text for the analysis stages streamed by the progress endpoint
+const progressLabel = (update) => {
+  if (!update) return '';
+  switch (update.stage) {
+    case 'preprocess':
+      return ' (preparing image)';
+    case 'ocr':
+      return update.total ? ` (reading text ${update.done}/${update.total})` : ' (reading text)';
+    case 'metrics':
+      return ' (extracting metrics)';
+    case 'recommendations':
+      return ' (building recommendations)';
+    default:
+      return '';
+  }
+};
+
 const MedicalReports = () => {
   const [reports, setReports] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -9,6 +26,11 @@ const MedicalReports = () => {
   const [selectedFile, setSelectedFile] = useState(null);
   const [reportType, setReportType] = useState('blood_test');
   const [message, setMessage] = useState('');
+  // Full analysis per report id; the list endpoint only returns a summary
+  const [details, setDetails] = useState({});
+  const [loadingDetails, setLoadingDetails] = useState(null);
+  // Latest analysis stage of the report being analyzed
+  const [progress, setProgress] = useState(null);
 
   useEffect(() => {
     fetchReports();
@@ -55,18 +77,57 @@ const MedicalReports = () => {
     }
   };
 
+  const handleViewDetails = async (reportId) => {
+    if (details[reportId]) {
+      const { [reportId]: _, ...rest } = details;
+      setDetails(rest);
+      return;
+    }
+
+    setLoadingDetails(reportId);
+    try {
+      const response = await medicalAPI.getReport(reportId);
+      setDetails({ ...details, [reportId]: response.data });
+    } catch (error) {
+      setMessage('Error loading report details');
+    } finally {
+      setLoadingDetails(null);
+    }
+  };
+
+  const followProgress = async (reportId) => {
+    try {
+      const stream = await medicalAPI.followReportProgress(reportId, {
+        progress: setProgress,
+        status: () => stream.close(),
+      });
+      // Progress is only informative; the analyze request reports the outcome
+      stream.onerror = () => stream.close();
+      return stream;
+    } catch (error) {
+      return null;
+    }
+  };
+
   const handleAnalyze = async (reportId) => {
     setAnalyzing(reportId);
+    setProgress(null);
     setMessage('');
 
+    const stream = await followProgress(reportId);
     try {
-      await medicalAPI.analyzeReport(reportId);
+      const response = await medicalAPI.analyzeReport(reportId);
+      if (response.data.id) {
+        setDetails({ ...details, [reportId]: response.data });
+      }
       setMessage('Report analyzed successfully!');
       await fetchReports();
     } catch (error) {
       setMessage('Error analyzing report');
     } finally {
+      stream?.close();
       setAnalyzing(null);
+      setProgress(null);
     }
   };
 
@@ -175,7 +236,7 @@ const MedicalReports = () => {
                         disabled={analyzing === report.id}
                         className="mb-4 bg-secondary text-white px-6 py-2 rounded-lg font-semibold hover:bg-primary disabled:opacity-50"
                       >
-                        {analyzing === report.id ? 'Analyzing...' : 'Analyze Report'}
+                        {analyzing === report.id ? `Analyzing...${progressLabel(progress)}` : 'Analyze Report'}
                       </button>
                     )}
 
@@ -195,11 +256,23 @@ const MedicalReports = () => {
                       </div>
                     )}
 
-                    {report.health_metrics && Object.keys(report.health_metrics).length > 0 && (
+                    {report.status === 'completed' && (
+                      <button
+                        onClick={() => handleViewDetails(report.id)}
+                        disabled={loadingDetails === report.id}
+                        className="mb-4 text-primary font-semibold hover:underline disabled:opacity-50"
+                      >
+                        {loadingDetails === report.id
+                          ? 'Loading...'
+                          : details[report.id] ? 'Hide Analysis' : 'View Analysis'}
+                      </button>
+                    )}
+
+                    {details[report.id]?.health_metrics && Object.keys(details[report.id].health_metrics).length > 0 && (
                       <div className="mb-4">
                         <h4 className="font-semibold mb-2">Health Metrics:</h4>
                         <div className="grid grid-cols-2 md:grid-cols-4 gap-4">
-                          {Object.entries(report.health_metrics)
+                          {Object.entries(details[report.id].health_metrics)
                             .filter(([key]) => !key.endsWith('_status'))
                             .map(([key, value]) => (
                               <div key={key} className="bg-gray-50 p-3 rounded">
@@ -207,13 +280,13 @@ const MedicalReports = () => {
                                   {key.replace('_', ' ')}
                                 </div>
                                 <div className="text-lg font-bold">{value}</div>
-                                {report.health_metrics[`${key}_status`] && (
+                                {details[report.id].health_metrics[`${key}_status`] && (
                                   <div className={`text-xs mt-1 ${
-                                    report.health_metrics[`${key}_status`] === 'normal'
+                                    details[report.id].health_metrics[`${key}_status`] === 'normal'
                                       ? 'text-green-600'
                                       : 'text-red-600'
                                   }`}>
-                                    {report.health_metrics[`${key}_status`]}
+                                    {details[report.id].health_metrics[`${key}_status`]}
                                   </div>
                                 )}
                               </div>
@@ -222,29 +295,29 @@ const MedicalReports = () => {
                       </div>
                     )}
 
-                    {report.ai_insights && (
+                    {details[report.id]?.ai_insights && (
                       <div className="mb-4 p-4 bg-blue-50 rounded">
                         <h4 className="font-semibold mb-2 text-blue-900">AI Insights:</h4>
-                        <p className="text-sm text-blue-700">{report.ai_insights}</p>
+                        <p className="text-sm text-blue-700">{details[report.id].ai_insights}</p>
                       </div>
                     )}
 
-                    {report.dietary_recommendations && (
+                    {details[report.id]?.dietary_recommendations && (
                       <div className="p-4 bg-green-50 rounded">
                         <h4 className="font-semibold mb-2 text-green-900">Dietary Recommendations:</h4>
                         <p className="text-sm text-green-700 whitespace-pre-line">
-                          {report.dietary_recommendations}
+                          {details[report.id].dietary_recommendations}
                         </p>
                       </div>
                     )}
 
-                    {report.extracted_text && (
+                    {details[report.id]?.extracted_text && (
                       <details className="mt-4">
                         <summary className="cursor-pointer font-semibold text-gray-700 hover:text-primary">
                           View Extracted Text
                         </summary>
                         <div className="mt-2 p-4 bg-gray-50 rounded text-sm text-gray-600 whitespace-pre-wrap">
-                          {report.extracted_text}
+                          {details[report.id].extracted_text}
                         </div>
                       </details>
                     )}